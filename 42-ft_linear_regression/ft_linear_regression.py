@@ -1,77 +1,141 @@
-import csv
+import os
 import sys
-import show
 import argparse
 import numpy as np
-import matplotlib.pyplot as plt
 
-def dataset() :
+# modules shared with the main/ pipeline (binary CSV cache, model registry)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import show
+import stopping as stopping_criteria
+from cache import load_columns, numeric_names
+from telemetry import CostRecorder
+from engine import minibatch_sgd, lipschitz_rate
+from optimizers import OPTIMIZERS, make_optimizer
+from precision import accurate_dot, accurate_gradient
+
+# features: columns used as inputs (default: every numeric column but the last one,
+# which is the target). x is the raw (m, n) matrix, normX the min-max scaled
+# matrix with a trailing bias column, Theta a (n + 1, 1) vector
+# dtype: float64, or float32 to halve the memory of normX and Y
+# normX is preallocated once (Fortran order, each column contiguous) and
+# filled straight from the cached columns, the scaling is done in place; with
+# a single feature x and Y (float64) are views of the cache, not copies
+def dataset(filename="data.csv", features=None, dtype=np.float64) :
 	try:
-		liste = np.genfromtxt("data.csv", delimiter=",", skip_header=1)
+		# text columns (brand, model...) are skipped by default
+		names = numeric_names(filename)
+		target = names[-1]
+		features = list(features or names[:-1])
+		# rows with an invalid value in one of these columns only are dropped
+		*raw, y = load_columns(filename, usecols=features + [target])
+		Y = np.asarray(y, dtype).reshape(-1, 1)
 	except:
-		print('Warning: Failed to load file!\nMake sure data.csv exist.')
+		print('Warning: Failed to load file!\nMake sure {} exist and has the requested columns.'.format(filename))
 		sys.exit(-1)
-	m = len(liste)
-	x = np.array([1] * m, float)
-	nx = np.array([1] * m, float)
-	Y = np.array([1] * m, float)
-	Theta = np.random.randn(2, 1)
-	for i in range(len(liste)) :
-		if (i < m):
-			x[i] = liste[i][0]
-			nx[i] = liste[i][0]
-			Y[i] = liste[i][1]
-	x = x.reshape(x.shape[0], 1)
-	nx = nx.reshape(nx.shape[0], 1)
-	Y = Y.reshape(Y.shape[0], 1)
-	xmin = np.min(x)
-	xmax = np.max(x)
-	for i in range(len(nx)):
-		nx[i] = (nx[i] - xmin) / (xmax - xmin)
-	normX = np.hstack((nx, np.ones(nx.shape)))
-	return x, normX, Y, Theta
+	normX = np.empty((len(Y), len(features) + 1), dtype, order="F")
+	for j, column in enumerate(raw) :
+		xmin = column.min()
+		xmax = column.max()
+		scaled = normX[:, j]
+		np.subtract(column, xmin, out=scaled)
+		if xmax > xmin :
+			scaled /= xmax - xmin
+	normX[:, -1] = 1
+	x = raw[0].reshape(-1, 1) if len(raw) == 1 else np.column_stack(raw)
+	Theta = np.random.randn(len(features) + 1, 1).astype(dtype)
+	return x, normX, Y, Theta, features, target
 
 def model(X, Theta) :
 	F = X.dot(Theta)
 	return F
 
 def cost_function(m, X, Y, Theta) :
-	scal = (1 / 2 * m) * np.sum((model(X, Theta) - Y)**2)
+	scal = (1 / (2 * m)) * np.sum((model(X, Theta) - Y)**2)
 	return scal
 
-def gradient_descent(X, Y, Theta, learning_rate, n_iterations) :
+# stopping: optional early stopping criteria (main/stopping.py)
+# recorder: optional cost history (main/telemetry.py), sampled from the residual
+# already computed for the gradient, so logging costs no extra model() call
+# batch_size: switch to mini-batch SGD (main/engine.py), n_iterations then counts
+# epochs; the bias column of X is handled as the intercept, rows are never copied
+# optimizer: update rule from main/optimizers.py (plain fixed step when None)
+# a float32 X (dataset(dtype=np.float32)) keeps the residual in float32, the
+# gradient and cost sums are compensated (main/precision.py) and Theta stays
+# float64
+def gradient_descent(X, Y, Theta, learning_rate, n_iterations, stopping=None, recorder=None, batch_size=None, optimizer=None) :
+	if batch_size is not None :
+		intercept, coef = minibatch_sgd(X[:, :-1], Y[:, 0], learning_rate, n_iterations, batch_size,
+			intercept=Theta[-1, 0], coef=Theta[:-1, 0], stopping=stopping, recorder=recorder)
+		return np.vstack((coef[:, np.newaxis], [[intercept]])), recorder
 	m = len(Y)
-	cost_history = np.array([0] * n_iterations, float)
+	buffer = np.empty(m, X.dtype) if X.dtype == np.float32 else None
+	if optimizer is None :
+		optimizer = make_optimizer("gd", learning_rate)
+	optimizer.reset()
+	if stopping is not None :
+		stopping.start()
 	for i in range(0, n_iterations) :
-		Theta = Theta - learning_rate * (1 / m * X.T.dot(model(X, Theta) - Y))
-		cost_history[i] = cost_function(m, X, Y, Theta)
-	return Theta, cost_history
+		residual = model(X, optimizer.lookahead(Theta).astype(X.dtype, copy=False)) - Y
+		gradient = 1 / m * accurate_gradient(X, residual[:, 0], buffer).reshape(-1, 1)
+		if stopping is not None or (recorder is not None and recorder.due(i)) :
+			cost = accurate_dot(residual[:, 0], residual[:, 0], buffer) / (2 * m)
+			if recorder is not None and recorder.due(i) :
+				recorder.record(i, cost)
+		step = optimizer.step(Theta, gradient)
+		Theta = Theta + step
+		if stopping is not None and stopping.check(i, cost, np.linalg.norm(gradient), np.linalg.norm(step), np.linalg.norm(Theta)) :
+			break
+	if stopping is not None and stopping.reason is None :
+		stopping.finish(n_iterations)
+	return Theta, recorder
 
-def ft_linear_regression() :
-	learning_rate = 0.07
+def ft_linear_regression(stopping=None, recorder=None, batch_size=None, optimizer="gd", features=None, dtype=np.float64) :
 	n_iterations = 1000
-	x, normX, Y, Theta = dataset()
-	final_Theta, cost_history = gradient_descent(normX, Y, Theta, learning_rate, n_iterations)
+	x, normX, Y, Theta, features, target = dataset(features=features, dtype=dtype)
+	# largest safe step 1 / λmax(XᵀX / m), normX already holds the bias column
+	learning_rate = lipschitz_rate(normX, intercept=False)
+	if optimizer == "adam" :
+		# Adam moves each parameter by about learning_rate per step, whatever the
+		# gradient scale: use the size of the first safe gradient step from Theta
+		gradient = normX.T.dot(model(normX, Theta) - Y) / len(Y)
+		learning_rate = learning_rate * float(np.max(np.abs(gradient)))
+	print("Learning rate: {:.6g} ({})".format(learning_rate, "scaled for adam" if optimizer == "adam" else "auto"))
+	final_Theta, recorder = gradient_descent(normX, Y, Theta, learning_rate, n_iterations, stopping, recorder,
+		batch_size, make_optimizer(optimizer, learning_rate))
+	if stopping is not None :
+		unit = "epoch" if batch_size is not None else "iteration"
+		print("Gradient descent stopped at {} {} ({}, {:.3f} s)".format(unit, stopping.iteration, stopping.reason, stopping.elapsed))
 
 	prediction = model(normX, final_Theta)
-	return x, Y, prediction, cost_history, final_Theta, n_iterations
+	return x, Y, prediction, recorder, final_Theta, features, target
 
 def argument_parser() :
 	parser = argparse.ArgumentParser()
 	parser.add_argument("-p", "--prediction", action="count", default=0, help="show the prediction curve")
 	parser.add_argument("-ch", "--cost_history", action="count", default=0, help="show the cost history curve")
 	parser.add_argument("-cd", "--coef_determination", action="count", default=0, help="show the coefficient determination")
+	parser.add_argument("-sgd", "--batch_size", type=int, help="train with mini-batch SGD on batches of this size")
+	parser.add_argument("-f", "--features", nargs="+", help="input columns of data.csv (default: all but the last)")
+	parser.add_argument("-opt", "--optimizer", choices=list(OPTIMIZERS), default="gd", help="gradient descent update rule")
+	parser.add_argument("-f32", "--float32", action="store_true", help="load the design matrix in float32 (half the memory)")
+	stopping_criteria.add_arguments(parser)
 	args = parser.parse_args()
 
-	x, Y, prediction, cost_history, final_Theta, n_iterations = ft_linear_regression()
+	# the cost is only recorded when its curve is requested
+	recorder = CostRecorder() if args.cost_history >= 1 else None
+	x, Y, prediction, recorder, final_Theta, features, target = ft_linear_regression(stopping_criteria.from_args(args),
+		recorder, args.batch_size, args.optimizer, args.features, np.float32 if args.float32 else np.float64)
 
 	if args.prediction >= 1 :
-		show.prediction_curve(x, Y, prediction)
+		show.prediction_curve(x[:, 0], Y, prediction)
 	elif args.cost_history >= 1 :
-		show.cost_history_curve(n_iterations, cost_history)
+		show.cost_history_curve(recorder)
 	elif args.coef_determination >= 1 :
 		show.coef_determination(Y, prediction)
-	show.thetas_values(float(final_Theta[1]), float(final_Theta[0]))
+	if len(features) == 1 :
+		show.thetas_values(float(final_Theta[1, 0]), float(final_Theta[0, 0]), float(x.min()), float(x.max()))
+	else :
+		show.coefficients_values(features, target, final_Theta, x)
 
 if __name__ == '__main__' :
 	argument_parser()
\ No newline at end of file
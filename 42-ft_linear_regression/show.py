@@ -1,32 +1,56 @@
-import json
 import sys
-import matplotlib.pyplot as plt
+from model import fold, model_params, write_model
 
-def thetas_values(theta0, theta1) :
-	thetas = {
-		"theta0": theta0,
-		"theta1": theta1,
-	}
+# theta0, theta1 are learned on the min-max scaled mileage: they are folded
+# back to raw mileage before saving (main/model.py), x_min and x_max are kept
+# as metadata, so a prediction is a single multiply-add
+def thetas_values(theta0, theta1, x_min, x_max) :
+	theta0, coef = fold(theta0, [theta1], [x_min], [x_max])
 	try:
-		with open("thetas.json", "w") as json_file:
-			json.dump(thetas, json_file, indent=4)
+		# atomic write of thetas.json + thetas.bin, new version in the models/ registry
+		write_model(model_params(theta0, coef, [x_min], [x_max]), "thetas.json", indent=4)
 	except:
 		sys.exit(-1)
 	print("Vector Theta as been successfully print in the file : thetas.json")
+	options()
+
+# multivariate model: same artifact as main/train.py (raw-space coefficients
+# plus the min/max of each feature), readable by main/predict.py
+def coefficients_values(features, target, Theta, x) :
+	x_min = x.min(axis=0).tolist()
+	x_max = x.max(axis=0).tolist()
+	intercept, coef = fold(float(Theta[-1, 0]), Theta[:-1, 0].tolist(), x_min, x_max)
+	try:
+		write_model(model_params(intercept, coef, x_min, x_max, features, target), "thetas.json", indent=4)
+	except:
+		sys.exit(-1)
+	print("Vector Theta ({} features) as been successfully print in the file : thetas.json".format(len(features)))
+	options()
+
+def options() :
 	print("\noptional arguments:")
 	print("  -h, --help           show the help message and exit")
 	print("  -p, --prediction     show the prediction curve")
 	print("  -ch, --cost_history  show the cost history curve")
 	print("  -cd, --coef_determination\n\t\t       show the coefficient determination")
+	print("  -sgd, --batch_size N\n\t\t       train with mini-batch SGD on batches of N rows")
+	print("  -f, --features NAME [NAME ...]\n\t\t       input columns (default: all but the last)")
+	print("  -opt, --optimizer NAME\n\t\t       gd (default), momentum, nesterov, adam or barzilai_borwein")
+	print("  -f32, --float32      load the design matrix in float32 (half the memory)")
 
+# matplotlib is only imported when a curve is shown (slow to import)
 def prediction_curve(x, Y, prediction) :
+	import matplotlib.pyplot as plt
 	plt.scatter(x, Y, marker='+')
 	plt.plot(x, prediction, c='r')
 	plt.legend(['prediction curve: f(x)=ax+b'])
 	plt.show()
 
-def cost_history_curve(i, cost_history) :
-	plt.plot(range(i), cost_history)
+# recorder: main/telemetry.CostRecorder filled by gradient_descent
+def cost_history_curve(recorder) :
+	import matplotlib.pyplot as plt
+	iterations, cost_history = recorder.history()
+	plt.plot(iterations, cost_history)
 	plt.show()
 
 def coef_determination(y, pred) :
@@ -0,0 +1,59 @@
+# ================================ IMPORT =====================================
+import time
+import argparse
+import numpy as np
+from stats import fit_ols
+from bootstrap import bootstrap, interval
+from bench_train import make_data
+
+# ============================== CONFIGURATION ================================
+SIZES = [1_000, 100_000]
+REPLICATES = 10_000
+NAIVE_REPLICATES = 200      # la boucle naïve est extrapolée à partir de ce nombre
+
+# ================================ FONCTIONS ==================================
+# Bootstrap naïf : un rééchantillonnage copié et un ajustement par réplicat
+def bootstrap_loop(x, y, replicates, seed=0):
+    rng = np.random.default_rng(seed)
+    thetas = np.empty((replicates, 2))
+    for b in range(replicates):
+        index = rng.integers(0, len(x), len(x))
+        thetas[b] = fit_ols(x[index], y[index])
+    return thetas[:, 0], thetas[:, 1]
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap : boucle de réajustements vs statistiques suffisantes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("-B", "--replicates", type=int, default=REPLICATES)
+    parser.add_argument("--workers", type=int, help="processus (défaut : un par cœur)")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>10} {'boucle (s)':>11} {'exact (s)':>10} {'normal (s)':>11}  "
+          f"IC 95 % θ1 : boucle / exact / normal")
+    for n in args.sizes:
+        x, y = make_data(n)
+        x = x * 240_000
+
+        naive = min(NAIVE_REPLICATES, args.replicates)
+        start = time.perf_counter()
+        _, loop_theta1 = bootstrap_loop(x, y, naive)
+        t_loop = (time.perf_counter() - start) * args.replicates / naive
+
+        start = time.perf_counter()
+        _, theta1 = bootstrap(x, y, args.replicates, args.workers, exact=True)
+        t_vector = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, normal_theta1 = bootstrap(x, y, args.replicates, args.workers, exact=False)
+        t_normal = time.perf_counter() - start
+
+        intervals = " / ".join("[{:.4g}, {:.4g}]".format(*interval(samples))
+                               for samples in (loop_theta1, theta1, normal_theta1))
+        print(f"{n:>10,} {t_loop:>11.2f} {t_vector:>10.3f} {t_normal:>11.4f}  {intervals}")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
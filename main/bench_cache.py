@@ -0,0 +1,94 @@
+# ================================ IMPORT =====================================
+import os
+import csv
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from cache import cache_dir, load_columns
+
+# ============================== CONFIGURATION ================================
+ROWS = 1_000_000
+REPEAT = 3
+
+# ================================ FONCTIONS ==================================
+# Ancien chargement csv.reader + float() (référence)
+def load_data_csv(filename):
+    x = []
+    y = []
+    with open(filename, 'r') as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            try:
+                x.append(float(row[0]))
+                y.append(float(row[1]))
+            except ValueError:
+                continue
+    return x, y
+
+
+# -------------------------------------------------------------------------------
+# Écrire un data.csv synthétique de n lignes
+def write_csv(filename, n, seed=42):
+    rng = np.random.default_rng(seed)
+    km = rng.integers(5_000, 300_000, n)
+    price = np.round(8500 - 0.02 * km + rng.normal(0, 600, n), 2)
+    np.savetxt(filename, np.column_stack((km, price)), delimiter=",",
+               header="km,price", comments="", fmt=["%d", "%.2f"])
+
+
+# -------------------------------------------------------------------------------
+# Meilleur temps sur `repeat` exécutions
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chargement CSV vs cache binaire")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(folder, "data.csv")
+        write_csv(filename, args.rows)
+
+        # Cache froid : on supprime le cache avant chaque exécution
+        def cold():
+            shutil.rmtree(cache_dir(filename), ignore_errors=True)
+            load_columns(filename)
+
+        # Cache chaud : projection seule, puis projection + lecture des données
+        def warm():
+            load_columns(filename)
+
+        def warm_sum():
+            x, y = load_columns(filename, usecols=(0, 1))
+            float(x.sum() + y.sum())
+
+        t_csv = best_time(lambda: load_data_csv(filename), args.repeat)
+        t_cold = best_time(cold, args.repeat)
+        t_warm = best_time(warm, args.repeat)
+        t_warm_sum = best_time(warm_sum, args.repeat)
+
+        print(f"{args.rows:,} lignes ({os.path.getsize(filename) / 1e6:.1f} Mo)")
+        print(f"  csv.reader + float()      : {t_csv:9.4f} s")
+        print(f"  cache froid (parse+écrit) : {t_cold:9.4f} s")
+        print(f"  cache chaud (projection)  : {t_warm:9.4f} s  ({t_csv / t_warm:,.0f}x)")
+        print(f"  cache chaud + lecture     : {t_warm_sum:9.4f} s  ({t_csv / t_warm_sum:,.0f}x)")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# ================================ IMPORT =====================================
+import os
+import json
+import logging
+import argparse
+import tempfile
+import numpy as np
+from stats import fit_ols
+from stopping import StoppingCriteria, TARGET_COST
+from telemetry import CostRecorder
+from bench_suite import NOISE, load_script, write_dataset
+
+# ============================== CONFIGURATION ================================
+EPSILON = 1e-6              # cible : coût <= (1 + EPSILON) * coût des moindres carrés
+MAX_ITERATIONS = 20_000
+
+# ================================ FONCTIONS ==================================
+# Chaque trainer mesure son propre coût : Σe²/2m sur y réel (engine.py,
+# ft_linear_regression.py) ou MSE sur y normalisé (entrainement.py). Ces
+# coûts sont tous proportionnels à la MSE réelle : `unit` convertit l'optimum
+# des moindres carrés dans l'unité du trainer, l'écart relatif est comparable.
+def half(mse, y):
+    return mse / 2
+
+
+def normalized(mse, y):
+    return mse / (y.max() - y.min()) ** 2
+
+
+# -------------------------------------------------------------------------------
+# main/train.py::train (descente vectorisée de engine.py, x normalisé)
+def run_train(path, stopping, recorder, max_iterations=MAX_ITERATIONS, learning_rate="auto"):
+    import train
+    x, y = train.load_data(path)
+    theta0, theta1, _, _ = train.train(x, y, learning_rate, max_iterations, stopping, recorder)
+    return theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# 42-ft_linear_regression::gradient_descent, règle de mise à jour au choix
+def run_ft(path, stopping, recorder, max_iterations=MAX_ITERATIONS, optimizer="gd"):
+    ft = load_script("ft_linear_regression", "42-ft_linear_regression", "ft_linear_regression.py")
+    x, normX, Y, Theta, _, _ = ft.dataset(path)
+    learning_rate = ft.lipschitz_rate(normX, intercept=False)
+    Theta, _ = ft.gradient_descent(normX, Y, Theta, learning_rate, max_iterations, stopping, recorder,
+                                   optimizer=ft.make_optimizer(optimizer, learning_rate))
+    x_min, x_max = float(x.min()), float(x.max())
+    theta1 = float(Theta[0, 0]) / (x_max - x_min)
+    return float(Theta[1, 0]) - theta1 * x_min, theta1
+
+
+# -------------------------------------------------------------------------------
+# method_decente_gradient/devoir/entrainement.py::descente_gradiant (x et y normalisés)
+def run_entrainement(path, stopping, recorder, max_iterations=MAX_ITERATIONS, optimizer="gd"):
+    entrainement = load_script("entrainement", "method_decente_gradient", "devoir", "entrainement.py")
+    data = entrainement.recup_data(path)
+    return entrainement.descente_gradiant(data, 0.0, 0.0, stopping, recorder, optimizer,
+                                          iterations=max_iterations)
+
+
+# Configurations comparées : (nom, fonction, options, unité du coût)
+CONFIGS = [
+    ("train lr=auto", run_train, {}, half),
+    ("train lr=0.1", run_train, {"learning_rate": 0.1}, half),
+    ("ft gd", run_ft, {"optimizer": "gd"}, half),
+    ("ft momentum", run_ft, {"optimizer": "momentum"}, half),
+    ("ft barzilai_borwein", run_ft, {"optimizer": "barzilai_borwein"}, half),
+    ("entrainement gd", run_entrainement, {"optimizer": "gd"}, normalized),
+    ("entrainement barzilai_borwein", run_entrainement, {"optimizer": "barzilai_borwein"}, normalized),
+]
+
+# ================================ FONCTIONS ==================================
+# Faire tourner une configuration jusqu'à la cible : seuls la cible et le
+# budget d'itérations arrêtent la descente, le coût est enregistré à chaque
+# itération pour les courbes.
+def converge(path, run, options, unit, x, y, epsilon=EPSILON, max_iterations=MAX_ITERATIONS):
+    theta = fit_ols(x, y)
+    error = theta[0] + theta[1] * x - y
+    optimum = unit(error.dot(error) / len(x), y)
+
+    stopping = StoppingCriteria(None, None, None, target_cost=(1 + epsilon) * optimum)
+    recorder = CostRecorder(capacity=max_iterations)
+    theta0, theta1 = run(path, stopping, recorder, max_iterations, **options)
+    iterations, costs = recorder.history()
+    return {
+        "reached": stopping.reason == TARGET_COST,
+        "iterations": stopping.iteration,
+        "seconds": stopping.elapsed,
+        "theta0": theta0,
+        "theta1": theta1,
+        "coef_error": max(abs(theta0 - theta[0]) / abs(theta[0]), abs(theta1 - theta[1]) / abs(theta[1])),
+        "curve": {"iterations": iterations.tolist(), "gap": (costs / optimum - 1).tolist()},
+    }
+
+
+# -------------------------------------------------------------------------------
+# Écart relatif au coût optimal, en fonction des itérations puis du temps
+# (temps par itération supposé constant)
+def plot_curves(results, epsilon, filename):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, (by_iteration, by_time) = plt.subplots(1, 2, figsize=(14, 6))
+    for name, result in results.items():
+        iterations = np.asarray(result["curve"]["iterations"]) + 1
+        gap = np.maximum(result["curve"]["gap"], 1e-16)
+        seconds = iterations * result["seconds"] / max(result["iterations"], 1)
+        by_iteration.loglog(iterations, gap, label=name)
+        by_time.loglog(seconds, gap, label=name)
+    for axis, label in ((by_iteration, "itérations"), (by_time, "temps (s)")):
+        axis.axhline(epsilon, color="black", linestyle="--", linewidth=1)
+        axis.set_xlabel(label)
+        axis.set_ylabel("coût / coût optimal - 1")
+        axis.grid(True, which="both", alpha=0.3)
+    by_iteration.legend()
+    figure.suptitle(f"Convergence vers l'optimum des moindres carrés (ε = {epsilon:g})")
+    figure.tight_layout()
+    figure.savefig(filename)
+    plt.close(figure)
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Itérations et temps pour atteindre l'optimum à ε près")
+    parser.add_argument("--data", default="data.csv")
+    parser.add_argument("--rows", type=int, help="jeu synthétique de N lignes (voir bench_suite.py) au lieu de --data")
+    parser.add_argument("--epsilon", type=float, default=EPSILON)
+    parser.add_argument("--max-iterations", type=int, default=MAX_ITERATIONS)
+    parser.add_argument("--plot", default="convergence.png", help="image des courbes")
+    parser.add_argument("-o", "--output", help="rapport JSON (courbes comprises)")
+    args = parser.parse_args()
+
+    path = args.data
+    if args.rows:
+        folder = os.path.join(tempfile.gettempdir(), "linear_regression_bench")
+        os.makedirs(folder, exist_ok=True)
+        path = write_dataset(folder, args.rows, NOISE, 0.0)
+    columns = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    x, y = columns[:, 0], columns[:, 1]
+
+    # Les scripts importés configurent le logging racine : terminal lisible
+    logging.disable(logging.INFO)
+    results = {}
+    for name, run, options, unit in CONFIGS:
+        results[name] = converge(path, run, options, unit, x, y, args.epsilon, args.max_iterations)
+
+    print(f"\n{len(x):,} lignes, cible : coût <= (1 + {args.epsilon:g}) x optimum")
+    print(f"{'configuration':<30} {'itérations':>11} {'temps (s)':>10} {'µs/itér.':>9} {'écart θ':>9}")
+    for name, r in results.items():
+        iterations = f"{r['iterations']}" if r["reached"] else f">{r['iterations']}"
+        per_iteration = 1e6 * r["seconds"] / max(r["iterations"], 1)
+        print(f"{name:<30} {iterations:>11} {r['seconds']:>10.4f} {per_iteration:>9.1f} {r['coef_error']:>9.1e}")
+
+    plot_curves(results, args.epsilon, args.plot)
+    print(f"\nCourbes : {args.plot}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"rows": len(x), "epsilon": args.epsilon, "results": results}, file)
+        print(f"Rapport : {args.output}")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ================================ IMPORT =====================================
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import incremental
+from train import train_stream
+from bench_suite import NOISE, make_dataset, write_dataset
+
+# ============================== CONFIGURATION ================================
+SIZES = [100_000, 1_000_000, 10_000_000]
+APPENDS = [100, 10_000]     # lignes ajoutées au CSV entre deux entraînements
+
+# ================================ FONCTIONS ==================================
+# Ajouter `n` ventes au CSV (même loi que bench_suite.make_dataset)
+def append_rows(path, n, seed):
+    km, price = make_dataset(n, NOISE, 0.0, seed)
+    with open(path, "a") as file:
+        np.savetxt(file, np.column_stack((km, price)), fmt=("%d", "%.2f"), delimiter=",")
+
+
+# -------------------------------------------------------------------------------
+# Réentraînement complet (train.py --stream) vs mise à jour incrémentale
+# (train.py --incremental) après l'ajout de `rows` lignes : temps et écart
+# relatif entre les deux solutions exactes
+def measure(path, rows, workdir):
+    data = os.path.join(workdir, "data.csv")
+    model = os.path.join(workdir, "thetas.json")
+    shutil.copyfile(path, data)
+    incremental.update(data, model)             # état initial, une lecture complète
+    append_rows(data, rows, seed=rows)
+
+    start = time.perf_counter()
+    stats, added, _ = incremental.update(data, model)
+    theta0, theta1 = stats.fit()
+    update = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full0, full1, _, _ = train_stream(data)
+    full = time.perf_counter() - start
+
+    error = max(abs(theta0 - full0) / abs(full0), abs(theta1 - full1) / abs(full1))
+    return {"rows": added, "update_ms": 1000 * update, "full_ms": 1000 * full, "error": error}
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Réentraînement complet vs incrémental après ajout de lignes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--appends", type=int, nargs="+", default=APPENDS)
+    args = parser.parse_args()
+
+    folder = os.path.join(tempfile.gettempdir(), "linear_regression_bench")
+    os.makedirs(folder, exist_ok=True)
+
+    print(f"{'lignes':>11} {'ajoutées':>9} {'complet (ms)':>13} {'incr. (ms)':>11} {'gain':>7} {'écart θ':>9}")
+    for n in args.sizes:
+        path = write_dataset(folder, n, NOISE, 0.0)
+        for rows in args.appends:
+            with tempfile.TemporaryDirectory() as workdir:
+                r = measure(path, rows, workdir)
+            print(f"{n:>11,} {r['rows']:>9,} {r['full_ms']:>13.1f} {r['update_ms']:>11.2f} "
+                  f"{r['full_ms'] / r['update_ms']:>6.0f}x {r['error']:>9.1e}")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
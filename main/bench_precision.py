@@ -0,0 +1,86 @@
+# ================================ IMPORT =====================================
+import os
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+from precision import DTYPES, TOLERANCE
+from bench_suite import NOISE, load_script, write_dataset
+
+# ============================== CONFIGURATION ================================
+SIZES = [1_000_000, 10_000_000]
+ITERATIONS = 200            # même nombre d'itérations dans les deux précisions
+
+# ================================ FONCTIONS ==================================
+# 42-ft_linear_regression : dataset() + gradient_descent (descente simple)
+def run_ft(path, dtype, iterations):
+    ft = load_script("ft_linear_regression", "42-ft_linear_regression", "ft_linear_regression.py")
+    np.random.seed(0)
+    x, normX, Y, Theta, _, _ = ft.dataset(path, dtype=dtype)
+    learning_rate = ft.lipschitz_rate(normX, intercept=False)
+    start = time.perf_counter()
+    Theta, _ = ft.gradient_descent(normX, Y, Theta, learning_rate, iterations)
+    elapsed = time.perf_counter() - start
+    x_min, x_max = float(x.min()), float(x.max())
+    theta1 = float(Theta[0, 0]) / (x_max - x_min)
+    return elapsed, float(Theta[1, 0]) - theta1 * x_min, theta1
+
+
+# -------------------------------------------------------------------------------
+# method_decente_gradient/devoir/entrainement.py::descente_gradiant (descente simple)
+def run_entrainement(path, dtype, iterations):
+    entrainement = load_script("entrainement", "method_decente_gradient", "devoir", "entrainement.py")
+    data = entrainement.recup_data(path)
+    start = time.perf_counter()
+    theta0, theta1 = entrainement.descente_gradiant(data, 0.0, 0.0, optimizer="gd", dtype=dtype,
+                                                   iterations=iterations)
+    return time.perf_counter() - start, theta0, theta1
+
+
+TRAINERS = {"ft": run_ft, "entrainement": run_entrainement}
+
+# ================================ FONCTIONS ==================================
+# Temps par itération, pic mémoire (second passage sous tracemalloc) et thetas
+def measure(run, path, dtype, iterations):
+    elapsed, theta0, theta1 = run(path, dtype, iterations)
+    tracemalloc.start()
+    run(path, dtype, iterations)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms_per_iteration": 1000 * elapsed / iterations, "peak_mb": peak / 2**20,
+            "theta0": theta0, "theta1": theta1}
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire, vitesse et précision : float64 vs float32")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--trainers", nargs="+", choices=list(TRAINERS), default=list(TRAINERS))
+    args = parser.parse_args()
+
+    folder = os.path.join(tempfile.gettempdir(), "linear_regression_bench")
+    os.makedirs(folder, exist_ok=True)
+    # Les scripts importés configurent le logging racine : terminal lisible
+    logging.disable(logging.INFO)
+
+    print(f"{'lignes':>11} {'trainer':<13} {'précision':<9} {'ms/itér.':>9} {'pic (Mo)':>9} {'écart θ':>9}")
+    for n in args.sizes:
+        path = write_dataset(folder, n, NOISE, 0.0)
+        for name in args.trainers:
+            results = {dtype: measure(TRAINERS[name], path, DTYPES[dtype], args.iterations) for dtype in DTYPES}
+            reference = results["float64"]
+            for dtype, r in results.items():
+                error = max(abs(r["theta0"] - reference["theta0"]) / abs(reference["theta0"]),
+                            abs(r["theta1"] - reference["theta1"]) / abs(reference["theta1"]))
+                flag = "" if error <= TOLERANCE else "  ✗"
+                print(f"{n:>11,} {name:<13} {dtype:<9} {r['ms_per_iteration']:>9.2f} "
+                      f"{r['peak_mb']:>9.1f} {error:>9.1e}{flag}")
+    print(f"\nTolérance float32 (precision.TOLERANCE) : écart relatif <= {TOLERANCE:g}")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ================================ IMPORT =====================================
+import time
+import argparse
+from engine import gradient_descent, minibatch_sgd, learning_rate_schedule
+from stats import fit_ols
+from bench_train import make_data
+
+# ============================== CONFIGURATION ================================
+SIZES = [10_000, 1_000_000]
+BATCH_SIZES = [64, 1024]
+TOLERANCE = 1e-3            # cible : MSE <= (1 + TOLERANCE) * MSE des moindres carrés
+GD_RATE = 1.0               # x dans [0, 1] : pas stable pour la descente complète
+SGD_RATE = 0.5
+DECAY = 0.1                 # schedule "inverse" pour sgd
+GD_ROUND = 10               # itérations entre deux mesures de la MSE
+TIME_BUDGET = 30.0          # secondes max par solveur
+
+# ================================ FONCTIONS ==================================
+def mse(x, y, theta0, theta1):
+    error = theta0 + theta1 * x - y
+    return error.dot(error) / len(x)
+
+
+# -------------------------------------------------------------------------------
+# Descente complète jusqu'à la cible. Le solveur est relancé par tranches de
+# GD_ROUND itérations depuis les thetas courants ; seule la descente est chronométrée.
+def gd_to_target(x, y, target):
+    theta0 = theta1 = 0.0
+    elapsed = 0.0
+    iterations = 0
+    while elapsed < TIME_BUDGET:
+        start = time.perf_counter()
+        theta0, theta1 = gradient_descent(x, y, GD_RATE, GD_ROUND, theta0, theta1)
+        elapsed += time.perf_counter() - start
+        iterations += GD_ROUND
+        if mse(x, y, theta0, theta1) <= target:
+            return elapsed, iterations
+    return None, iterations
+
+
+# -------------------------------------------------------------------------------
+# Mini-batchs jusqu'à la cible, mesurée après chaque epoch
+def sgd_to_target(x, y, target, batch_size, seed=0):
+    theta0, coef = 0.0, None
+    elapsed = 0.0
+    epoch = 0
+    while elapsed < TIME_BUDGET:
+        rate = learning_rate_schedule(SGD_RATE, epoch, "inverse", DECAY)
+        start = time.perf_counter()
+        theta0, coef = minibatch_sgd(x, y, rate, 1, batch_size, intercept=theta0, coef=coef,
+                                     seed=seed + epoch)
+        elapsed += time.perf_counter() - start
+        epoch += 1
+        if mse(x, y, theta0, coef[0]) <= target:
+            return elapsed, epoch
+    return None, epoch
+
+
+# -------------------------------------------------------------------------------
+def show(label, elapsed, steps, unit):
+    if elapsed is None:
+        print(f"  {label:<16} cible non atteinte en {TIME_BUDGET:.0f} s ({steps} {unit})")
+    else:
+        print(f"  {label:<16} {elapsed:>9.4f} s  ({steps} {unit})")
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Temps pour atteindre une MSE cible : gd vs sgd")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        x, y = make_data(n)
+        theta0, theta1 = fit_ols(x, y)
+        target = (1 + args.tolerance) * mse(x, y, theta0, theta1)
+        print(f"{n:,} lignes, MSE cible = {target:,.1f}")
+
+        show("gd", *gd_to_target(x, y, target), "itérations")
+        for batch_size in args.batch_sizes:
+            show(f"sgd batch={batch_size}", *sgd_to_target(x, y, target, batch_size), "epochs")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# ================================ IMPORT =====================================
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+import time
+
+# ============================== CONFIGURATION ================================
+RUNS = 20
+BUDGET = 0.080              # secondes max (médiane) pour `linreg.py predict`
+HEAVY = ("numpy", "pandas", "matplotlib")
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEVOIR = os.path.join(HERE, "..", "method_decente_gradient", "devoir")
+
+# ================================ FONCTIONS ==================================
+# Durée médiane (s) d'une commande lancée `runs` fois, stdin éventuel fourni
+def wall_time(command, runs=RUNS, stdin=None, cwd=None):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, input=stdin, cwd=cwd, capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+# -------------------------------------------------------------------------------
+# Modules lourds importés par une commande (d'après python -X importtime)
+def heavy_imports(command, cwd=None):
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command[1:], cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    found = set()
+    for line in result.stderr.splitlines():
+        name = line.rsplit("|", 1)[-1].strip()
+        if name.split(".")[0] in HEAVY:
+            found.add(name.split(".")[0])
+    return sorted(found)
+
+
+# -------------------------------------------------------------------------------
+# Mesurer les commandes de prédiction, puis vérifier linreg.py predict.
+# Renvoie le code de sortie (1 si le garde-fou échoue).
+def check(folder, runs, budget):
+    model = os.path.join(folder, "thetas.json")
+    with open(model, "w") as file:
+        json.dump({"theta0": 8499.6, "theta1": -0.0214}, file)
+
+    linreg = [sys.executable, os.path.join(HERE, "linreg.py"), "predict", "50000", "--model", model]
+    commands = [
+        ("python -c pass", [sys.executable, "-c", "pass"], None, None),
+        ("linreg.py predict", linreg, None, None),
+        ("predict.py", [sys.executable, os.path.join(HERE, "predict.py")], "50000\n", folder),
+        ("devoir/predict_prix.py", [sys.executable, os.path.join(DEVOIR, "predict_prix.py")], "50000\n", folder),
+    ]
+
+    print(f"{'commande':<24} {'médiane (ms)':>13}")
+    for name, command, stdin, cwd in commands:
+        print(f"{name:<24} {1000 * wall_time(command, runs, stdin, cwd):>13.1f}")
+
+    # Garde-fou : pas de module lourd et médiane sous le budget
+    elapsed = wall_time(linreg, runs)
+    heavy = heavy_imports(linreg)
+    failures = []
+    if heavy:
+        failures.append(f"modules lourds importés : {', '.join(heavy)}")
+    if elapsed > budget:
+        failures.append(f"{1000 * elapsed:.1f} ms > budget de {1000 * budget:.0f} ms")
+    for failure in failures:
+        print(f"ÉCHEC linreg.py predict : {failure}", file=sys.stderr)
+    if not failures:
+        print(f"OK : linreg.py predict en {1000 * elapsed:.1f} ms, sans {', '.join(HEAVY)}")
+    return 1 if failures else 0
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage de la prédiction (garde-fou)")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="médiane max en secondes")
+    args = parser.parse_args()
+
+    # Modèle jetable : le thetas.json du dépôt n'est pas touché
+    with tempfile.TemporaryDirectory() as folder:
+        return check(folder, args.runs, args.budget)
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# ================================ IMPORT =====================================
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import importlib.util
+import numpy as np
+from cache import cache_dir
+from stats import fit_ols
+from metrics import evaluate
+
+# ============================== CONFIGURATION ================================
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+NOISE = 600.0               # écart-type du bruit sur le prix (€)
+OUTLIERS = 0.0              # proportion de lignes aberrantes
+TOLERANCE = 1e-2            # écart relatif max des coefficients par rapport aux moindres carrés
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# ================================ FONCTIONS ==================================
+# Jeu km/prix synthétique et déterministe. Les lignes aberrantes reçoivent
+# un bruit 20 fois plus fort.
+def make_dataset(n, noise=NOISE, outliers=OUTLIERS, seed=42):
+    rng = np.random.default_rng(seed)
+    km = rng.uniform(0, 300_000, n).round()
+    price = 9_000 - 0.02 * km + rng.normal(0, noise, n)
+    count = int(n * outliers)
+    if count:
+        index = rng.choice(n, count, replace=False)
+        price[index] += rng.normal(0, 20 * noise, count)
+    return km, price.round(2)
+
+
+# -------------------------------------------------------------------------------
+# Écrire le jeu en CSV (réutilisé s'il existe déjà)
+def write_dataset(folder, n, noise, outliers, seed=42):
+    path = os.path.join(folder, f"synthetic_{n}_{noise:g}_{outliers:g}_{seed}.csv")
+    if not os.path.exists(path):
+        km, price = make_dataset(n, noise, outliers, seed)
+        tmp = path + ".tmp"
+        np.savetxt(tmp, np.column_stack((km, price)), fmt=("%d", "%.2f"), delimiter=",",
+                   header="km,price", comments="")
+        os.replace(tmp, path)
+    return path
+
+
+# -------------------------------------------------------------------------------
+# Importer un script d'un autre dossier du dépôt sous un nom unique
+# (plusieurs scripts s'appellent predict_prix.py)
+def load_script(name, *parts):
+    path = os.path.join(ROOT, *parts)
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# -------------------------------------------------------------------------------
+# Chronométrer les étapes d'une implémentation
+class Stages:
+    def __init__(self):
+        self.seconds = {}
+        self.last = time.perf_counter()
+
+    def done(self, name):
+        now = time.perf_counter()
+        self.seconds[name] = now - self.last
+        self.last = now
+
+
+# =========================== IMPLÉMENTATIONS ==================================
+# Chaque fonction charge, entraîne, prédit et évalue, puis renvoie les
+# durées par étape et (θ0, θ1) en échelle réelle.
+
+# main/train.py : cache binaire + moteur vectorisé
+def run_train(path):
+    import train
+    from predict import predict_price
+    import stopping
+
+    stages = Stages()
+    x, y = train.load_data(path)
+    stages.done("load")
+    theta0, theta1, _, _ = train.train(x, y, stopping=stopping.StoppingCriteria())
+    stages.done("train")
+    prices = predict_price(x, theta0, theta1)
+    stages.done("predict")
+    evaluate(y, prices)
+    stages.done("evaluate")
+    return stages.seconds, theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# main/main.py::train_model, sur tout le jeu (pas de découpage train/test)
+def run_main(path):
+    import main
+    from stopping import StoppingCriteria
+
+    stages = Stages()
+    x, y = main.load_data(path)
+    stages.done("load")
+    x_norm, x_min, x_max = main.normalize(x)
+    theta0, theta1 = main.train_model(x_norm, y, stopping=StoppingCriteria())
+    stages.done("train")
+    prices = main.predict(theta0, theta1, x_norm)
+    stages.done("predict")
+    evaluate(y, prices)
+    stages.done("evaluate")
+    scale = x_max - x_min
+    return stages.seconds, theta0 - theta1 * x_min / scale, theta1 / scale
+
+
+# -------------------------------------------------------------------------------
+# 42-ft_linear_regression : matrice [x normalisé, 1] et vecteur Theta
+def run_ft(path):
+    ft = load_script("ft_linear_regression", "42-ft_linear_regression", "ft_linear_regression.py")
+    from stopping import StoppingCriteria
+
+    stages = Stages()
+    x, normX, Y, Theta, _, _ = ft.dataset(path)
+    stages.done("load")
+    learning_rate = ft.lipschitz_rate(normX, intercept=False)
+    optimizer = ft.make_optimizer("barzilai_borwein", learning_rate)
+    Theta, _ = ft.gradient_descent(normX, Y, Theta, learning_rate, 1000, StoppingCriteria(),
+                                   optimizer=optimizer)
+    stages.done("train")
+    prediction = ft.model(normX, Theta)
+    stages.done("predict")
+    evaluate(Y[:, 0], prediction[:, 0])
+    stages.done("evaluate")
+    x_min, x_max = float(x.min()), float(x.max())
+    scale = x_max - x_min
+    theta1 = float(Theta[0, 0]) / scale
+    return stages.seconds, float(Theta[1, 0]) - theta1 * x_min, theta1
+
+
+# -------------------------------------------------------------------------------
+# method_decente_gradient/devoir/entrainement.py : DataFrame + x et y normalisés
+def run_entrainement(path):
+    entrainement = load_script("entrainement", "method_decente_gradient", "devoir", "entrainement.py")
+    from stopping import StoppingCriteria
+
+    stages = Stages()
+    data = entrainement.recup_data(path)
+    stages.done("load")
+    theta0, theta1 = entrainement.descente_gradiant(data, 0.0, 0.0, StoppingCriteria())
+    stages.done("train")
+    prices = theta0 + theta1 * data["km"].values
+    stages.done("predict")
+    evaluate(data["price"].values, prices)
+    stages.done("evaluate")
+    return stages.seconds, theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# method_moindre_carre/predict_prix_voiture : pandas.read_csv + moindres carrés
+def run_moindre_carre(path):
+    import pandas as pd
+    ols = load_script("moindre_carre", "method_moindre_carre", "predict_prix_voiture", "predict_prix.py")
+
+    stages = Stages()
+    data = pd.read_csv(path)
+    stages.done("load")
+    beta_0, beta_1 = ols.moindres_carres(data)
+    stages.done("train")
+    prices = ols.linear_regression(data["km"], beta_0, beta_1)
+    stages.done("predict")
+    evaluate(data["price"].values, prices.values)
+    stages.done("evaluate")
+    return stages.seconds, beta_0, beta_1
+
+
+IMPLEMENTATIONS = {
+    "train": run_train,
+    "main": run_main,
+    "ft": run_ft,
+    "entrainement": run_entrainement,
+    "moindre_carre": run_moindre_carre,
+}
+
+# ================================ FONCTIONS ==================================
+# Lancer une implémentation sur un fichier, cache CSV vidé (chargement à froid)
+# et affichages de progression coupés : ils ne sont pas chronométrés.
+def run_quiet(name, path):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return IMPLEMENTATIONS[name](path)
+
+
+def measure(name, path, memory=True):
+    # Les scripts importés configurent le logging racine : terminal lisible
+    logging.disable(logging.INFO)
+    shutil.rmtree(cache_dir(path), ignore_errors=True)
+    seconds, theta0, theta1 = run_quiet(name, path)
+    result = {"stages": seconds, "total": sum(seconds.values()),
+              "theta0": float(theta0), "theta1": float(theta1)}
+
+    # Second passage pour le pic mémoire : tracemalloc ralentit l'exécution.
+    # Les colonnes projetées par mmap (cache.py) ne sont pas comptées.
+    if memory:
+        shutil.rmtree(cache_dir(path), ignore_errors=True)
+        tracemalloc.start()
+        run_quiet(name, path)
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des implémentations sur données synthétiques")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--noise", type=float, default=NOISE)
+    parser.add_argument("--outliers", type=float, default=OUTLIERS, help="proportion de lignes aberrantes")
+    parser.add_argument("--implementations", nargs="+", choices=list(IMPLEMENTATIONS),
+                        default=list(IMPLEMENTATIONS))
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "linear_regression_bench"))
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire")
+    parser.add_argument("-o", "--output", help="rapport JSON (par défaut : WORKDIR/bench_report.json)")
+    args = parser.parse_args()
+    if args.output is None:
+        args.output = os.path.join(args.workdir, "bench_report.json")
+
+    os.makedirs(args.workdir, exist_ok=True)
+    report = {"config": {"noise": args.noise, "outliers": args.outliers,
+                         "tolerance": TOLERANCE, "numpy": np.__version__,
+                         "python": sys.version.split()[0]},
+              "results": []}
+
+    print(f"{'lignes':>11} {'implémentation':<15} {'load':>8} {'train':>8} {'predict':>8} "
+          f"{'evaluate':>8} {'pic (Mo)':>9} {'écart θ':>9}")
+    for n in args.sizes:
+        path = write_dataset(args.workdir, n, args.noise, args.outliers)
+        km, price = make_dataset(n, args.noise, args.outliers)
+        reference = fit_ols(km, price)
+
+        for name in args.implementations:
+            result = measure(name, path, memory=not args.no_memory)
+            error = max(abs(result["theta0"] - reference[0]) / abs(reference[0]),
+                        abs(result["theta1"] - reference[1]) / abs(reference[1]))
+            result.update(implementation=name, rows=n, theta_error=error, agrees=error <= TOLERANCE)
+            report["results"].append(result)
+
+            s = result["stages"]
+            peak = f"{result['peak_mb']:.1f}" if "peak_mb" in result else "-"
+            flag = "" if result["agrees"] else "  ✗"
+            print(f"{n:>11,} {name:<15} {s['load']:>8.3f} {s['train']:>8.3f} {s['predict']:>8.3f} "
+                  f"{s['evaluate']:>8.3f} {peak:>9} {error:>9.1e}{flag}")
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nRapport : {args.output}")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# ================================ IMPORT =====================================
+import time
+import argparse
+import numpy as np
+from engine import gradient_descent
+
+# ============================== CONFIGURATION ================================
+SIZES = [1_000, 100_000, 10_000_000]
+ITERATIONS = 50
+LOOP_BUDGET = 2_000_000     # lignes * itérations max pour la boucle Python
+PROJECTION = 5000           # nombre d'itérations de train.py
+
+# ================================ FONCTIONS ==================================
+# Ancienne boucle Python pure de train.py (référence)
+def train_loop(x, y, learning_rate=0.01, iterations=5000):
+    theta0 = 0
+    theta1 = 0
+    m = len(x)
+
+    for _ in range(iterations):
+        sum_errors_0 = sum((theta0 + theta1 * x[i] - y[i]) for i in range(m))
+        sum_errors_1 = sum((theta0 + theta1 * x[i] - y[i]) * x[i] for i in range(m))
+
+        theta0 -= learning_rate * (1 / m) * sum_errors_0
+        theta1 -= learning_rate * (1 / m) * sum_errors_1
+
+    return theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# Jeu de données synthétique km/prix, x déjà normalisé
+def make_data(n, seed=42):
+    rng = np.random.default_rng(seed)
+    x = rng.random(n)
+    y = 8500 - 4500 * x + rng.normal(0, 600, n)
+    return x, y
+
+
+# -------------------------------------------------------------------------------
+# Temps moyen d'une itération
+def time_per_iteration(fn, x, y, iterations):
+    start = time.perf_counter()
+    fn(x, y, 0.01, iterations)
+    return (time.perf_counter() - start) / iterations
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark boucle Python vs moteur vectorisé")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    args = parser.parse_args()
+
+    print(f"{'lignes':>12} {'boucle (s/it)':>14} {'numpy (s/it)':>14} {'speedup':>9} {'5000 it. numpy':>15}")
+    for n in args.sizes:
+        x, y = make_data(n)
+
+        # La boucle Python est limitée en nombre d'itérations sur les gros jeux
+        loop_iterations = max(1, min(args.iterations, LOOP_BUDGET // n))
+        t_loop = time_per_iteration(train_loop, x.tolist(), y.tolist(), loop_iterations)
+        t_numpy = time_per_iteration(gradient_descent, x, y, args.iterations)
+
+        print(f"{n:>12,} {t_loop:>14.3e} {t_numpy:>14.3e} {t_loop / t_numpy:>8.0f}x {t_numpy * PROJECTION:>14.2f}s")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# ================================ IMPORT =====================================
+import os
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from crossval import SEED, SHARED, attach, share
+from predict import predict_price
+from stats import fit_ols
+from train import load_data
+
+# ============================== CONFIGURATION ================================
+REPLICATES = 10_000
+CONFIDENCE = 0.95
+BLOCK_CELLS = 4_000_000     # taille max d'une matrice de poids (réplicats x lignes)
+BLOCKS = 32                 # blocs de réplicats répartis sur les workers
+
+# ================================ FONCTIONS ==================================
+# Ajuster `count` réplicats d'un coup, à partir des statistiques suffisantes
+# Σw·x, Σw·y, Σw·x², Σw·x·y de chaque réplicat (w : nombre de tirages de
+# chaque ligne). x et y sont centrés au préalable pour éviter les pertes de
+# précision.
+#   exact=True  : indices rééchantillonnés tirés en bloc (matrice réplicats x
+#                 lignes), comptés par np.bincount, puis un seul produit
+#                 matriciel donne les statistiques de tous les réplicats.
+#   exact=False : approximation (option --approx), pas un rééchantillonnage :
+#                 pour n grand, ces sommes de n tirages indépendants suivent
+#                 une loi normale (TCL) de moyenne n·μ et de covariance n·Σ,
+#                 μ et Σ étant calculés une fois sur les données : chaque
+#                 réplicat coûte O(1) au lieu de O(n).
+def fit_replicates(x, y, count, rng, exact=True):
+    n = len(x)
+    mean_x = x.mean()
+    mean_y = y.mean()
+    xc = x - mean_x
+    yc = y - mean_y
+    columns = np.column_stack((xc, yc, xc * xc, xc * yc))
+
+    if exact:
+        rows = max(1, BLOCK_CELLS // n)
+        dtype = np.int32 if rows * n < 2**31 else np.int64
+        sums = np.empty((count, 4))
+        for start in range(0, count, rows):
+            b = min(rows, count - start)
+            index = rng.integers(0, n, (b, n), dtype=dtype)
+            index += (np.arange(b, dtype=dtype) * n)[:, np.newaxis]
+            weights = np.bincount(index.ravel(), minlength=b * n).reshape(b, n)
+            sums[start:start + b] = weights @ columns
+    else:
+        sums = rng.multivariate_normal(n * columns.mean(axis=0),
+                                       n * np.cov(columns, rowvar=False, bias=True), size=count,
+                                       check_valid="ignore", method="eigh")
+
+    sx, sy, sxx, sxy = sums.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta1 = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    theta0 = mean_y + sy / n - theta1 * (mean_x + sx / n)
+    return theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# Tâche d'un worker : un bloc de réplicats, sur les données partagées
+def run_block(count, seed, exact):
+    x, y = SHARED["data"]
+    return fit_replicates(x, y, count, np.random.default_rng(seed), exact)
+
+
+# -------------------------------------------------------------------------------
+# Bootstrap de θ0, θ1 : B réplicats répartis en blocs sur un pool de processus
+# (workers=1 : dans le processus courant). Chaque bloc a sa propre graine
+# (SeedSequence.spawn), le résultat ne dépend donc pas du nombre de workers.
+# Rééchantillonnage exact quelle que soit la taille ; exact=False choisit
+# explicitement l'approximation normale (voir fit_replicates).
+def bootstrap(x, y, replicates=REPLICATES, workers=None, seed=SEED, exact=True):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    workers = workers or os.cpu_count()
+    blocks = max(1, min(replicates, BLOCKS))
+    counts = [len(part) for part in np.array_split(np.arange(replicates), blocks)]
+    seeds = np.random.SeedSequence(seed).spawn(blocks)
+
+    if workers == 1:
+        results = [fit_replicates(x, y, count, np.random.default_rng(s), exact)
+                   for count, s in zip(counts, seeds)]
+    else:
+        block, data = share(x, y)
+        try:
+            with ProcessPoolExecutor(workers, initializer=attach,
+                                     initargs=(block.name, len(x))) as pool:
+                results = list(pool.map(run_block, counts, seeds, [exact] * blocks))
+        finally:
+            del data
+            block.close()
+            block.unlink()
+    theta0 = np.concatenate([r[0] for r in results])
+    theta1 = np.concatenate([r[1] for r in results])
+    return theta0, theta1
+
+
+# -------------------------------------------------------------------------------
+# Intervalle de confiance par percentiles (colonne par colonne, réplicats
+# dégénérés ignorés : tous les tirages sur un même kilométrage)
+def interval(samples, confidence=CONFIDENCE):
+    alpha = (1 - confidence) / 2
+    return np.nanquantile(samples, [alpha, 1 - alpha], axis=0)
+
+
+# -------------------------------------------------------------------------------
+# Intervalles des prix prédits : une prédiction par réplicat et par kilométrage
+def prediction_interval(km, theta0, theta1, confidence=CONFIDENCE):
+    prices = predict_price(np.asarray(km, dtype=np.float64)[np.newaxis, :],
+                           theta0[:, np.newaxis], theta1[:, np.newaxis])
+    return interval(prices, confidence)
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Intervalles de confiance bootstrap de θ0, θ1")
+    parser.add_argument("--data", default="data.csv")
+    parser.add_argument("-B", "--replicates", type=int, default=REPLICATES)
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE)
+    parser.add_argument("--km", type=float, nargs="+", default=[50_000, 100_000, 150_000, 200_000],
+                        help="kilométrages pour les intervalles de prédiction")
+    parser.add_argument("--workers", type=int, help="processus (défaut : un par cœur)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--approx", action="store_true",
+                        help="tirer les statistiques suffisantes d'une loi normale (TCL) au lieu de "
+                             "rééchantillonner les lignes : O(1) par réplicat, approximation")
+    args = parser.parse_args()
+
+    x, y = load_data(args.data)
+    estimate = fit_ols(x, y)
+    theta0, theta1 = bootstrap(x, y, args.replicates, args.workers, args.seed,
+                               exact=not args.approx)
+    level = f"{args.confidence:.0%}"
+
+    print(f"{args.replicates} réplicats bootstrap, intervalles à {level} :")
+    for name, value, samples in (("θ0", estimate[0], theta0), ("θ1", estimate[1], theta1)):
+        low, high = interval(samples, args.confidence)
+        print(f"  {name} = {value:.6g}  [{low:.6g}, {high:.6g}]")
+
+    print("\nPrix prédits :")
+    lows, highs = prediction_interval(args.km, theta0, theta1, args.confidence)
+    for km, low, high in zip(args.km, lows, highs):
+        price = predict_price(km, *estimate)
+        print(f"  {km:>10.0f} km : {price:.2f} €  [{low:.2f}, {high:.2f}]")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# ================================ IMPORT =====================================
+import os
+import json
+import hashlib
+import numpy as np
+from chunks import is_header, read_chunks
+from registry import write_json_atomic
+
+# ============================== CONFIGURATION ================================
+CACHE_SUFFIX = ".cache"
+META_FILE = "meta.json"
+HASH_BLOCK = 1 << 20        # lecture par blocs de 1 Mo pour le hash
+
+# ================================ FONCTIONS ==================================
+# Dossier cache à côté du CSV : data.csv -> .data.csv.cache/
+def cache_dir(filename):
+    folder, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(folder, "." + name + CACHE_SUFFIX)
+
+
+# -------------------------------------------------------------------------------
+# Hash du contenu du fichier source
+def content_hash(filename):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# -------------------------------------------------------------------------------
+# Noms des colonnes (en-tête du CSV). Sans en-tête, la première ligne est
+# une ligne de données : colonnes nommées col0, col1...
+def read_header(filename):
+    with open(filename, "r") as file:
+        first = file.readline()
+    names = [name.strip() for name in first.split(",")]
+    return names if is_header(first) else [f"col{i}" for i in range(len(names))]
+
+
+# -------------------------------------------------------------------------------
+# Lire les métadonnées du cache (None si absent ou illisible)
+def read_meta(folder):
+    try:
+        with open(os.path.join(folder, META_FILE), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+# -------------------------------------------------------------------------------
+# Projeter les colonnes en mémoire (lecture seule, sans copie)
+def map_columns(folder, meta):
+    return tuple(np.load(os.path.join(folder, name), mmap_mode="r")
+                 for name in meta["files"])
+
+
+# -------------------------------------------------------------------------------
+# Colonnes `usecols` (noms ou indices) parmi `arrays`, limitées aux lignes
+# valides dans toutes ces colonnes. Une valeur non numérique ou vide est NaN
+# dans le cache ; seules les colonnes utilisées comptent. `missing` : nombre
+# de NaN par colonne (meta.json), pour ne calculer le masque que s'il le faut.
+# Sans `usecols`, toutes les colonnes sont renvoyées telles quelles (NaN compris).
+def select_columns(arrays, names, usecols=None, missing=None):
+    if usecols is None:
+        return tuple(arrays)
+    indices = [names.index(col) if isinstance(col, str) else col for col in usecols]
+    selected = [arrays[i] for i in indices]
+    if missing is not None and not any(missing[i] for i in indices):
+        return tuple(selected)
+    valid = np.ones(len(arrays[0]) if arrays else 0, dtype=bool)
+    for column in selected:
+        valid &= ~np.isnan(column)
+    if valid.all():
+        return tuple(selected)
+    return tuple(column[valid] for column in selected)
+
+
+# -------------------------------------------------------------------------------
+# Parser le CSV et remplir le cache : une colonne .npy par colonne du CSV.
+# Une ligne n'est ignorée que si toutes ses valeurs sont invalides ; sinon
+# chaque valeur invalide reste NaN dans sa colonne (voir select_columns).
+def build_cache(filename, folder, stat, digest):
+    names = read_header(filename)
+    columns = tuple(range(len(names)))
+    blocks = [[] for _ in columns]
+    for chunk in read_chunks(filename, columns=columns, how="all"):
+        for i, values in enumerate(chunk):
+            blocks[i].append(values)
+    arrays = [np.concatenate(block) if block else np.empty(0) for block in blocks]
+
+    os.makedirs(folder, exist_ok=True)
+    old = read_meta(folder)
+    files = []
+    for i, values in enumerate(arrays):
+        name = f"{digest}.{i}.npy"
+        tmp = os.path.join(folder, f"{name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as file:
+            np.save(file, values)
+        os.replace(tmp, os.path.join(folder, name))
+        files.append(name)
+
+    meta = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": digest,
+        "names": names,
+        "rows": int(len(arrays[0])) if arrays else 0,
+        "missing": [int(np.isnan(values).sum()) for values in arrays],
+        "files": files,
+    }
+    write_json_atomic(os.path.join(folder, META_FILE), meta)
+
+    # Supprimer les colonnes d'une ancienne version du fichier source
+    if old and old.get("hash") != digest:
+        for name in old.get("files", []):
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+    return meta
+
+
+# -------------------------------------------------------------------------------
+# Noms des colonnes numériques (au moins une valeur valide) : une colonne de
+# texte (marque, modèle...) n'est ni une variable ni une cible par défaut
+def numeric_names(filename):
+    return [name for name, column in zip(read_header(filename), load_columns(filename))
+            if not np.isnan(column).all()]
+
+
+# -------------------------------------------------------------------------------
+# Charger les colonnes numériques d'un CSV via le cache binaire : toutes (les
+# valeurs invalides restent NaN), ou celles de `usecols` (noms ou indices) sur
+# les lignes valides pour elles.
+# Le cache est valide si taille et mtime correspondent ; si seule la mtime a
+# changé (fichier touché), le hash du contenu décide. Sinon il est reconstruit.
+def load_columns(filename, usecols=None):
+    stat = os.stat(filename)
+    folder = cache_dir(filename)
+    meta = read_meta(folder)
+
+    try:
+        digest = None
+        fresh = bool(meta) and "missing" in meta and meta["size"] == stat.st_size
+        if fresh and meta["mtime_ns"] != stat.st_mtime_ns:
+            # Un seul hash du contenu, réutilisé si le cache est reconstruit
+            digest = content_hash(filename)
+            fresh = meta["hash"] == digest
+            if fresh:
+                meta["mtime_ns"] = stat.st_mtime_ns
+                write_json_atomic(os.path.join(folder, META_FILE), meta)
+        if not fresh:
+            meta = build_cache(filename, folder, stat, digest or content_hash(filename))
+        names, arrays, missing = meta["names"], map_columns(folder, meta), meta["missing"]
+    except (OSError, KeyError, ValueError):
+        # Cache inutilisable (dossier en lecture seule, fichiers corrompus...) :
+        # on se contente du parsing
+        names = read_header(filename)
+        blocks = list(zip(*read_chunks(filename, columns=tuple(range(len(names))), how="all")))
+        arrays = [np.concatenate(block) for block in blocks] if blocks else [np.empty(0) for _ in names]
+        missing = None
+
+    if not len(arrays[0]):
+        raise ValueError(f"{filename} : aucune ligne de données numériques")
+    return select_columns(arrays, names, usecols, missing)
@@ -0,0 +1,57 @@
+# ================================ IMPORT =====================================
+import numpy as np
+import pandas as pd
+
+# ============================== CONFIGURATION ================================
+CHUNK_ROWS = 1_000_000      # lignes lues par bloc (≈ 16 Mo pour deux colonnes)
+
+# ================================ FONCTIONS ==================================
+# Vrai si la ligne est un en-tête : aucune valeur numérique. Une ligne de
+# données avec une colonne de texte (marque...) ou une valeur vide n'en est pas un.
+def is_header(line):
+    for value in line.split(","):
+        try:
+            float(value)
+            return False
+        except ValueError:
+            pass
+    return True
+
+
+# -------------------------------------------------------------------------------
+# Vrai si la première ligne du fichier est un en-tête (voir is_header)
+def has_header(filename):
+    with open(filename, "r") as file:
+        return is_header(file.readline())
+
+
+# -------------------------------------------------------------------------------
+# Lire un CSV bloc par bloc : renvoie un tableau float64 par colonne demandée.
+# `source` est un chemin ou un fichier ouvert (sys.stdin par exemple).
+# Comme avec csv.reader + float(), l'en-tête et les lignes invalides sont ignorés.
+# how="any" : une ligne est ignorée si une des colonnes demandées est invalide ;
+# how="all" : seulement si toutes le sont (les valeurs invalides restent NaN).
+def read_chunks(source, chunk_rows=CHUNK_ROWS, columns=(0, 1), how="any"):
+    # L'en-tête d'un fichier est sauté d'emblée pour que pandas lise des
+    # colonnes float64 ; sur un flux (stdin) il est simplement filtré.
+    skip = 1 if isinstance(source, str) and has_header(source) else 0
+    try:
+        reader = pd.read_csv(source, header=None, usecols=list(columns), skiprows=skip,
+                             chunksize=chunk_rows, skip_blank_lines=True)
+    except pd.errors.EmptyDataError:
+        return                  # fichier vide ou en-tête seul : aucun bloc
+    for frame in reader:
+        values = [pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+                  for col in columns]
+        if how == "any":
+            valid = np.ones(len(frame), dtype=bool)
+            for column in values:
+                valid &= ~np.isnan(column)
+        else:
+            valid = np.zeros(len(frame), dtype=bool)
+            for column in values:
+                valid |= ~np.isnan(column)
+        if not valid.all():
+            values = [column[valid] for column in values]
+        if len(values[0]):
+            yield tuple(values)
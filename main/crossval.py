@@ -0,0 +1,107 @@
+# ================================ IMPORT =====================================
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from metrics import evaluate
+
+# ============================== CONFIGURATION ================================
+FOLDS = 5
+REPEATS = 1
+SEED = 42
+
+# Données partagées, vues depuis chaque processus (voir attach)
+SHARED = {}
+
+# ================================ FONCTIONS ==================================
+# Copier x et y une seule fois dans un segment de mémoire partagée (2, n)
+def share(x, y):
+    n = len(x)
+    block = shared_memory.SharedMemory(create=True, size=max(1, 2 * n * 8))
+    data = np.ndarray((2, n), dtype=np.float64, buffer=block.buf)
+    data[0] = x
+    data[1] = y
+    return block, data
+
+
+# -------------------------------------------------------------------------------
+# Initialisation d'un worker : projeter le segment sans le copier
+def attach(name, n):
+    block = shared_memory.SharedMemory(name=name)
+    SHARED["block"] = block
+    SHARED["data"] = np.ndarray((2, n), dtype=np.float64, buffer=block.buf)
+
+
+# -------------------------------------------------------------------------------
+# Indices de test d'un pli. La permutation est recalculée à partir de la
+# graine dans chaque processus : seuls (repeat, fold) voyagent entre processus.
+def fold_indices(n, k, repeat, fold, seed=SEED):
+    order = np.random.default_rng([seed, repeat]).permutation(n)
+    return np.array_split(order, k)[fold]
+
+
+# -------------------------------------------------------------------------------
+# Entraîner sur k-1 plis et évaluer sur le pli restant.
+# `fit(x, y)` renvoie (θ0, θ1) en échelle réelle ; elle doit être picklable
+# (fonction de module ou functools.partial).
+def run_fold(fit, k, repeat, fold, seed=SEED):
+    x, y = SHARED["data"]
+    test = fold_indices(len(x), k, repeat, fold, seed)
+    train = np.ones(len(x), dtype=bool)
+    train[test] = False
+
+    start = time.perf_counter()
+    theta0, theta1 = fit(x[train], y[train])
+    elapsed = time.perf_counter() - start
+    metrics = evaluate(y[test], theta0 + theta1 * x[test])
+    return {
+        "repeat": repeat,
+        "fold": fold,
+        "theta0": theta0,
+        "theta1": theta1,
+        "mse": metrics.mse,
+        "mae": metrics.mae,
+        "r2": metrics.r2,
+        "seconds": elapsed,
+    }
+
+
+# -------------------------------------------------------------------------------
+# Validation croisée k-fold répétée. Les plis sont répartis sur un pool de
+# processus (workers=1 : tout dans le processus courant). Renvoie la liste
+# des résultats par pli et la durée totale.
+def cross_validate(x, y, fit, k=FOLDS, repeats=REPEATS, workers=None, seed=SEED):
+    tasks = [(repeat, fold) for repeat in range(repeats) for fold in range(k)]
+    block, data = share(x, y)
+    try:
+        start = time.perf_counter()
+        if workers == 1:
+            SHARED["data"] = data
+            results = [run_fold(fit, k, repeat, fold, seed) for repeat, fold in tasks]
+        else:
+            workers = workers or os.cpu_count()
+            with ProcessPoolExecutor(workers, initializer=attach,
+                                     initargs=(block.name, len(x))) as pool:
+                futures = [pool.submit(run_fold, fit, k, repeat, fold, seed)
+                           for repeat, fold in tasks]
+                results = [future.result() for future in futures]
+        return results, time.perf_counter() - start
+    finally:
+        SHARED.clear()
+        del data
+        block.close()
+        block.unlink()
+
+
+# -------------------------------------------------------------------------------
+# Tableau des plis puis moyenne ± écart-type de chaque métrique
+def report(results):
+    lines = [f"{'rép.':>4} {'pli':>4} {'MSE':>14} {'MAE':>10} {'R²':>8} {'temps (s)':>10}"]
+    for r in results:
+        lines.append(f"{r['repeat']:>4} {r['fold']:>4} {r['mse']:>14.2f} {r['mae']:>10.2f} "
+                     f"{r['r2']:>8.4f} {r['seconds']:>10.4f}")
+    for name in ("mse", "mae", "r2"):
+        values = np.array([r[name] for r in results])
+        lines.append(f"  {name.upper():<4} moyenne = {values.mean():.4f} ± {values.std():.4f}")
+    return "\n".join(lines)
@@ -0,0 +1,217 @@
+# ================================ IMPORT =====================================
+import math
+import numpy as np
+from precision import accurate_gradient, accurate_sum
+
+# ============================== CONFIGURATION ================================
+AUTO = "auto"           # learning rate calculé depuis les données
+
+# ================================ FONCTIONS ==================================
+# Convertir en tableau float contigu (aucune copie si c'est déjà le cas)
+def as_array(values, dtype=np.float64):
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+# -------------------------------------------------------------------------------
+# Plus grand pas sûr pour le coût (1/2m)‖Xθ - y‖² : 1 / L avec L = λmax(XᵀX / m),
+# la constante de Lipschitz du gradient. X est un vecteur ou une matrice (m, p) ;
+# avec intercept=True, la colonne de 1 est ajoutée à la matrice de Gram (sans
+# copier X). Le calcul se fait une fois, sur une matrice (p + 1) x (p + 1).
+# Un X float32 n'est pas converti : sommes compensées (voir precision.py).
+def lipschitz_rate(X, intercept=True):
+    X = np.asarray(X)
+    if X.dtype != np.float32:
+        X = X.astype(np.float64, copy=False)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    m = len(X)
+    if X.dtype == np.float32:
+        gram = np.column_stack([accurate_gradient(X, X[:, j]) for j in range(X.shape[1])]) / m
+    else:
+        gram = X.T.dot(X) / m
+    if intercept:
+        mean = np.array([accurate_sum(X[:, j]) for j in range(X.shape[1])]) / m
+        gram = np.block([[np.ones((1, 1)), mean[np.newaxis, :]],
+                         [mean[:, np.newaxis], gram]])
+    return 1.0 / float(np.linalg.eigvalsh(gram)[-1])
+
+
+# -------------------------------------------------------------------------------
+# learning_rate numérique, ou AUTO pour le calculer depuis X
+def resolve_learning_rate(learning_rate, X, intercept=True):
+    if learning_rate == AUTO:
+        return lipschitz_rate(X, intercept)
+    return float(learning_rate)
+
+
+# -------------------------------------------------------------------------------
+# Type argparse pour --learning-rate : un nombre ou "auto"
+def learning_rate_type(text):
+    return text if text == AUTO else float(text)
+
+
+# -------------------------------------------------------------------------------
+# Descente de gradient vectorisée : θ0 + θ1 * x, x déjà normalisé.
+# Le résidu est calculé dans un tampon préalloué, réutilisé à chaque itération.
+# `stopping` (voir stopping.py) permet de s'arrêter avant `iterations`,
+# `recorder` (voir telemetry.py) échantillonne l'historique du coût.
+# learning_rate=AUTO : pas de Lipschitz (voir lipschitz_rate).
+def gradient_descent(x, y, learning_rate=0.01, iterations=5000, theta0=0.0, theta1=0.0,
+                     stopping=None, recorder=None):
+    x = as_array(x)
+    y = as_array(y)
+    learning_rate = resolve_learning_rate(learning_rate, x)
+    m = len(x)
+    error = np.empty_like(x)
+    if stopping is not None:
+        stopping.start()
+
+    for i in range(iterations):
+        # error = θ0 + θ1 * x - y
+        np.multiply(x, theta1, out=error)
+        error += theta0
+        error -= y
+
+        grad0 = error.sum() / m
+        grad1 = error.dot(x) / m
+
+        # Coût de θ avant la mise à jour, calculé sur le résidu déjà là
+        if stopping is not None or (recorder is not None and recorder.due(i)):
+            cost = error.dot(error) / (2 * m)
+            if recorder is not None and recorder.due(i):
+                recorder.record(i, cost)
+
+        theta0 -= learning_rate * grad0
+        theta1 -= learning_rate * grad1
+
+        if stopping is not None:
+            grad_norm = math.hypot(grad0, grad1)
+            if stopping.check(i, cost, grad_norm, learning_rate * grad_norm,
+                              math.hypot(theta0, theta1)):
+                break
+
+    if stopping is not None and stopping.reason is None:
+        stopping.finish(iterations)
+    return float(theta0), float(theta1)
+
+
+# -------------------------------------------------------------------------------
+# Descente de gradient sur plusieurs variables : y ≈ intercept + X · coef,
+# X matrice (m, p) déjà normalisée. Même structure que gradient_descent :
+# résidu et gradient dans des tampons préalloués, aucune boucle sur les
+# variables, ce qui tient jusqu'à des centaines de colonnes.
+def gradient_descent_matrix(X, y, learning_rate=0.01, iterations=5000, intercept=0.0, coef=None,
+                            stopping=None, recorder=None):
+    X = np.asarray(X, dtype=np.float64)
+    y = as_array(y)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    m, p = X.shape
+    learning_rate = resolve_learning_rate(learning_rate, X)
+    coef = np.zeros(p) if coef is None else np.array(coef, dtype=np.float64).reshape(p)
+    error = np.empty(m)
+    gradient = np.empty(p)
+    if stopping is not None:
+        stopping.start()
+
+    for i in range(iterations):
+        # error = intercept + X · coef - y
+        np.dot(X, coef, out=error)
+        error += intercept
+        error -= y
+
+        grad0 = error.sum() / m
+        np.dot(error, X, out=gradient)
+        gradient /= m
+
+        if stopping is not None or (recorder is not None and recorder.due(i)):
+            cost = error.dot(error) / (2 * m)
+            if recorder is not None and recorder.due(i):
+                recorder.record(i, cost)
+
+        intercept -= learning_rate * grad0
+        coef -= learning_rate * gradient
+
+        if stopping is not None:
+            grad_norm = math.sqrt(grad0 * grad0 + gradient.dot(gradient))
+            param_norm = math.sqrt(intercept * intercept + coef.dot(coef))
+            if stopping.check(i, cost, grad_norm, learning_rate * grad_norm, param_norm):
+                break
+
+    if stopping is not None and stopping.reason is None:
+        stopping.finish(iterations)
+    return float(intercept), coef
+
+
+# -------------------------------------------------------------------------------
+# Pas d'apprentissage pour une epoch donnée
+SCHEDULES = ("constant", "inverse", "exponential")
+
+def learning_rate_schedule(learning_rate, epoch, schedule="constant", decay=0.0):
+    if schedule == "constant":
+        return learning_rate
+    if schedule == "inverse":
+        return learning_rate / (1.0 + decay * epoch)
+    if schedule == "exponential":
+        return learning_rate * math.exp(-decay * epoch)
+    raise ValueError(f"schedule inconnu : {schedule} (choix : {', '.join(SCHEDULES)})")
+
+
+# -------------------------------------------------------------------------------
+# Descente de gradient stochastique par mini-batchs : y ≈ intercept + X · coef.
+# X est une matrice (m, p) ou un vecteur (m,) de variables déjà normalisées.
+# Chaque epoch parcourt une permutation des indices : les données ne sont ni
+# mélangées ni copiées, seul le mini-batch courant est rassemblé (np.take)
+# dans des tampons préalloués. `stopping` et `recorder` travaillent à l'epoch,
+# sur la moyenne des coûts des mini-batchs (aucune passe supplémentaire).
+def minibatch_sgd(X, y, learning_rate=0.01, epochs=10, batch_size=256, schedule="constant",
+                  decay=0.0, intercept=0.0, coef=None, seed=None, stopping=None, recorder=None):
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    m, p = X.shape
+    learning_rate = resolve_learning_rate(learning_rate, X)
+    batch_size = min(batch_size, m)
+    coef = np.zeros(p) if coef is None else np.array(coef, dtype=np.float64).reshape(p)
+    rng = np.random.default_rng(seed)
+
+    x_batch = np.empty((batch_size, p))
+    y_batch = np.empty(batch_size)
+    error = np.empty(batch_size)
+    if stopping is not None:
+        stopping.start()
+
+    for epoch in range(epochs):
+        rate = learning_rate_schedule(learning_rate, epoch, schedule, decay)
+        measure = stopping is not None or (recorder is not None and recorder.due(epoch))
+        epoch_cost = 0.0
+        order = rng.permutation(m)
+
+        for start in range(0, m, batch_size):
+            index = order[start:start + batch_size]
+            b = len(index)
+            xb, yb, err = x_batch[:b], y_batch[:b], error[:b]
+            np.take(X, index, axis=0, out=xb)
+            np.take(y, index, out=yb)
+
+            # err = intercept + xb · coef - yb
+            np.dot(xb, coef, out=err)
+            err += intercept
+            err -= yb
+            if measure:
+                epoch_cost += err.dot(err)
+
+            intercept -= rate * err.sum() / b
+            coef -= (rate / b) * xb.T.dot(err)
+
+        if measure:
+            cost = epoch_cost / (2 * m)
+            if recorder is not None and recorder.due(epoch):
+                recorder.record(epoch, cost)
+            if stopping is not None and stopping.check(epoch, cost):
+                break
+
+    if stopping is not None and stopping.reason is None:
+        stopping.finish(epochs)
+    return float(intercept), coef
@@ -1,57 +1,42 @@
-import csv
-import json
-
-# Charger les données (km, price)
-def load_data(filename='data.csv'):
-    x = []
-    y = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        next(reader)
-        for row in reader:
-            try:
-                x.append(float(row[0]))
-                y.append(float(row[1]))
-            except:
-                pass
-    return x, y
-
-# Charger θ0, θ1
-def load_thetas(filename='thetas.json'):
-    with open(filename, 'r') as file:
-        data = json.load(file)
-    return data['theta0'], data['theta1']
-
-# Prédire avec le modèle
-def predict(theta0, theta1, x):
-    return [theta0 + theta1 * xi for xi in x]
-
-# Calcul MSE
-def mean_squared_error(y_true, y_pred):
-    n = len(y_true)
-    return sum((y_true[i] - y_pred[i])**2 for i in range(n)) / n
-
-# Calcul MAE
-def mean_absolute_error(y_true, y_pred):
-    n = len(y_true)
-    return sum(abs(y_true[i] - y_pred[i]) for i in range(n)) / n
-
-# Calcul R²
-def r2_score(y_true, y_pred):
-    mean_y = sum(y_true) / len(y_true)
-    ss_res = sum((y_true[i] - y_pred[i])**2 for i in range(len(y_true)))
-    ss_tot = sum((y_true[i] - mean_y)**2 for i in range(len(y_true)))
-    return 1 - (ss_res / ss_tot)
+import argparse
+import numpy as np
+from cache import load_columns, read_header
+from chunks import CHUNK_ROWS, read_chunks
+from metrics import evaluate, evaluate_stream
+from predict import load_linear_model, predict_prices
+
+# Charger les variables du modèle et la cible par nom : matrice X (m, p), y
+def load_features(features, target, filename='data.csv'):
+    columns = load_columns(filename, usecols=list(features) + [target])
+    return np.column_stack(columns[:-1]), columns[-1]
+
+# Évaluer en flux : le CSV est lu par blocs, chaque bloc est prédit puis
+# ajouté aux métriques (mémoire bornée, un seul passage sur les données)
+def evaluate_file(filename, intercept, coef, features, target, chunk_rows=None):
+    names = read_header(filename)
+    columns = tuple(names.index(name) for name in list(features) + [target])
+    blocks = ((chunk[-1], predict_prices(np.column_stack(chunk[:-1]), intercept, coef))
+              for chunk in read_chunks(filename, chunk_rows or CHUNK_ROWS, columns=columns))
+    return evaluate_stream(blocks)
 
 if __name__ == "__main__":
-    x, y_true = load_data()
-    theta0, theta1 = load_thetas()
-    y_pred = predict(theta0, theta1, x)
-
-    mse = mean_squared_error(y_true, y_pred)
-    mae = mean_absolute_error(y_true, y_pred)
-    r2 = r2_score(y_true, y_pred)
-
-    print(f"MSE (Mean Squared Error) : {mse:.2f}")
-    print(f"MAE (Mean Absolute Error) : {mae:.2f}")
-    print(f"R² score : {r2:.4f}")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="data.csv", help="CSV à évaluer (défaut %(default)s)")
+    parser.add_argument("--stream", action="store_true",
+                        help="lire le CSV par blocs (mémoire constante, gros fichiers)")
+    parser.add_argument("--chunk-rows", type=int, help="lignes lues par bloc en mode --stream")
+    args = parser.parse_args()
+
+    intercept, coef, features, target = load_linear_model()
+    if args.stream:
+        metrics = evaluate_file(args.data, intercept, coef, features, target, args.chunk_rows)
+    else:
+        X, y_true = load_features(features, target, args.data)
+        metrics = evaluate(y_true, predict_prices(X, intercept, coef))
+
+    print(f"MSE (Mean Squared Error) : {metrics.mse:.2f}")
+    print(f"RMSE (Root Mean Squared Error) : {metrics.rmse:.2f}")
+    print(f"MAE (Mean Absolute Error) : {metrics.mae:.2f}")
+    print(f"R² score : {metrics.r2:.4f}")
+    print(f"Erreur max : {metrics.max_error:.2f}")
+    print(f"Résidu moyen : {metrics.residual_mean:.2f}")
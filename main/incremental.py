@@ -0,0 +1,109 @@
+# ================================ IMPORT =====================================
+import io
+import os
+import json
+import zlib
+from stats import Moments
+from chunks import CHUNK_ROWS, has_header, read_chunks
+from registry import write_json_atomic
+
+# ============================== CONFIGURATION ================================
+FORMAT = 2                  # version du fichier d'état
+STATE_SUFFIX = ".state.json"
+BLOCK_BYTES = 64 << 20      # octets lus à la fois dans le CSV
+
+# ================================ FONCTIONS ==================================
+# Fichier d'état associé à un modèle : thetas.json -> thetas.state.json
+def state_path(model_file):
+    return os.path.splitext(model_file)[0] + STATE_SUFFIX
+
+
+# -------------------------------------------------------------------------------
+# CRC32 des `offset` premiers octets du CSV : toute modification ou
+# suppression d'une ligne déjà intégrée le change. Simple lecture, sans
+# parsing (≈ 2 Go/s), bien moins coûteux qu'un réentraînement complet.
+def prefix_crc(filename, offset, block_bytes=BLOCK_BYTES):
+    crc = 0
+    with open(filename, "rb") as file:
+        while offset > 0:
+            block = file.read(min(block_bytes, offset))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            offset -= len(block)
+    return crc
+
+
+# -------------------------------------------------------------------------------
+# Reprendre l'état sauvegardé : (Moments, offset, CRC32 du préfixe). Sans
+# état valide pour ce CSV et ces colonnes (absent, autre fichier, autres
+# colonnes, fichier raccourci, ou une ligne déjà intégrée modifiée ou
+# supprimée), on repart de zéro.
+def load_state(data_file, model_file="thetas.json", columns=(0, 1)):
+    try:
+        with open(state_path(model_file), "r") as file:
+            state = json.load(file)
+        offset = state["offset"]
+        if (state["format"] == FORMAT and state["data"] == os.path.abspath(data_file)
+                and state["columns"] == list(columns)
+                and offset <= os.path.getsize(data_file)
+                and state["crc"] == prefix_crc(data_file, offset)):
+            return Moments.from_dict(state["moments"]), offset, state["crc"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return Moments(), 0, 0
+
+
+# -------------------------------------------------------------------------------
+def save_state(data_file, stats, offset, crc, model_file="thetas.json", columns=(0, 1)):
+    write_json_atomic(state_path(model_file), {
+        "format": FORMAT,
+        "data": os.path.abspath(data_file),
+        "columns": list(columns),
+        "offset": offset,
+        "crc": crc,
+        "moments": stats.to_dict(),
+    })
+
+
+# -------------------------------------------------------------------------------
+# Ajouter aux statistiques les lignes du CSV situées après `offset` : seule
+# la partie ajoutée est lue, par blocs de BLOCK_BYTES coupés en fin de ligne.
+# Une dernière ligne sans saut de ligne (écriture en cours) est laissée pour
+# la prochaine fois. `columns` : indices (variable, cible) dans le CSV.
+# `crc` (CRC32 des `offset` premiers octets) est prolongé sur les octets lus.
+# Renvoie (nouvel offset, lignes ajoutées, CRC32 du nouveau préfixe).
+def fold_appended(stats, data_file, offset=0, columns=(0, 1), crc=0, block_bytes=BLOCK_BYTES):
+    rows = 0
+    pending = b""
+    with open(data_file, "rb") as file:
+        if offset == 0 and has_header(data_file):
+            header = file.readline()            # colonnes float64 d'emblée pour pandas
+            offset = len(header)
+            crc = zlib.crc32(header, crc)
+        file.seek(offset)
+        for block in iter(lambda: file.read(block_bytes), b""):
+            data = pending + block
+            end = data.rfind(b"\n") + 1
+            pending = data[end:]
+            crc = zlib.crc32(data[:end], crc)
+            if data[:end].strip():
+                # Lignes invalides ignorées, comme en mode --stream
+                for x, y in read_chunks(io.BytesIO(data[:end]), CHUNK_ROWS, columns=columns):
+                    stats.update(x, y)
+                    rows += len(x)
+            offset += end
+    return offset, rows, crc
+
+
+# -------------------------------------------------------------------------------
+# Mise à jour incrémentale : état repris, lignes ajoutées intégrées, nouvel
+# état sauvegardé. Renvoie (Moments, lignes ajoutées, repris de zéro ?).
+# Seules les lignes ajoutées sont parsées ; le reste du CSV n'est que relu
+# pour vérifier son CRC32 (voir prefix_crc).
+def update(data_file, model_file="thetas.json", columns=(0, 1)):
+    stats, offset, crc = load_state(data_file, model_file, columns)
+    restart = offset == 0
+    offset, rows, crc = fold_appended(stats, data_file, offset, columns, crc)
+    save_state(data_file, stats, offset, crc, model_file, columns)
+    return stats, rows, restart
@@ -0,0 +1,97 @@
+# ================================ IMPORT =====================================
+# Seuls des modules légers sont importés ici : numpy, pandas et matplotlib
+# ne sont chargés que par les sous-commandes qui en ont besoin, pour que
+# `linreg.py predict` réponde en quelques dizaines de millisecondes
+# (vérifié par bench_startup.py).
+import sys
+import argparse
+
+# ============================== CONFIGURATION ================================
+# Sous-commandes déléguées telles quelles à un script existant :
+# nom -> (module, arguments ajoutés devant, aide)
+SCRIPTS = {
+    "train": ("train", [], "entraîner un modèle (options de train.py)"),
+    "evaluate": ("evaluate", [], "évaluer le modèle sur un CSV (options de evaluate.py)"),
+    "plot": ("plot", [], "tracer les données et la droite (plot.py)"),
+    "crossval": ("main", ["--cv"], "validation croisée k-fold (options de main.py)"),
+    "search": ("search", [], "recherche du learning rate (options de search.py)"),
+    "bootstrap": ("bootstrap", [], "intervalles de confiance bootstrap (options de bootstrap.py)"),
+}
+
+# ================================ FONCTIONS ==================================
+# Lancer un script comme `python <script>.py args...`, importé seulement maintenant
+def run_script(module, args):
+    import runpy
+    sys.argv = [module + ".py"] + args
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+
+# -------------------------------------------------------------------------------
+# Chemin rapide : lecture JSON et calcul en Python pur, sans numpy.
+# Le mode batch (--batch) reprend predict.score_batch, vectorisé.
+def run_predict(args):
+    if args.batch:
+        from predict import run_batch
+        run_batch(args, args.model)
+        return 0
+
+    from model import predict_one, read_model
+    try:
+        intercept, coef, features, target = read_model(args.model)
+    except FileNotFoundError:
+        print(f"Fichier '{args.model}' introuvable. Lancez d'abord `linreg.py train`.", file=sys.stderr)
+        return 1
+
+    try:
+        values = args.values or [float(input(f"Entrez la valeur de '{name}' : ")) for name in features]
+    except ValueError:
+        print("Veuillez entrer un nombre valide.", file=sys.stderr)
+        return 1
+
+    if len(features) > 1:
+        if len(values) != len(features):
+            print(f"Le modèle attend {len(features)} valeurs : {', '.join(features)}", file=sys.stderr)
+            return 1
+        print(f"Prix estimé : {predict_one(values, intercept, coef):.2f} €")
+    else:
+        # Une variable : chaque valeur est un kilométrage
+        for km in values:
+            print(f"Prix estimé pour {km:.0f} km : {predict_one([km], intercept, coef):.2f} €")
+    return 0
+
+
+# -------------------------------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="linreg.py", description="Régression linéaire : prix d'une voiture")
+    commands = parser.add_subparsers(dest="command", metavar="commande", required=True)
+
+    predict = commands.add_parser("predict", help="prédire un prix (rapide, sans numpy)")
+    predict.add_argument("values", type=float, nargs="*",
+                         help="kilométrages, ou une valeur par variable du modèle (sinon demandées)")
+    predict.add_argument("--model", default="thetas.json", help="fichier modèle (défaut %(default)s)")
+    predict.add_argument("--batch", metavar="CSV",
+                         help="tarifer tous les kilométrages d'un CSV ('-' pour stdin)")
+    predict.add_argument("-o", "--output", help="fichier de sortie du mode batch (stdout par défaut)")
+    predict.add_argument("--chunk-rows", type=int, help="lignes lues par bloc en mode batch")
+
+    # Listées pour l'aide ; leurs options sont lues par le script lui-même
+    for name, (_, _, text) in SCRIPTS.items():
+        commands.add_parser(name, help=text, add_help=False)
+    return parser
+
+
+# -------------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SCRIPTS:
+        module, prefix, _ = SCRIPTS[argv[0]]
+        return run_script(module, prefix + argv[1:])
+
+    args = build_parser().parse_args(argv)
+    return run_predict(args)
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# ================================ IMPORT =====================================
+import json
+import time
+import random
+import asyncio
+import argparse
+import numpy as np
+from server import HOST, PORT
+
+# ============================== CONFIGURATION ================================
+REQUESTS = 20_000
+CONCURRENCY = 64
+
+# ================================ FONCTIONS ==================================
+# Ouvrir une connexion TCP ou Unix vers le service
+async def connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+# -------------------------------------------------------------------------------
+# Envoyer un GET et lire la réponse JSON (connexion keep-alive)
+async def get(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).split(b" ", 2)[1]
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    body = await reader.readexactly(length)
+    return int(status), json.loads(body)
+
+
+# -------------------------------------------------------------------------------
+# Un client : envoie ses requêtes l'une après l'autre et note les latences
+async def client(args, count, latencies, errors):
+    reader, writer = await connect(args)
+    try:
+        for _ in range(count):
+            km = random.randint(0, 300_000)
+            start = time.perf_counter()
+            status, _ = await get(reader, writer, f"/predict?km={km}")
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+# -------------------------------------------------------------------------------
+async def run(args):
+    latencies = []
+    errors = []
+    share, extra = divmod(args.requests, args.concurrency)
+    counts = [share + (i < extra) for i in range(args.concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, count, latencies, errors) for count in counts if count))
+    elapsed = time.perf_counter() - start
+
+    values = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    print(f"{len(latencies)} requêtes, {args.concurrency} connexions, {elapsed:.2f} s")
+    print(f"  débit   : {len(latencies) / elapsed:,.0f} requêtes/s")
+    print(f"  latence : p50 = {p50:.2f} ms, p90 = {p90:.2f} ms, p99 = {p99:.2f} ms")
+    print(f"  erreurs : {len(errors)}")
+
+    # Statistiques vues côté serveur
+    reader, writer = await connect(args)
+    _, stats = await get(reader, writer, "/stats")
+    writer.close()
+    print(f"  serveur : {stats['batches']} micro-batchs, {stats['mean_batch']:.1f} prédictions/batch")
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de charge pour server.py")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("-n", "--requests", type=int, default=REQUESTS)
+    parser.add_argument("-c", "--concurrency", type=int, default=CONCURRENCY)
+    asyncio.run(run(parser.parse_args()))
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
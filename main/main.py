@@ -1,134 +1,152 @@
 
 # ================================ IMPORT =====================================
-import csv
-import json
-import random
+import argparse
+import functools
+import numpy as np
+from engine import AUTO, SCHEDULES, as_array, gradient_descent, minibatch_sgd, learning_rate_type, resolve_learning_rate
+from stats import fit_ols
+from cache import load_columns
+from model import fold, model_params, write_model
+from stopping import StoppingCriteria
+from metrics import evaluate
+from crossval import FOLDS, cross_validate, report
 # ============================== CONFIGURATION ================================
-
-
+BATCH_SIZE = 8          # taille des mini-batchs (solveur sgd)
+EPOCHS = 500            # nombre de passes sur les données (solveur sgd)
+LEARNING_RATES = {"gd": AUTO, "sgd": 0.5}
 
 # ================================ FONCTIONS ==================================
+# Charger (km, price) via le cache binaire (voir cache.py)
 def load_data(filename='data.csv'):
-    data = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        next(reader)  # sauter l'en-tête
-        for row in reader:
-            try:
-                km = float(row[0])
-                price = float(row[1])
-                data.append((km, price))
-            except:
-                pass
-    return data
+    return load_columns(filename, usecols=(0, 1))
 
 # -------------------------------------------------------------------------------
 def normalize(x):
-    x_min = min(x)
-    x_max = max(x)
-    x_norm = [(xi - x_min) / (x_max - x_min) for xi in x]
+    x = as_array(x)
+    x_min = float(x.min())
+    x_max = float(x.max())
+    x_norm = (x - x_min) / (x_max - x_min)
     return x_norm, x_min, x_max
 
 
 # -------------------------------------------------------------------------------
 def denormalize(x_norm, x_min, x_max):
-    return [xi * (x_max - x_min) + x_min for xi in x_norm]
-
-
-# -------------------------------------------------------------------------------
-def split_data(data, train_ratio=0.8):
-    random.shuffle(data)
-    train_size = int(len(data) * train_ratio)
-    train = data[:train_size]
-    test = data[train_size:]
-    return train, test
+    return as_array(x_norm) * (x_max - x_min) + x_min
 
 
 # -------------------------------------------------------------------------------
-def train_model(x, y, learning_rate=0.001, iterations=10000):
-    theta0 = 0
-    theta1 = 0
-    m = len(x)
+# Découpage aléatoire train/test par permutation d'indices
+def split_data(x, y, train_ratio=0.8):
+    order = np.random.permutation(len(x))
+    train_size = int(len(x) * train_ratio)
+    train = order[:train_size]
+    test = order[train_size:]
+    return (x[train], y[train]), (x[test], y[test])
 
-    for _ in range(iterations):
-        sum_errors_0 = sum((theta0 + theta1 * x[i] - y[i]) for i in range(m))
-        sum_errors_1 = sum((theta0 + theta1 * x[i] - y[i]) * x[i] for i in range(m))
-
-        theta0 -= learning_rate * (1/m) * sum_errors_0
-        theta1 -= learning_rate * (1/m) * sum_errors_1
-
-    return theta0, theta1
 
 # -------------------------------------------------------------------------------
-def predict(theta0, theta1, x):
-    return [theta0 + theta1 * xi for xi in x]
-
+# solver="gd" : descente de gradient sur tout le jeu (iterations mises à jour)
+# solver="sgd" : mini-batchs de batch_size lignes, epochs passes mélangées
+def train_model(x, y, learning_rate=AUTO, iterations=10000, stopping=None, solver="gd",
+                batch_size=BATCH_SIZE, epochs=EPOCHS, schedule="constant", decay=0.0):
+    if solver == "sgd":
+        theta0, coef = minibatch_sgd(x, y, learning_rate, epochs, batch_size, schedule, decay,
+                                     stopping=stopping)
+        return theta0, float(coef[0])
+    return gradient_descent(x, y, learning_rate, iterations, stopping=stopping)
 
 # -------------------------------------------------------------------------------
-def mean_squared_error(y_true, y_pred):
-    n = len(y_true)
-    return sum((y_true[i] - y_pred[i])**2 for i in range(n)) / n
-
+# Entraîner sur un pli de validation croisée (voir crossval.py) : normalisation
+# propre au pli, puis θ0, θ1 ramenés en échelle réelle
+def fit_fold(x, y, method="gd", learning_rate=AUTO, **options):
+    x_norm, x_min, x_max = normalize(x)
+    if method == "ols":
+        theta0, theta1 = fit_ols(x_norm, y)
+    else:
+        theta0, theta1 = train_model(x_norm, y, learning_rate, stopping=StoppingCriteria(),
+                                     solver=method, **options)
+    scale = x_max - x_min
+    return theta0 - theta1 * x_min / scale, theta1 / scale
 
 # -------------------------------------------------------------------------------
-def mean_absolute_error(y_true, y_pred):
-    n = len(y_true)
-    return sum(abs(y_true[i] - y_pred[i]) for i in range(n)) / n
-
-# -------------------------------------------------------------------------------
-def r2_score(y_true, y_pred):
-    mean_y = sum(y_true) / len(y_true)
-    ss_res = sum((y_true[i] - y_pred[i])**2 for i in range(len(y_true)))
-    ss_tot = sum((y_true[i] - mean_y)**2 for i in range(len(y_true)))
-    return 1 - (ss_res / ss_tot)
+def predict(theta0, theta1, x):
+    return theta0 + theta1 * as_array(x)
 
 # -------------------------------------------------------------------------------
 if __name__ == "__main__":
-    data = load_data()
-    train_data, test_data = split_data(data, train_ratio=0.8)
-
-    x_train_raw = [point[0] for point in train_data]
-    y_train = [point[1] for point in train_data]
-
-    x_test_raw = [point[0] for point in test_data]
-    y_test = [point[1] for point in test_data]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", choices=["gd", "sgd", "ols"], default="gd",
+                        help="descente de gradient (gd), mini-batchs (sgd) ou moindres carrés (ols)")
+    parser.add_argument("--learning-rate", type=learning_rate_type,
+                        help="pas d'apprentissage ou 'auto' pour 1/λmax(XᵀX/m) (défaut : auto pour gd, 0.5 pour sgd)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="taille des mini-batchs pour sgd (défaut %(default)s)")
+    parser.add_argument("--epochs", type=int, default=EPOCHS,
+                        help="nombre d'epochs pour sgd (défaut %(default)s)")
+    parser.add_argument("--schedule", choices=SCHEDULES, default="inverse",
+                        help="évolution du learning rate par epoch pour sgd (défaut %(default)s)")
+    parser.add_argument("--decay", type=float, default=0.01,
+                        help="décroissance du learning rate pour sgd (défaut %(default)s)")
+    parser.add_argument("--data", default="data.csv", help="fichier CSV (défaut %(default)s)")
+    parser.add_argument("--cv", type=int, metavar="K", nargs="?", const=FOLDS,
+                        help=f"validation croisée en K plis (défaut {FOLDS}) au lieu d'un découpage 80/20")
+    parser.add_argument("--repeats", type=int, default=1, help="répétitions de la validation croisée")
+    parser.add_argument("--workers", type=int, help="processus pour la validation croisée (défaut : un par cœur)")
+    parser.add_argument("--compare-serial", action="store_true",
+                        help="relancer la validation croisée en série pour mesurer le speedup")
+    args = parser.parse_args()
+
+    x, y = load_data(args.data)
+
+    if args.cv:
+        fit = functools.partial(fit_fold, method=args.method,
+                                learning_rate=args.learning_rate or LEARNING_RATES.get(args.method, AUTO),
+                                batch_size=args.batch_size, epochs=args.epochs,
+                                schedule=args.schedule, decay=args.decay)
+        results, parallel = cross_validate(x, y, fit, args.cv, args.repeats, args.workers)
+        print(f"Validation croisée {args.cv} plis x {args.repeats} ({args.method}) :")
+        print(report(results))
+        if args.compare_serial:
+            _, serial = cross_validate(x, y, fit, args.cv, args.repeats, workers=1)
+            print(f"\nDurée : {parallel:.3f} s en parallèle, {serial:.3f} s en série "
+                  f"(speedup x{serial / parallel:.2f})")
+        else:
+            print(f"\nDurée : {parallel:.3f} s")
+        raise SystemExit(0)
+
+    (x_train_raw, y_train), (x_test_raw, y_test) = split_data(x, y, train_ratio=0.8)
 
     # Normalisation des données d'entrée (km)
     x_train, x_min, x_max = normalize(x_train_raw)
     # Normaliser aussi le test avec les mêmes paramètres
-    x_test = [(xi - x_min) / (x_max - x_min) for xi in x_test_raw]
-
-    theta0, theta1 = train_model(x_train, y_train, learning_rate=0.001, iterations=10000)
+    x_test = (x_test_raw - x_min) / (x_max - x_min)
+
+    if args.method == "ols":
+        theta0, theta1 = fit_ols(x_train, y_train)
+    else:
+        stopping = StoppingCriteria()
+        learning_rate = args.learning_rate or LEARNING_RATES[args.method]
+        if learning_rate == AUTO:
+            learning_rate = resolve_learning_rate(AUTO, x_train)
+            print(f"Learning rate automatique : {learning_rate:.6g}")
+        theta0, theta1 = train_model(x_train, y_train, learning_rate=learning_rate, iterations=10000,
+                                     stopping=stopping, solver=args.method,
+                                     batch_size=args.batch_size, epochs=args.epochs,
+                                     schedule=args.schedule, decay=args.decay)
+        print(f"Descente de gradient ({args.method}) : {stopping}")
 
     print(f"Modèle entraîné : θ0 = {theta0:.4f}, θ1 = {theta1:.6f}")
 
-    # Évaluer sur jeu d'entraînement normalisé
-    y_train_pred = predict(theta0, theta1, x_train)
-    mse_train = mean_squared_error(y_train, y_train_pred)
-    mae_train = mean_absolute_error(y_train, y_train_pred)
-    r2_train = r2_score(y_train, y_train_pred)
-
+    # Évaluer sur les jeux d'entraînement et de test normalisés
+    # (une seule passe par jeu, voir metrics.py)
     print("\nSur le jeu d'entraînement :")
-    print(f"  MSE = {mse_train:.2f}")
-    print(f"  MAE = {mae_train:.2f}")
-    print(f"  R² = {r2_train:.4f}")
-
-    # Évaluer sur jeu de test normalisé
-    y_test_pred = predict(theta0, theta1, x_test)
-    mse_test = mean_squared_error(y_test, y_test_pred)
-    mae_test = mean_absolute_error(y_test, y_test_pred)
-    r2_test = r2_score(y_test, y_test_pred)
+    print(evaluate(y_train, predict(theta0, theta1, x_train)).report("  "))
 
     print("\nSur le jeu de test :")
-    print(f"  MSE = {mse_test:.2f}")
-    print(f"  MAE = {mae_test:.2f}")
-    print(f"  R² = {r2_test:.4f}")
-
-    # Sauvegarder theta0, theta1 et les paramètres de normalisation
-    with open('thetas.json', 'w') as file:
-        json.dump({
-            "theta0": theta0,
-            "theta1": theta1,
-            "x_min": x_min,
-            "x_max": x_max
-        }, file)
+    print(evaluate(y_test, predict(theta0, theta1, x_test)).report("  "))
+
+    # Sauvegarder le modèle en échelle réelle, avec les paramètres de
+    # normalisation comme métadonnées (voir model.py)
+    raw_theta0, raw_coef = fold(theta0, [theta1], [x_min], [x_max])
+    version = write_model(model_params(raw_theta0, raw_coef, [x_min], [x_max]), 'thetas.json')
+    print(f"\nModèle publié : models/{version}")
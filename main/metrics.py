@@ -0,0 +1,149 @@
+# ================================ IMPORT =====================================
+import math
+import numpy as np
+
+# ============================== CONFIGURATION ================================
+CHUNK_SIZE = 65536      # lignes traitées par bloc (reste dans le cache CPU)
+
+# ================================ CLASSE =====================================
+class Metrics:
+    """
+    Métriques d'erreur d'une régression, accumulées en une seule passe.
+
+    Chaque bloc (y_true, y_pred) est parcouru une fois : le résidu
+    y_true - y_pred est calculé dans un tampon réutilisé, d'où l'on tire
+    somme, somme des carrés, somme des valeurs absolues et maximum. La
+    variance de y_true (pour R²) est suivie par co-moments centrés
+    fusionnés avec la formule de Chan, comme stats.Moments. Deux Metrics
+    calculées sur des parties disjointes se combinent avec merge().
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sum_residual = 0.0     # Σ(y - ŷ)
+        self.sum_squared = 0.0      # Σ(y - ŷ)²
+        self.sum_absolute = 0.0     # Σ|y - ŷ|
+        self.max_absolute = 0.0     # max|y - ŷ|
+        self.mean_y = 0.0
+        self.m2_y = 0.0             # Σ(y - mean_y)²
+        self._buffer = np.empty(0)
+
+    # ---------------------------------------------------------------------------
+    # Ajouter un bloc (tableaux de même longueur)
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64)
+        n = len(y_true)
+        if n == 0:
+            return self
+        if len(self._buffer) < n:
+            self._buffer = np.empty(n)
+        work = self._buffer[:n]
+
+        # Résidu
+        np.subtract(y_true, y_pred, out=work)
+        sum_residual = float(work.sum())
+        sum_squared = float(work.dot(work))
+        np.abs(work, out=work)
+        sum_absolute = float(work.sum())
+        max_absolute = float(work.max())
+
+        # Variance de y, centrée sur la moyenne du bloc
+        mean_y = float(y_true.mean())
+        np.subtract(y_true, mean_y, out=work)
+        m2_y = float(work.dot(work))
+
+        total = self.n + n
+        delta = mean_y - self.mean_y
+        self.m2_y += m2_y + delta * delta * self.n * n / total
+        self.mean_y += delta * n / total
+        self.n = total
+        self.sum_residual += sum_residual
+        self.sum_squared += sum_squared
+        self.sum_absolute += sum_absolute
+        self.max_absolute = max(self.max_absolute, max_absolute)
+        return self
+
+    # ---------------------------------------------------------------------------
+    # Fusionner les métriques d'une autre partie des données
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        total = self.n + other.n
+        delta = other.mean_y - self.mean_y
+        self.m2_y += other.m2_y + delta * delta * self.n * other.n / total
+        self.mean_y += delta * other.n / total
+        self.n = total
+        self.sum_residual += other.sum_residual
+        self.sum_squared += other.sum_squared
+        self.sum_absolute += other.sum_absolute
+        self.max_absolute = max(self.max_absolute, other.max_absolute)
+        return self
+
+    # ---------------------------------------------------------------------------
+    @property
+    def mse(self):
+        return self.sum_squared / self.n
+
+    @property
+    def rmse(self):
+        return math.sqrt(self.mse)
+
+    @property
+    def mae(self):
+        return self.sum_absolute / self.n
+
+    @property
+    def r2(self):
+        return 1 - self.sum_squared / self.m2_y if self.m2_y > 0 else float("nan")
+
+    @property
+    def max_error(self):
+        return self.max_absolute
+
+    @property
+    def residual_mean(self):
+        return self.sum_residual / self.n
+
+    # ---------------------------------------------------------------------------
+    def as_dict(self):
+        return {
+            "n": self.n,
+            "mse": self.mse,
+            "rmse": self.rmse,
+            "mae": self.mae,
+            "r2": self.r2,
+            "max_error": self.max_error,
+            "residual_mean": self.residual_mean,
+        }
+
+    # ---------------------------------------------------------------------------
+    # Rapport texte, une métrique par ligne
+    def report(self, indent=""):
+        return "\n".join([
+            f"{indent}MSE = {self.mse:.2f}",
+            f"{indent}RMSE = {self.rmse:.2f}",
+            f"{indent}MAE = {self.mae:.2f}",
+            f"{indent}R² = {self.r2:.4f}",
+            f"{indent}Erreur max = {self.max_error:.2f}",
+            f"{indent}Résidu moyen = {self.residual_mean:.2f}",
+        ])
+
+
+# ================================ FONCTIONS ==================================
+# Métriques de tableaux en mémoire, bloc par bloc (aucune copie entière)
+def evaluate(y_true, y_pred, chunk_size=CHUNK_SIZE):
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    metrics = Metrics()
+    for start in range(0, len(y_true), chunk_size):
+        metrics.update(y_true[start:start + chunk_size], y_pred[start:start + chunk_size])
+    return metrics
+
+
+# -------------------------------------------------------------------------------
+# Métriques d'un flux de blocs (y_true, y_pred), ex. lus par chunks.read_chunks
+def evaluate_stream(blocks):
+    metrics = Metrics()
+    for y_true, y_pred in blocks:
+        metrics.update(y_true, y_pred)
+    return metrics
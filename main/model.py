@@ -0,0 +1,166 @@
+# ================================ IMPORT =====================================
+# Volontairement sans numpy : ce module est sur le chemin de démarrage de
+# `linreg.py predict` (voir bench_startup.py).
+import os
+import zlib
+import struct
+
+# ============================== CONFIGURATION ================================
+FORMAT = 1                  # version du format d'artefact
+MAGIC = b"LRM1"
+HEADER = struct.Struct("<4sHH")     # magic, version du format, nombre de variables
+CRC = struct.Struct("<I")
+NAME = struct.Struct("<H")          # longueur d'un nom (UTF-8)
+
+# ================================ FONCTIONS ==================================
+# Artefact binaire associé à un miroir JSON (thetas.json -> thetas.bin)
+def binary_path(filename):
+    return os.path.splitext(filename)[0] + ".bin"
+
+
+# -------------------------------------------------------------------------------
+# Ramener des coefficients appris sur variables normalisées (x - min) / (max - min)
+# dans l'espace des variables brutes : prix = intercept + Σ coef·x
+def fold(intercept, coef, x_min, x_max):
+    raw = []
+    intercept = float(intercept)
+    for value, low, high in zip(coef, x_min, x_max):
+        value = float(value) / (high - low) if high > low else float(value)
+        intercept -= value * low
+        raw.append(value)
+    return intercept, raw
+
+
+# -------------------------------------------------------------------------------
+# Modèle unique, coefficients en espace brut : dict du miroir JSON.
+# x_min / x_max (bornes de chaque variable) sont des métadonnées : la
+# prédiction n'en a pas besoin. Avec une seule variable, theta0 / theta1
+# sont aussi écrits pour les lecteurs qui ne connaissent que ces clés.
+def model_params(intercept, coef, x_min=None, x_max=None, features=("km",), target="price"):
+    coef = [float(value) for value in coef]
+    params = {
+        "format": FORMAT,
+        "features": list(features),
+        "target": target,
+        "intercept": float(intercept),
+        "coef": coef,
+        "x_min": [float(v) for v in x_min] if x_min is not None else None,
+        "x_max": [float(v) for v in x_max] if x_max is not None else None,
+    }
+    if len(coef) == 1:
+        params["theta0"] = params["intercept"]
+        params["theta1"] = coef[0]
+    return params
+
+
+# -------------------------------------------------------------------------------
+# Sérialisation binaire : en-tête, intercept, coef, x_min, x_max (float64
+# little-endian), noms (cible puis variables) et CRC32 de tout ce qui précède
+def pack(params):
+    p = len(params["coef"])
+    nan = [float("nan")] * p
+    values = ([params["intercept"]] + params["coef"]
+              + (params["x_min"] or nan) + (params["x_max"] or nan))
+    data = bytearray(HEADER.pack(MAGIC, FORMAT, p))
+    data += struct.pack(f"<{len(values)}d", *values)
+    for name in [params["target"]] + params["features"]:
+        encoded = name.encode()
+        data += NAME.pack(len(encoded)) + encoded
+    data += CRC.pack(zlib.crc32(data))
+    return bytes(data)
+
+
+# -------------------------------------------------------------------------------
+def unpack(data):
+    if len(data) < HEADER.size + CRC.size or CRC.unpack_from(data, len(data) - CRC.size)[0] != zlib.crc32(data[:-CRC.size]):
+        raise ValueError("artefact de modèle corrompu (CRC32 invalide)")
+    magic, version, p = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT:
+        raise ValueError(f"artefact de modèle inconnu ({magic!r}, format {version})")
+    values = struct.unpack_from(f"<{1 + 3 * p}d", data, HEADER.size)
+    offset = HEADER.size + 8 * len(values)
+    names = []
+    for _ in range(p + 1):
+        (size,) = NAME.unpack_from(data, offset)
+        offset += NAME.size
+        names.append(data[offset:offset + size].decode())
+        offset += size
+    x_min = list(values[1 + p:1 + 2 * p])
+    x_max = list(values[1 + 2 * p:])
+    if all(v != v for v in x_min + x_max):
+        x_min = x_max = None        # bornes inconnues (NaN)
+    return model_params(values[0], values[1:1 + p], x_min, x_max, names[1:], names[0])
+
+
+# -------------------------------------------------------------------------------
+# Enregistrer un modèle : miroir JSON + registre (registry.save_model), puis
+# artefact binaire écrit de façon atomique. Le binaire est écrit en dernier :
+# s'il est plus récent que le JSON, il lui correspond (voir read_artifact).
+def write_model(params, filename="thetas.json", indent=None):
+    from registry import save_model
+    version = save_model(params, filename, indent)
+    path = binary_path(filename)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(pack(params))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+    return version
+
+
+# -------------------------------------------------------------------------------
+# Anciens thetas.json, sans clé "format" : θ0/θ1 en espace brut (train.py,
+# entrainement.py), θ0/θ1 normalisés avec x_min/x_max scalaires (main.py), ou
+# coefficients normalisés avec min_x/max_x par variable (train.py --features)
+def from_legacy(data):
+    if "coef" in data:
+        x_min, x_max = data["min_x"], data["max_x"]
+        intercept, coef = fold(data["intercept"], data["coef"], x_min, x_max)
+        return model_params(intercept, coef, x_min, x_max, data["features"], data.get("target", "price"))
+    theta0, theta1 = float(data["theta0"]), float(data["theta1"])
+    if "x_min" in data:
+        theta0, (theta1,) = fold(theta0, [theta1], [data["x_min"]], [data["x_max"]])
+        return model_params(theta0, [theta1], [data["x_min"]], [data["x_max"]])
+    if "min_x" in data:
+        return model_params(theta0, [theta1], [data["min_x"]], [data["max_x"]])
+    return model_params(theta0, [theta1])
+
+
+# -------------------------------------------------------------------------------
+# Charger un modèle (dict de model_params). `filename` est le miroir JSON ou
+# l'artefact .bin ; l'artefact binaire est préféré s'il est à jour (quelques
+# microsecondes, sans analyse JSON).
+def read_artifact(filename="thetas.json"):
+    path = filename if filename.endswith(".bin") else binary_path(filename)
+    try:
+        binary = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        binary = None
+    if binary is not None:
+        try:
+            fresh = path == filename or binary >= os.stat(filename).st_mtime_ns
+        except FileNotFoundError:
+            fresh = True
+    if binary is not None and fresh:
+        with open(path, "rb") as file:
+            return unpack(file.read())
+
+    import json
+    with open(filename, "r") as file:
+        data = json.load(file)
+    return model_params(data["intercept"], data["coef"], data["x_min"], data["x_max"],
+                        data["features"], data["target"]) if "format" in data else from_legacy(data)
+
+
+# -------------------------------------------------------------------------------
+# Lire un modèle : (intercept, coef, variables, cible), coef en liste de floats
+def read_model(filename="thetas.json"):
+    params = read_artifact(filename)
+    return params["intercept"], params["coef"], params["features"], params["target"]
+
+
+# -------------------------------------------------------------------------------
+# Prix prédit pour une observation (liste de valeurs, une par variable)
+def predict_one(values, intercept, coef):
+    return intercept + sum(c * v for c, v in zip(coef, values))
@@ -0,0 +1,148 @@
+# ================================ IMPORT =====================================
+import numpy as np
+
+# ============================== CONFIGURATION ================================
+MOMENTUM = 0.9          # coefficient d'inertie (momentum, nesterov)
+BETA1 = 0.9             # moyenne mobile du gradient (adam)
+BETA2 = 0.999           # moyenne mobile du gradient au carré (adam)
+EPSILON = 1e-8
+
+# ================================ CLASSES ====================================
+class Optimizer:
+    """
+    Règle de mise à jour d'une descente de gradient.
+
+    Le trainer appelle reset() avant sa boucle, puis à chaque itération :
+      point = optimizer.lookahead(theta)     # où évaluer le gradient
+      delta = optimizer.step(theta, gradient(point))
+      theta = theta + delta
+    theta est un scalaire ou un tableau numpy de forme quelconque ; delta a
+    la même forme. Les optimiseurs gardent leur état (vitesse, moments...)
+    entre deux appels.
+    """
+
+    def __init__(self, learning_rate=0.01):
+        self.learning_rate = learning_rate
+        self.reset()
+
+    # ---------------------------------------------------------------------------
+    def reset(self):
+        self.iteration = 0
+        return self
+
+    # ---------------------------------------------------------------------------
+    # Point où le gradient doit être calculé (theta, sauf pour nesterov)
+    def lookahead(self, theta):
+        return theta
+
+    # ---------------------------------------------------------------------------
+    def step(self, theta, gradient):
+        raise NotImplementedError
+
+    # ---------------------------------------------------------------------------
+    def __str__(self):
+        return f"{self.name} (learning rate {self.learning_rate:g})"
+
+
+# -------------------------------------------------------------------------------
+# Pas fixe : theta -= learning_rate * gradient
+class GradientDescent(Optimizer):
+    name = "gd"
+
+    def step(self, theta, gradient):
+        self.iteration += 1
+        return -self.learning_rate * gradient
+
+
+# -------------------------------------------------------------------------------
+# Boule pesante : la vitesse accumule les gradients passés
+class Momentum(Optimizer):
+    name = "momentum"
+
+    def __init__(self, learning_rate=0.01, momentum=MOMENTUM):
+        self.momentum = momentum
+        super().__init__(learning_rate)
+
+    def reset(self):
+        self.velocity = 0.0
+        return super().reset()
+
+    def step(self, theta, gradient):
+        self.iteration += 1
+        self.velocity = self.momentum * self.velocity - self.learning_rate * gradient
+        return self.velocity
+
+
+# -------------------------------------------------------------------------------
+# Nesterov : même vitesse, mais gradient évalué au point anticipé theta + μ·v
+class Nesterov(Momentum):
+    name = "nesterov"
+
+    def lookahead(self, theta):
+        return theta + self.momentum * self.velocity
+
+
+# -------------------------------------------------------------------------------
+# Adam : pas adapté à chaque paramètre par les moments du gradient.
+# Le pas effectif est de l'ordre de learning_rate par itération, quelle que
+# soit l'échelle du gradient : learning_rate doit suivre l'échelle de theta.
+class Adam(Optimizer):
+    name = "adam"
+
+    def __init__(self, learning_rate=0.01, beta1=BETA1, beta2=BETA2, epsilon=EPSILON):
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        super().__init__(learning_rate)
+
+    def reset(self):
+        self.m = 0.0
+        self.v = 0.0
+        return super().reset()
+
+    def step(self, theta, gradient):
+        self.iteration += 1
+        self.m = self.beta1 * self.m + (1 - self.beta1) * gradient
+        self.v = self.beta2 * self.v + (1 - self.beta2) * gradient * gradient
+        m_hat = self.m / (1 - self.beta1 ** self.iteration)
+        v_hat = self.v / (1 - self.beta2 ** self.iteration)
+        return -self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+
+# -------------------------------------------------------------------------------
+# Barzilai-Borwein : pas α = ‖s‖² / <s, g - g_prec> avec s le dernier
+# déplacement. learning_rate ne sert qu'au premier pas ; si la courbure
+# mesurée n'est pas positive, le pas précédent est conservé.
+class BarzilaiBorwein(Optimizer):
+    name = "barzilai_borwein"
+
+    def reset(self):
+        self.rate = self.learning_rate
+        self.previous_step = None
+        self.previous_gradient = None
+        return super().reset()
+
+    def step(self, theta, gradient):
+        self.iteration += 1
+        if self.previous_step is not None:
+            s = np.ravel(self.previous_step)
+            change = np.ravel(gradient - self.previous_gradient)
+            curvature = float(s.dot(change))
+            if curvature > 0:
+                self.rate = float(s.dot(s)) / curvature
+        delta = -self.rate * gradient
+        self.previous_step = delta
+        self.previous_gradient = gradient
+        return delta
+
+
+# ============================== CONFIGURATION ================================
+OPTIMIZERS = {cls.name: cls for cls in (GradientDescent, Momentum, Nesterov, Adam, BarzilaiBorwein)}
+
+# ================================ FONCTIONS ==================================
+# Construire un optimiseur depuis son nom (gd, momentum, nesterov, adam, barzilai_borwein)
+def make_optimizer(name, learning_rate=0.01, **options):
+    try:
+        return OPTIMIZERS[name](learning_rate, **options)
+    except KeyError:
+        raise ValueError(f"optimiseur inconnu : {name} (choix : {', '.join(OPTIMIZERS)})") from None
@@ -1,49 +1,71 @@
-import csv
-import json
-import matplotlib.pyplot as plt
-
-# Charger les données d'entraînement
-def load_data(filename='data.csv'):
-    x = []
-    y = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        next(reader)  # Skip header
-        for row in reader:
-            try:
-                x.append(float(row[0]))
-                y.append(float(row[1]))
-            except ValueError:
-                continue
-    return x, y
-
-# Charger les paramètres appris
+import argparse
+from cache import load_columns
+from model import read_model
+from render import MODES, POINT_BUDGET, draw_line, draw_points, pyplot, save_plot
+
+TITLE = 'Régression linéaire - Prix vs Kilométrage'
+LABELS = {'km': 'Kilométrage (km)', 'price': 'Prix (€)'}
+
+# Charger les colonnes `feature` et `target` (par nom), via le cache binaire (voir cache.py)
+def load_data(filename='data.csv', feature='km', target='price'):
+    return load_columns(filename, usecols=(feature, target))
+
+# Charger les paramètres appris : (θ0, θ1, variable, cible). Une droite ne
+# représente qu'un modèle à une variable : sinon, arrêt avec un message clair.
 def load_thetas(filename='thetas.json'):
-    with open(filename, 'r') as file:
-        data = json.load(file)
-    return data['theta0'], data['theta1']
+    intercept, coef, features, target = read_model(filename)
+    if len(coef) != 1:
+        raise SystemExit(f"plot.py : le modèle {filename} a {len(coef)} variables "
+                         f"({', '.join(features)}), seule une droite à une variable peut être tracée")
+    return intercept, coef[0], features[0], target
 
-# Tracer les données + la droite
-def plot_regression(x, y, theta0, theta1):
-    plt.figure(figsize=(10, 6))
-    plt.scatter(x, y, color='blue', label='Données réelles')
-    
-    # Ligne de régression
-    x_line = list(range(int(min(x)), int(max(x)) + 1, 1000))
-    y_line = [theta0 + theta1 * xi for xi in x_line]
-    plt.plot(x_line, y_line, color='red', label='Régression linéaire')
+# Tracer les données + la droite (deux points suffisent, voir render.py).
+# Au-delà de `budget` points : densité (hexbin) ou échantillon stratifié.
+# Avec `filename`, la figure est écrite sans fenêtre (backend Agg).
+def plot_regression(x, y, theta0, theta1, filename=None, budget=POINT_BUDGET, mode="hexbin",
+                    xlabel=LABELS['km'], ylabel=LABELS['price']):
+    if filename:
+        return save_plot(filename, x, y, theta0, theta1, TITLE, xlabel, ylabel,
+                         budget=budget, mode=mode)
+    plt = pyplot(headless=False)
+    figure, ax = plt.subplots(figsize=(10, 6))
+    draw_points(ax, x, y, budget, mode, label='Données réelles')
+    draw_line(ax, theta0, theta1, float(x.min()), float(x.max()))
 
     # Mise en forme
-    plt.title('Régression linéaire - Prix vs Kilométrage')
-    plt.xlabel('Kilométrage (km)')
-    plt.ylabel('Prix (€)')
-    plt.legend()
+    ax.set_title(TITLE)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid(True)
+    figure.tight_layout()
+    plt.show()
+
+# Tracer l'historique du coût enregistré pendant l'entraînement (telemetry.py)
+def plot_cost_history(recorder):
+    plt = pyplot(headless=False)
+    iterations, costs = recorder.history()
+    plt.figure(figsize=(10, 6))
+    plt.plot(iterations, costs, color='green')
+    plt.title(f"Convergence de la descente de gradient (1 mesure / {recorder.every} itérations)")
+    plt.xlabel('Itérations')
+    plt.ylabel('Coût J(θ)')
     plt.grid(True)
     plt.tight_layout()
     plt.show()
 
 # Programme principal
 if __name__ == "__main__":
-    x, y = load_data()
-    theta0, theta1 = load_thetas()
-    plot_regression(x, y, theta0, theta1)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="data.csv")
+    parser.add_argument("-o", "--output", help="écrire la figure dans ce fichier (sans fenêtre)")
+    parser.add_argument("--budget", type=int, default=POINT_BUDGET,
+                        help="nombre max de points tracés un par un (défaut %(default)s)")
+    parser.add_argument("--mode", choices=MODES, default="hexbin",
+                        help="rendu au-delà du budget : densité ou échantillon (défaut %(default)s)")
+    args = parser.parse_args()
+
+    theta0, theta1, feature, target = load_thetas()
+    x, y = load_data(args.data, feature, target)
+    plot_regression(x, y, theta0, theta1, args.output, args.budget, args.mode,
+                    LABELS.get(feature, feature), LABELS.get(target, target))
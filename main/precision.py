@@ -0,0 +1,45 @@
+# ================================ IMPORT =====================================
+import math
+import numpy as np
+
+# ============================== CONFIGURATION ================================
+DTYPES = {"float64": np.float64, "float32": np.float32}
+CHUNK = 4096                # éléments par somme partielle en float32
+TOLERANCE = 1e-4            # écart relatif max des coefficients float32 / float64 (voir bench_precision.py)
+
+# ================================ FONCTIONS ==================================
+# Réductions des trainers en mode float32 : les données et le résidu restent
+# en float32 (moitié moins de mémoire et de bande passante), seules les
+# sommes sont compensées. Chaque bloc de CHUNK éléments est sommé par numpy
+# (sommation par paires, erreur en O(log CHUNK·ε)), puis les sommes
+# partielles sont additionnées exactement par math.fsum : l'erreur ne croît
+# plus avec le nombre de lignes. En float64, numpy direct (inchangé).
+def accurate_sum(values):
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        return float(values.sum())
+    full = len(values) - len(values) % CHUNK
+    partials = values[:full].reshape(-1, CHUNK).sum(axis=1)
+    return math.fsum(partials.tolist()) + float(values[full:].sum(dtype=np.float64))
+
+
+# -------------------------------------------------------------------------------
+# Produit scalaire a·b ; `buffer` (float32, même longueur) évite d'allouer
+# le tableau des produits à chaque appel
+def accurate_dot(a, b, buffer=None):
+    if a.dtype != np.float32:
+        return float(a.dot(b))
+    products = np.multiply(a, b, out=buffer)
+    return accurate_sum(products)
+
+
+# -------------------------------------------------------------------------------
+# Xᵀ·r pour une matrice X (m, p) et un résidu r (m,) : vecteur (p,) float64,
+# une colonne à la fois en float32 (colonnes contiguës si X est en ordre
+# Fortran, voir ft_linear_regression.dataset)
+def accurate_gradient(X, residual, buffer=None):
+    if X.dtype != np.float32:
+        return X.T.dot(residual)
+    if buffer is None:
+        buffer = np.empty(len(residual), dtype=np.float32)
+    return np.array([accurate_dot(X[:, j], residual, buffer) for j in range(X.shape[1])])
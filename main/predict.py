@@ -1,22 +1,87 @@
-import json
+import sys
+import time
+import argparse
+import numpy as np
+from model import read_model
 
-# Charger les valeurs de theta, min_x et max_x
-def load_thetas(filename='thetas.json'):
-    with open(filename, 'r') as file:
-        data = json.load(file)
-    return data['theta0'], data['theta1'], data['min_x'], data['max_x']
+FEATURE_FORMAT = "%.10g"
+PRICE_FORMAT = "%.2f"
+
+# Charger un modèle en échelle réelle : (intercept, coef, variables, cible),
+# coef en tableau numpy (artefact thetas.bin ou miroir JSON : voir model.py)
+def load_linear_model(filename='thetas.json'):
+    intercept, coef, features, target = read_model(filename)
+    return intercept, np.array(coef), features, target
 
 # Prédire le prix
 def predict_price(km, theta0, theta1):
     return theta0 + theta1 * km
 
+# Prédire pour une matrice de variables (m, p) ou une observation (p,)
+def predict_prices(X, intercept, coef):
+    return np.dot(X, coef) + intercept
+
+# Tarifer un flux d'observations (fichier CSV ou stdin) bloc par bloc :
+# prédiction vectorisée et écriture au fil de l'eau, mémoire bornée.
+# Les colonnes du CSV sont les variables du modèle, dans l'ordre.
+# Renvoie le nombre de lignes traitées et le débit (lignes/s).
+def score_batch(source, output, intercept, coef, chunk_rows=None, features=('km',), target='price'):
+    from chunks import CHUNK_ROWS, read_chunks
+
+    coef = np.atleast_1d(np.asarray(coef, dtype=float))
+    row_format = ",".join([FEATURE_FORMAT] * len(coef) + [PRICE_FORMAT])
+    rows = 0
+    start = time.perf_counter()
+    output.write(",".join(list(features) + [target]) + "\n")
+    for chunk in read_chunks(source, chunk_rows or CHUNK_ROWS, columns=tuple(range(len(coef)))):
+        price = predict_prices(np.column_stack(chunk), intercept, coef)
+        values = [column.tolist() for column in chunk] + [price.tolist()]
+        output.write("\n".join(map(row_format.__mod__, zip(*values))))
+        output.write("\n")
+        rows += len(price)
+    output.flush()
+    elapsed = time.perf_counter() - start
+    return rows, rows / elapsed if elapsed > 0 else float("inf")
+
+# Mode batch : python predict.py --batch mileages.csv [-o prices.csv]
+def run_batch(args, filename='thetas.json'):
+    intercept, coef, features, target = load_linear_model(filename)
+    source = sys.stdin if args.batch == '-' else args.batch
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        rows, rate = score_batch(source, output, intercept, coef, args.chunk_rows, features, target)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"{rows} lignes tarifées ({rate:,.0f} lignes/s)", file=sys.stderr)
+
 # Lancer la prédiction
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", metavar="CSV",
+                        help="tarifer tous les kilométrages d'un CSV ('-' pour stdin)")
+    parser.add_argument("-o", "--output", help="fichier de sortie du mode batch (stdout par défaut)")
+    parser.add_argument("--chunk-rows", type=int, help="lignes lues par bloc en mode batch")
+    args = parser.parse_args()
+
+    if args.batch:
+        try:
+            run_batch(args)
+        except FileNotFoundError as e:
+            print(f"Fichier '{e.filename}' introuvable.", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
     try:
-        km = float(input("Entrez le kilométrage de la voiture : "))
-        theta0, theta1, min_x, max_x = load_thetas()
-        price = predict_price(km, theta0, theta1)
-        print(f"Prix estimé pour {km:.0f} km : {price:.2f} €")
+        intercept, coef, features, target = load_linear_model()
+        if len(features) > 1:
+            values = [float(input(f"Entrez la valeur de '{name}' : ")) for name in features]
+            price = predict_prices(np.array(values), intercept, coef)
+            print(f"Prix estimé : {price:.2f} €")
+        else:
+            km = float(input("Entrez le kilométrage de la voiture : "))
+            price = predict_price(km, intercept, coef[0])
+            print(f"Prix estimé pour {km:.0f} km : {price:.2f} €")
     except ValueError:
         print("Veuillez entrer un nombre valide.")
     except FileNotFoundError:
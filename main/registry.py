@@ -0,0 +1,110 @@
+# ================================ IMPORT =====================================
+import os
+import json
+import time
+
+# ============================== CONFIGURATION ================================
+REGISTRY = "models"         # dossier des versions, à côté de thetas.json
+CURRENT = "CURRENT"         # pointeur vers la version servie
+
+# ================================ FONCTIONS ==================================
+# Écriture atomique d'un fichier JSON : fichier temporaire, fsync puis
+# os.replace. Un lecteur voit l'ancien contenu ou le nouveau, jamais un mélange.
+def write_json_atomic(path, data, indent=None):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as file:
+        json.dump(data, file, indent=indent)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------------------------------------
+# Dossier registre associé à un fichier modèle (thetas.json -> models/)
+def registry_for(filename):
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), REGISTRY)
+
+
+# -------------------------------------------------------------------------------
+# Numéro de la prochaine version
+def next_version(root):
+    numbers = [int(name[1:7]) for name in os.listdir(root)
+               if name.startswith("v") and name[1:7].isdigit()]
+    return max(numbers, default=0) + 1
+
+
+# -------------------------------------------------------------------------------
+# Publier un modèle : nouvelle version immuable puis bascule atomique de CURRENT.
+# Renvoie le nom de la version publiée.
+def publish(params, root=REGISTRY):
+    os.makedirs(root, exist_ok=True)
+    artifact = dict(params, created=time.time())
+
+    tmp = os.path.join(root, f".{os.getpid()}.tmp")
+    with open(tmp, "w") as file:
+        json.dump(artifact, file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    # os.link échoue si le nom existe déjà : deux entraînements simultanés ne
+    # peuvent pas réserver la même version, et une version n'est jamais écrasée
+    while True:
+        version = f"v{next_version(root):06d}.json"
+        try:
+            os.link(tmp, os.path.join(root, version))
+            break
+        except FileExistsError:
+            continue
+    os.remove(tmp)
+    os.chmod(os.path.join(root, version), 0o444)
+
+    write_json_atomic(os.path.join(root, CURRENT), {"version": version})
+    return version
+
+
+# -------------------------------------------------------------------------------
+# Enregistrer un modèle : miroir thetas.json (lecteurs existants) et registre
+def save_model(params, filename="thetas.json", indent=None):
+    write_json_atomic(filename, params, indent)
+    return publish(params, registry_for(filename))
+
+
+# -------------------------------------------------------------------------------
+# Chemin de l'artefact servi par un registre
+def current_path(root=REGISTRY):
+    with open(os.path.join(root, CURRENT), "r") as file:
+        return os.path.join(root, json.load(file)["version"])
+
+
+# ================================ CLASSE =====================================
+class ModelWatcher:
+    """
+    Garde un modèle en mémoire pour un prédicteur de longue durée.
+
+    `source` est un registre (dossier) ou un fichier JSON. get() ne fait qu'un
+    os.stat : le JSON n'est relu que si l'inode ou la mtime du pointeur
+    (ou du fichier) a changé, ce qui arrive à chaque os.replace.
+    """
+
+    def __init__(self, source=REGISTRY):
+        self.source = source
+        self.pointer = os.path.join(source, CURRENT) if os.path.isdir(source) else source
+        self.key = None
+        self.params = None
+        self.version = None
+
+    # ---------------------------------------------------------------------------
+    def get(self):
+        stat = os.stat(self.pointer)
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key != self.key:
+            self.reload()
+            self.key = key
+        return self.params
+
+    # ---------------------------------------------------------------------------
+    def reload(self):
+        path = current_path(self.source) if self.pointer != self.source else self.source
+        with open(path, "r") as file:
+            self.params = json.load(file)
+        self.version = os.path.basename(path)
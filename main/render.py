@@ -0,0 +1,88 @@
+# ================================ IMPORT =====================================
+# matplotlib n'est importé qu'au premier graphique (voir pyplot).
+import numpy as np
+
+# ============================== CONFIGURATION ================================
+POINT_BUDGET = 50_000       # au-delà, les points ne sont plus tracés un par un
+MODES = ("hexbin", "sample")
+GRID_SIZE = 100             # hexagones sur la largeur (mode hexbin)
+STRATA = 100                # tranches de x (mode sample)
+SEED = 42
+
+# ================================ FONCTIONS ==================================
+# pyplot, avec le backend Agg (sans fenêtre) pour écrire des fichiers.
+# headless=False garde le backend par défaut (plt.show()).
+def pyplot(headless=True):
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+# -------------------------------------------------------------------------------
+# Échantillon stratifié sur x : `budget` points environ, répartis entre
+# STRATA tranches de même largeur au prorata de leur effectif (au moins un
+# point par tranche non vide, les valeurs extrêmes restent visibles).
+# Un seul passage, sans tri : chaque point est gardé avec la probabilité de
+# sa tranche.
+def stratified_sample(x, y, budget=POINT_BUDGET, strata=STRATA, seed=SEED):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= budget:
+        return x, y
+    low, high = float(x.min()), float(x.max())
+    scale = strata / (high - low) if high > low else 0.0
+    bins = np.minimum(((x - low) * scale).astype(np.intp), strata - 1)
+    counts = np.bincount(bins, minlength=strata)
+    quota = np.maximum(counts * (budget / len(x)), np.minimum(counts, 1))
+    keep = np.random.default_rng(seed).random(len(x)) < (quota / np.maximum(counts, 1))[bins]
+    return x[keep], y[keep]
+
+
+# -------------------------------------------------------------------------------
+# Nuage de points sur `ax`. Jusqu'à `budget` points : un marqueur par point ;
+# au-delà : densité par hexagones (mode "hexbin", échelle log) ou échantillon
+# stratifié (mode "sample").
+def draw_points(ax, x, y, budget=POINT_BUDGET, mode="hexbin", color="blue", label=None):
+    if len(x) <= budget:
+        return ax.scatter(x, y, color=color, s=12, label=label)
+    if mode == "hexbin":
+        density = ax.hexbin(x, y, gridsize=GRID_SIZE, bins="log", mincnt=1, cmap="Blues")
+        ax.figure.colorbar(density, ax=ax, label="points par hexagone")
+        return density
+    x, y = stratified_sample(x, y, budget)
+    return ax.scatter(x, y, color=color, s=4, alpha=0.5, label=f"{label} ({len(x):,} points)" if label else None)
+
+
+# -------------------------------------------------------------------------------
+# Droite θ0 + θ1·x entre x_min et x_max : deux points suffisent
+def draw_line(ax, theta0, theta1, x_min, x_max, color="red", label="Régression linéaire"):
+    x = np.array([x_min, x_max], dtype=float)
+    return ax.plot(x, theta0 + theta1 * x, color=color, label=label)
+
+
+# -------------------------------------------------------------------------------
+# Figure données (+ droite si θ0, θ1 sont donnés), enregistrée dans
+# `filename` avec le backend Agg. La droite part de x_min (défaut : min(x)).
+def save_plot(filename, x, y, theta0=None, theta1=None, title="", xlabel="", ylabel="",
+              x_min=None, xlim=None, ylim=None, budget=POINT_BUDGET, mode="hexbin"):
+    plt = pyplot()
+    figure, ax = plt.subplots(figsize=(10, 6))
+    draw_points(ax, x, y, budget, mode, label="Données réelles")
+    if theta0 is not None:
+        draw_line(ax, theta0, theta1, float(np.min(x)) if x_min is None else x_min, float(np.max(x)))
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend()
+    ax.grid(True)
+    if xlim is not None:
+        ax.set_xlim(*xlim)
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    figure.tight_layout()
+    figure.savefig(filename)
+    plt.close(figure)
+    return filename
@@ -0,0 +1,167 @@
+# ================================ IMPORT =====================================
+import os
+import math
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from engine import gradient_descent
+from crossval import SEED, SHARED, attach, fold_indices, share
+from train import load_data, save_thetas
+
+# ============================== CONFIGURATION ================================
+RATES = [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 1.5]
+MIN_ITERATIONS = 100        # budget du premier tour
+MAX_ITERATIONS = 10_000     # budget maximal d'une configuration
+ETA = 3                     # à chaque tour : budget x ETA, 1/ETA des configurations gardées
+HOLDOUT = 5                 # validation sur 1/HOLDOUT des lignes
+
+# ================================ FONCTIONS ==================================
+# Masque d'entraînement et indices de validation
+def holdout(n, seed=SEED):
+    test = fold_indices(n, HOLDOUT, 0, 0, seed)
+    train = np.ones(n, dtype=bool)
+    train[test] = False
+    return train, test
+
+
+# Même découpage, gardé par processus pour les appels de run_config
+def split(n, seed=SEED):
+    if SHARED.get("split_key") != (n, seed):
+        SHARED["split"] = holdout(n, seed)
+        SHARED["split_key"] = (n, seed)
+    return SHARED["split"]
+
+
+# -------------------------------------------------------------------------------
+# Reprendre une configuration depuis son point de contrôle (θ0, θ1) pour
+# `iterations` itérations de plus, puis mesurer la MSE de validation.
+# x est déjà normalisé (données partagées, voir crossval.share).
+def run_config(learning_rate, theta0, theta1, iterations, seed=SEED):
+    x, y = SHARED["data"]
+    train, test = split(len(x), seed)
+    with np.errstate(all="ignore"):
+        theta0, theta1 = gradient_descent(x[train], y[train], learning_rate, iterations,
+                                          theta0, theta1)
+        error = theta0 + theta1 * x[test] - y[test]
+        mse = float(error.dot(error)) / len(error)
+    return theta0, theta1, mse if math.isfinite(mse) else math.inf
+
+
+# -------------------------------------------------------------------------------
+# Successive halving : toutes les configurations reçoivent un petit budget,
+# les meilleures 1/eta continuent avec eta fois plus d'itérations, etc.
+# Une configuration qui continue repart de son point de contrôle (warm start) :
+# passer de 300 à 900 itérations ne coûte que 600 itérations.
+# Renvoie un dict par configuration : rate, iterations, mse, theta0, theta1, rung.
+def successive_halving(x, y, rates, min_iterations=MIN_ITERATIONS, max_iterations=MAX_ITERATIONS,
+                       eta=ETA, workers=None, seed=SEED):
+    configs = [{"rate": rate, "iterations": 0, "mse": math.inf,
+                "theta0": 0.0, "theta1": 0.0, "rung": 0} for rate in rates]
+    survivors = configs
+    budget = min_iterations
+    pool = None
+    block, data = share(x, y)
+    try:
+        if workers == 1:
+            SHARED["data"] = data
+        else:
+            pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=attach,
+                                       initargs=(block.name, len(x)))
+        rung = 0
+        while True:
+            tasks = [(c["rate"], c["theta0"], c["theta1"], budget - c["iterations"], seed)
+                     for c in survivors]
+            if pool is None:
+                results = [run_config(*task) for task in tasks]
+            else:
+                results = list(pool.map(run_config, *zip(*tasks)))
+            for config, (theta0, theta1, mse) in zip(survivors, results):
+                config.update(theta0=theta0, theta1=theta1, mse=mse, iterations=budget, rung=rung)
+
+            if budget >= max_iterations or len(survivors) == 1:
+                break
+            survivors = sorted(survivors, key=lambda c: c["mse"])[:max(1, len(survivors) // eta)]
+            survivors = [c for c in survivors if math.isfinite(c["mse"])] or survivors[:1]
+            budget = min(budget * eta, max_iterations)
+            rung += 1
+        return sorted(configs, key=lambda c: (-c["rung"], c["mse"]))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        SHARED.clear()
+        del data
+        block.close()
+        block.unlink()
+
+
+# -------------------------------------------------------------------------------
+# Learning rates tirés uniformément en échelle log
+def sample_rates(count, low, high, seed=SEED):
+    rng = np.random.default_rng(seed)
+    return sorted(10 ** rng.uniform(math.log10(low), math.log10(high), count))
+
+
+# -------------------------------------------------------------------------------
+# Tableau classé : les configurations allées le plus loin d'abord
+def report(configs):
+    lines = [f"{'rang':>4} {'learning rate':>14} {'itérations':>11} {'MSE validation':>16} {'tour':>5}"]
+    for rank, c in enumerate(configs, 1):
+        lines.append(f"{rank:>4} {c['rate']:>14.6g} {c['iterations']:>11} {c['mse']:>16.2f} {c['rung']:>5}")
+    return "\n".join(lines)
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Recherche du learning rate et du nombre d'itérations")
+    parser.add_argument("--data", default="data.csv")
+    parser.add_argument("--rates", type=float, nargs="+", default=RATES,
+                        help="grille de learning rates")
+    parser.add_argument("--random", type=int, metavar="N",
+                        help="tirer N learning rates au hasard (log-uniforme) au lieu de la grille")
+    parser.add_argument("--rate-range", type=float, nargs=2, default=(1e-4, 2.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--min-iterations", type=int, default=MIN_ITERATIONS)
+    parser.add_argument("--max-iterations", type=int, default=MAX_ITERATIONS)
+    parser.add_argument("--eta", type=int, default=ETA)
+    parser.add_argument("--workers", type=int, help="processus (défaut : un par cœur)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    x, y = load_data(args.data)
+    x = np.asarray(x, dtype=np.float64)
+    train, _ = holdout(len(x), args.seed)
+    min_x = float(x[train].min())
+    max_x = float(x[train].max())
+    x_norm = (x - min_x) / (max_x - min_x)
+
+    rates = sample_rates(args.random, *args.rate_range, args.seed) if args.random else args.rates
+    start = time.perf_counter()
+    configs = successive_halving(x_norm, y, rates, args.min_iterations, args.max_iterations,
+                                 args.eta, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(report(configs))
+    # Sans warm start, chaque tour repartirait de zéro avec tout son budget
+    budgets = [args.min_iterations]
+    while budgets[-1] < args.max_iterations:
+        budgets.append(min(budgets[-1] * args.eta, args.max_iterations))
+    run = sum(c["iterations"] for c in configs)
+    cold = sum(sum(budgets[:c["rung"] + 1]) for c in configs)
+    print(f"\n{len(configs)} configurations, {elapsed:.2f} s, {run:,} itérations "
+          f"({cold:,} sans warm start)")
+
+    # Meilleure configuration réentraînée sur toutes les lignes, thetas
+    # ramenés en échelle réelle (comme train.py)
+    best = configs[0]
+    min_x, max_x = float(x.min()), float(x.max())
+    scale = max_x - min_x
+    theta0, theta1 = gradient_descent((x - min_x) / scale, y, best["rate"], best["iterations"])
+    theta0, theta1 = theta0 - theta1 * min_x / scale, theta1 / scale
+    version = save_thetas(theta0, theta1, min_x, max_x)
+    print(f"Meilleure : learning rate = {best['rate']:.6g}, {best['iterations']} itérations "
+          f"(réentraînée sur les {len(x)} lignes) -> thetas.json (models/{version})")
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# ================================ IMPORT =====================================
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from model import from_legacy
+from predict import predict_price
+from registry import ModelWatcher
+
+# ============================== CONFIGURATION ================================
+HOST = "127.0.0.1"
+PORT = 8642
+MAX_BATCH = 1024            # taille max d'un micro-batch
+MAX_DELAY = 0.002           # attente max (s) pour compléter un micro-batch
+LATENCY_WINDOW = 100_000    # nombre de latences gardées pour les percentiles
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+# ================================ CLASSES ====================================
+class Stats:
+    """Compteurs du service et fenêtre glissante des latences (en secondes)."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.version = None
+        self.requests = 0
+        self.predictions = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+
+    # ---------------------------------------------------------------------------
+    def percentiles(self):
+        if not self.latencies:
+            return {}
+        values = np.fromiter(self.latencies, dtype=float) * 1000
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        return {"p50": p50, "p90": p90, "p99": p99, "max": float(values.max())}
+
+    # ---------------------------------------------------------------------------
+    def to_dict(self):
+        return {
+            "uptime_s": time.time() - self.started,
+            "model": self.version,
+            "requests": self.requests,
+            "predictions": self.predictions,
+            "batches": self.batches,
+            "mean_batch": self.predictions / self.batches if self.batches else 0.0,
+            "errors": self.errors,
+            "latency_ms": self.percentiles(),
+        }
+
+
+# -------------------------------------------------------------------------------
+# (θ0, θ1) d'un modèle publié (artefact unifié, voir model.py, ou ancien format).
+# Le service tarife un kilométrage : un modèle à plusieurs variables est refusé.
+def linear_params(model):
+    if "format" not in model:
+        model = from_legacy(model)
+    if len(model["coef"]) != 1:
+        raise ValueError(f"modèle à {len(model['coef'])} variables, le service attend le seul kilométrage")
+    return float(model["intercept"]), float(model["coef"][0])
+
+
+# -------------------------------------------------------------------------------
+class Batcher:
+    """
+    Regroupe les prédictions demandées en même temps : chaque requête dépose
+    ses kilométrages dans une file, une tâche unique les vide par paquets et
+    applique le modèle en une seule opération vectorisée.
+
+    Le modèle est relu via un ModelWatcher : une nouvelle version publiée
+    est prise en compte au batch suivant, sans redémarrer le service. Une
+    version illisible ou inutilisable (plusieurs variables) est ignorée : le
+    dernier modèle valide reste servi.
+    """
+
+    def __init__(self, watcher, stats, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.watcher = watcher
+        self.stats = stats
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.loaded = None          # dernier dict lu par le watcher
+        self.theta = None           # (θ0, θ1) du dernier modèle valide
+        self.version = None
+        self.refresh()
+
+    # ---------------------------------------------------------------------------
+    # Relire le modèle publié ; garder le dernier modèle valide en cas d'erreur
+    def refresh(self):
+        try:
+            model = self.watcher.get()
+            if model is not self.loaded:
+                self.loaded = model
+                self.theta = linear_params(model)
+                self.version = self.watcher.version
+        except (OSError, ValueError, KeyError, TypeError):
+            if self.theta is None:
+                raise
+        return self.theta
+
+    # ---------------------------------------------------------------------------
+    # Prix pour une liste de kilométrages (attend le micro-batch)
+    async def predict(self, kms):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((kms, future))
+        return await future
+
+    # ---------------------------------------------------------------------------
+    # Boucle de traitement des micro-batchs
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_delay
+            while size < self.max_batch:
+                if self.queue.empty():
+                    # On laisse une fois la main aux autres connexions pour
+                    # qu'elles déposent leurs requêtes, sans dépasser max_delay
+                    if loop.time() >= deadline:
+                        break
+                    await asyncio.sleep(0)
+                    if self.queue.empty():
+                        break
+                    continue
+                item = self.queue.get_nowait()
+                pending.append(item)
+                size += len(item[0])
+
+            try:
+                theta0, theta1 = self.refresh()
+                kms = np.fromiter((km for item in pending for km in item[0]), dtype=float, count=size)
+                prices = predict_price(kms, theta0, theta1).tolist()
+            except Exception as e:
+                # La tâche ne doit jamais mourir : l'erreur va aux requêtes du batch
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats.batches += 1
+            self.stats.predictions += size
+
+            start = 0
+            for item_kms, future in pending:
+                end = start + len(item_kms)
+                if not future.done():
+                    future.set_result(prices[start:end])
+                start = end
+
+
+# ================================ FONCTIONS ==================================
+# Envoyer une réponse HTTP JSON
+async def send_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+# -------------------------------------------------------------------------------
+# Router une requête : GET /predict?km=..., POST /predict {"km": [...]}, GET /stats
+async def route(method, target, body, batcher, stats):
+    url = urlsplit(target)
+    if url.path == "/stats":
+        stats.version = batcher.version
+        return 200, stats.to_dict()
+    if url.path != "/predict":
+        return 404, {"error": "route inconnue"}
+
+    if method == "GET":
+        kms = [float(km) for km in parse_qs(url.query).get("km", [])]
+    elif method == "POST":
+        kms = json.loads(body or b"{}").get("km", [])
+        kms = [float(km) for km in (kms if isinstance(kms, list) else [kms])]
+    else:
+        return 405, {"error": "méthode non supportée"}
+
+    if not kms:
+        return 400, {"error": "paramètre km manquant"}
+    prices = await batcher.predict(kms)
+    if len(prices) == 1 and method == "GET":
+        return 200, {"km": kms[0], "price": prices[0]}
+    return 200, {"km": kms, "price": prices}
+
+
+# -------------------------------------------------------------------------------
+# Gérer une connexion (HTTP/1.1 keep-alive)
+async def handle(reader, writer, batcher, stats):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            start = time.perf_counter()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            body = await reader.readexactly(length) if length else b""
+
+            stats.requests += 1
+            try:
+                status, payload = await route(method, target, body, batcher, stats)
+            except (ValueError, TypeError, AttributeError) as e:
+                status, payload = 400, {"error": str(e)}
+            if status != 200:
+                stats.errors += 1
+            await send_json(writer, status, payload)
+            stats.latencies.append(time.perf_counter() - start)
+
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+# -------------------------------------------------------------------------------
+async def serve(args):
+    watcher = ModelWatcher(args.model)
+    stats = Stats()
+    try:
+        batcher = Batcher(watcher, stats, args.max_batch, args.max_delay)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise SystemExit(f"Modèle inutilisable ({args.model}) : {e}")
+    worker = asyncio.ensure_future(batcher.run())
+
+    def client(reader, writer):
+        return handle(reader, writer, batcher, stats)
+
+    if args.unix:
+        server = await asyncio.start_unix_server(client, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(client, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    theta0, theta1 = batcher.theta
+    print(f"Modèle chargé ({batcher.version}) : θ0 = {theta0:.4f}, θ1 = {theta1:.6f}")
+    print(f"Service de prédiction à l'écoute sur {where}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.cancel()
+
+
+# -------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Service local de prédiction de prix")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", metavar="PATH", help="écouter sur une socket Unix")
+    parser.add_argument("--model", default="thetas.json",
+                        help="fichier modèle ou registre (dossier models/), rechargé à chaud")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-delay", type=float, default=MAX_DELAY,
+                        help="attente max (s) pour compléter un micro-batch")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+# ================================ PROGRAMME ==================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# ================================ IMPORT =====================================
+import numpy as np
+from engine import as_array
+
+# ============================== CONFIGURATION ================================
+CHUNK_SIZE = 65536      # lignes traitées par bloc (reste dans le cache CPU)
+
+# ================================ CLASSE =====================================
+class Moments:
+    """
+    Statistiques suffisantes d'une régression linéaire simple, mises à jour
+    en une seule passe : effectif, moyennes, co-moments centrés et bornes de x.
+
+    Chaque bloc est centré sur sa propre moyenne puis fusionné avec la
+    formule de Chan et al., ce qui évite la perte de précision de
+    Σx² - n * mean(x)² sur de grands kilométrages.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0         # Σ(x - mean_x)²
+        self.m2_y = 0.0         # Σ(y - mean_y)²
+        self.c_xy = 0.0         # Σ(x - mean_x)(y - mean_y)
+        self.x_min = float("inf")
+        self.x_max = float("-inf")
+
+    # ---------------------------------------------------------------------------
+    # Ajouter un bloc de données (tableaux de même longueur)
+    def update(self, x, y):
+        x = as_array(x)
+        y = as_array(y)
+        n = len(x)
+        if n == 0:
+            return self
+
+        block = Moments()
+        block.n = n
+        block.mean_x = float(x.mean())
+        block.mean_y = float(y.mean())
+        dx = x - block.mean_x
+        dy = y - block.mean_y
+        block.m2_x = float(dx.dot(dx))
+        block.m2_y = float(dy.dot(dy))
+        block.c_xy = float(dx.dot(dy))
+        block.x_min = float(x.min())
+        block.x_max = float(x.max())
+        return self.merge(block)
+
+    # ---------------------------------------------------------------------------
+    # Fusionner avec d'autres statistiques (formule de Chan et al.)
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        factor = self.n * other.n / n
+
+        self.m2_x += other.m2_x + delta_x * delta_x * factor
+        self.m2_y += other.m2_y + delta_y * delta_y * factor
+        self.c_xy += other.c_xy + delta_x * delta_y * factor
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.x_min = min(self.x_min, other.x_min)
+        self.x_max = max(self.x_max, other.x_max)
+        self.n = n
+        return self
+
+    # ---------------------------------------------------------------------------
+    # État sérialisable (JSON), pour reprendre l'accumulation plus tard
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    # ---------------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        for name in stats.__dict__:
+            setattr(stats, name, type(getattr(stats, name))(state[name]))
+        return stats
+
+    # ---------------------------------------------------------------------------
+    # Pente (θ1) des moindres carrés
+    def slope(self):
+        if self.m2_x == 0:
+            raise ZeroDivisionError("variance de x nulle, pente indéfinie")
+        return self.c_xy / self.m2_x
+
+    # ---------------------------------------------------------------------------
+    # Ordonnée à l'origine (θ0) des moindres carrés
+    def intercept(self, slope=None):
+        if slope is None:
+            slope = self.slope()
+        return self.mean_y - slope * self.mean_x
+
+    # ---------------------------------------------------------------------------
+    # Solution exacte (θ0, θ1)
+    def fit(self):
+        theta1 = self.slope()
+        return self.intercept(theta1), theta1
+
+
+# ================================ FONCTIONS ==================================
+# Accumuler les statistiques d'un jeu de données en mémoire, bloc par bloc
+# (les colonnes ne sont converties en float que bloc par bloc, jamais copiées)
+def moments(x, y, chunk_size=CHUNK_SIZE):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    stats = Moments()
+    for start in range(0, len(x), chunk_size):
+        stats.update(x[start:start + chunk_size], y[start:start + chunk_size])
+    return stats
+
+
+# -------------------------------------------------------------------------------
+# Moindres carrés en forme close : renvoie (θ0, θ1) en une seule passe
+def fit_ols(x, y, chunk_size=CHUNK_SIZE):
+    return moments(x, y, chunk_size).fit()
+
+
+# -------------------------------------------------------------------------------
+# Moindres carrés à plusieurs variables : y ≈ intercept + X · coef.
+# Équations normales sur les données centrées, accumulées bloc par bloc
+# (seul un bloc centré est matérialisé à la fois). Renvoie (intercept, coef).
+def fit_ols_matrix(X, y, chunk_size=CHUNK_SIZE):
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, np.newaxis]
+    mean_x = X.mean(axis=0)
+    mean_y = float(y.mean())
+
+    p = X.shape[1]
+    gram = np.zeros((p, p))
+    rhs = np.zeros(p)
+    for start in range(0, len(X), chunk_size):
+        block = X[start:start + chunk_size] - mean_x
+        gram += block.T.dot(block)
+        rhs += block.T.dot(y[start:start + chunk_size] - mean_y)
+
+    coef = np.linalg.lstsq(gram, rhs, rcond=None)[0]
+    return mean_y - float(mean_x.dot(coef)), coef
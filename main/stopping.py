@@ -0,0 +1,125 @@
+# ================================ IMPORT =====================================
+import math
+import time
+
+# ============================== CONFIGURATION ================================
+REL_TOL = 1e-9          # variation relative du coût entre deux itérations
+GRAD_TOL = 1e-6         # norme du gradient, relative à celle du départ
+PARAM_TOL = 1e-10       # déplacement des paramètres, relatif à leur norme
+
+# Raisons d'arrêt
+MAX_ITERATIONS = "max_iterations"
+RELATIVE_COST = "relative_cost"
+GRADIENT_NORM = "gradient_norm"
+PARAMETER_DELTA = "parameter_delta"
+TIME_LIMIT = "time_limit"
+TARGET_COST = "target_cost"
+
+# ================================ CLASSE =====================================
+class StoppingCriteria:
+    """
+    Critères d'arrêt communs aux descentes de gradient.
+
+    Le trainer appelle start() avant sa boucle puis check() après chaque mise
+    à jour ; check() renvoie True dès qu'un critère est atteint. Après la
+    boucle, `iteration` contient le nombre d'itérations effectuées et
+    `reason` la raison de l'arrêt. Un critère à None est désactivé.
+    `target_cost` arrête dès que le coût passe sous une valeur connue (ex.
+    l'optimum des moindres carrés, voir bench_convergence.py).
+    """
+
+    def __init__(self, rel_tol=REL_TOL, grad_tol=GRAD_TOL, param_tol=PARAM_TOL,
+                 max_iterations=None, max_time=None, target_cost=None):
+        self.rel_tol = rel_tol
+        self.grad_tol = grad_tol
+        self.param_tol = param_tol
+        self.max_iterations = max_iterations
+        self.max_time = max_time
+        self.target_cost = target_cost
+        self.start()
+
+    # ---------------------------------------------------------------------------
+    def start(self):
+        self.started = time.perf_counter()
+        self.iteration = 0
+        self.reason = None
+        self.previous_cost = None
+        self.first_grad_norm = None
+        self.elapsed = 0.0
+        return self
+
+    # ---------------------------------------------------------------------------
+    # Fin de boucle sans critère atteint : le budget d'itérations est épuisé
+    def finish(self, iteration):
+        self.iteration = iteration
+        self.elapsed = time.perf_counter() - self.started
+        if self.reason is None:
+            self.reason = MAX_ITERATIONS
+        return self
+
+    # ---------------------------------------------------------------------------
+    # i : indice de l'itération (0, 1, ...), cost : coût courant,
+    # grad_norm : norme du gradient, step_norm / param_norm : ‖Δθ‖ et ‖θ‖
+    def check(self, i, cost=None, grad_norm=None, step_norm=None, param_norm=None):
+        self.iteration = i + 1
+        reason = None
+
+        if self.max_iterations is not None and self.iteration >= self.max_iterations:
+            reason = MAX_ITERATIONS
+        elif self.max_time is not None and time.perf_counter() - self.started >= self.max_time:
+            reason = TIME_LIMIT
+        elif not math.isfinite(cost if cost is not None else 0.0):
+            raise FloatingPointError(f"coût non fini à l'itération {self.iteration}, learning rate trop grand ?")
+        elif self.target_cost is not None and cost is not None and cost <= self.target_cost:
+            reason = TARGET_COST
+
+        if reason is None and grad_norm is not None and self.grad_tol is not None:
+            if self.first_grad_norm is None:
+                self.first_grad_norm = grad_norm
+            elif grad_norm <= self.grad_tol * self.first_grad_norm:
+                reason = GRADIENT_NORM
+
+        if reason is None and cost is not None and self.rel_tol is not None:
+            if self.previous_cost is not None:
+                change = abs(self.previous_cost - cost) / max(abs(self.previous_cost), 1e-300)
+                if change <= self.rel_tol:
+                    reason = RELATIVE_COST
+            self.previous_cost = cost
+
+        if reason is None and step_norm is not None and self.param_tol is not None:
+            if step_norm <= self.param_tol * max(param_norm or 0.0, 1.0):
+                reason = PARAMETER_DELTA
+
+        if reason is not None:
+            self.reason = reason
+            self.elapsed = time.perf_counter() - self.started
+            return True
+        return False
+
+    # ---------------------------------------------------------------------------
+    def __str__(self):
+        return f"arrêt à l'itération {self.iteration} ({self.reason}, {self.elapsed:.3f} s)"
+
+
+# ================================ FONCTIONS ==================================
+# Options de ligne de commande communes aux trainers
+def add_arguments(parser):
+    group = parser.add_argument_group("critères d'arrêt")
+    group.add_argument("--rel-tol", type=float, default=REL_TOL,
+                       help="variation relative du coût (défaut %(default)g)")
+    group.add_argument("--grad-tol", type=float, default=GRAD_TOL,
+                       help="norme du gradient relative au départ (défaut %(default)g)")
+    group.add_argument("--param-tol", type=float, default=PARAM_TOL,
+                       help="déplacement relatif des paramètres (défaut %(default)g)")
+    group.add_argument("--max-time", type=float, help="limite de temps en secondes")
+    group.add_argument("--no-early-stop", action="store_true",
+                       help="toujours faire toutes les itérations")
+    return parser
+
+
+# -------------------------------------------------------------------------------
+# Critères construits depuis les options (None si l'arrêt anticipé est désactivé)
+def from_args(args):
+    if args.no_early_stop:
+        return StoppingCriteria(None, None, None, max_time=args.max_time) if args.max_time else None
+    return StoppingCriteria(args.rel_tol, args.grad_tol, args.param_tol, max_time=args.max_time)
@@ -0,0 +1,50 @@
+# ================================ IMPORT =====================================
+import numpy as np
+
+# ============================== CONFIGURATION ================================
+EVERY = 1               # une mesure toutes les EVERY itérations
+CAPACITY = 10_000       # taille du tampon circulaire
+
+# ================================ CLASSE =====================================
+class CostRecorder:
+    """
+    Historique du coût pendant l'entraînement.
+
+    Les mesures sont échantillonnées toutes les `every` itérations et rangées
+    dans deux tableaux préalloués utilisés comme tampon circulaire : au-delà
+    de `capacity` mesures, les plus anciennes sont écrasées. Le trainer
+    fournit un coût déjà calculé à partir de son résidu, et ne le calcule
+    que si due(i) est vrai ; sans recorder (None), rien n'est mesuré.
+    """
+
+    def __init__(self, every=EVERY, capacity=CAPACITY):
+        self.every = max(1, int(every))
+        self.capacity = capacity
+        self.iterations = np.empty(capacity, dtype=np.int64)
+        self.costs = np.empty(capacity, dtype=np.float64)
+        self.count = 0
+
+    # ---------------------------------------------------------------------------
+    # Faut-il mesurer le coût à l'itération i ?
+    def due(self, i):
+        return i % self.every == 0
+
+    # ---------------------------------------------------------------------------
+    def record(self, i, cost):
+        position = self.count % self.capacity
+        self.iterations[position] = i
+        self.costs[position] = cost
+        self.count += 1
+
+    # ---------------------------------------------------------------------------
+    # Mesures gardées, de la plus ancienne à la plus récente (vues si possible)
+    def history(self):
+        if self.count <= self.capacity:
+            return self.iterations[:self.count], self.costs[:self.count]
+        start = self.count % self.capacity
+        order = np.r_[start:self.capacity, 0:start]
+        return self.iterations[order], self.costs[order]
+
+    # ---------------------------------------------------------------------------
+    def __len__(self):
+        return min(self.count, self.capacity)
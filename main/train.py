@@ -1,41 +1,60 @@
-import csv
-import json
+import argparse
+import numpy as np
+from engine import AUTO, as_array, gradient_descent, gradient_descent_matrix, learning_rate_type, resolve_learning_rate
+from stats import Moments, moments, fit_ols_matrix
+from chunks import CHUNK_ROWS, read_chunks
+from cache import load_columns, numeric_names, read_header
+from model import fold, model_params, write_model
+import incremental
+import stopping as stopping_criteria
+from telemetry import CostRecorder
 
-# Charger les données CSV
+# Charger les données CSV (via le cache binaire, voir cache.py)
 def load_data(filename):
-    x = []
-    y = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        next(reader)  # Ignore l'en-tête
-        for row in reader:
-            try:
-                x.append(float(row[0]))
-                y.append(float(row[1]))
-            except ValueError:
-                continue  # Ignore les lignes invalides
-    return x, y
+    return load_columns(filename, usecols=(0, 1))
 
 # Normaliser x (kilométrage)
 def normalize(x):
-    min_x = min(x)
-    max_x = max(x)
-    x_norm = [(xi - min_x) / (max_x - min_x) for xi in x]
+    x = as_array(x)
+    min_x = float(x.min())
+    max_x = float(x.max())
+    x_norm = (x - min_x) / (max_x - min_x)
     return x_norm, min_x, max_x
 
-# Descente de gradient
-def train(x, y, learning_rate=0.01, iterations=5000):
-    x_norm, min_x, max_x = normalize(x)
-    theta0 = 0
-    theta1 = 0
-    m = len(x)
+# Charger plusieurs variables par nom : matrice X (m, p), cible y et noms.
+# Par défaut, la cible est la dernière colonne numérique et toutes les autres
+# colonnes numériques sont des variables explicatives.
+def load_matrix(filename, features=None, target=None):
+    names = read_header(filename)
+    if not (features and target):
+        numeric = numeric_names(filename)
+        target = target or numeric[-1]
+        features = list(features or [name for name in numeric if name != target])
+    missing = [name for name in features + [target] if name not in names]
+    if missing:
+        raise ValueError(f"colonnes absentes de {filename} : {', '.join(missing)}")
+    # Lignes invalides écartées sur ces colonnes seulement (voir cache.select_columns)
+    columns = load_columns(filename, usecols=features + [target])
+    return np.column_stack(columns[:-1]), columns[-1], features, target
 
-    for _ in range(iterations):
-        sum_errors_0 = sum((theta0 + theta1 * x_norm[i] - y[i]) for i in range(m))
-        sum_errors_1 = sum((theta0 + theta1 * x_norm[i] - y[i]) * x_norm[i] for i in range(m))
+# Normaliser chaque colonne de X dans [0, 1] (une colonne constante reste à 0)
+def normalize_columns(X):
+    x_min = X.min(axis=0)
+    x_max = X.max(axis=0)
+    scale = np.where(x_max > x_min, x_max - x_min, 1.0)
+    return (X - x_min) / scale, x_min, x_max
 
-        theta0 -= learning_rate * (1 / m) * sum_errors_0
-        theta1 -= learning_rate * (1 / m) * sum_errors_1
+# Descente de gradient (moteur vectorisé, voir engine.py).
+# `stopping` : critères d'arrêt anticipé optionnels (voir stopping.py)
+# `recorder` : historique du coût optionnel (voir telemetry.py)
+# learning_rate=AUTO : plus grand pas sûr, calculé sur x normalisé
+def train(x, y, learning_rate=AUTO, iterations=5000, stopping=None, recorder=None):
+    x_norm, min_x, max_x = normalize(x)
+    if learning_rate == AUTO:
+        learning_rate = resolve_learning_rate(AUTO, x_norm)
+        print(f"Learning rate automatique : {learning_rate:.6g}")
+    theta0, theta1 = gradient_descent(x_norm, y, learning_rate, iterations,
+                                      stopping=stopping, recorder=recorder)
 
     # Reconvertir dans l’échelle réelle (non normalisée)
     scale = max_x - min_x
@@ -44,20 +63,147 @@ def train(x, y, learning_rate=0.01, iterations=5000):
 
     return theta0_real, theta1_real, min_x, max_x
 
-# Sauvegarder dans thetas.json
-def save_thetas(theta0, theta1, min_x, max_x, filename='thetas.json'):
-    data = {
-        'theta0': theta0,
-        'theta1': theta1,
-        'min_x': min_x,
-        'max_x': max_x
-    }
-    with open(filename, 'w') as file:
-        json.dump(data, file)
+# Descente de gradient à plusieurs variables (voir engine.gradient_descent_matrix).
+# Renvoie l'intercept et les coefficients dans l'espace normalisé, avec les
+# bornes de chaque variable : c'est ce que contient le modèle sauvegardé.
+def train_matrix(X, y, learning_rate=AUTO, iterations=5000, stopping=None, recorder=None):
+    X_norm, x_min, x_max = normalize_columns(X)
+    if learning_rate == AUTO:
+        learning_rate = resolve_learning_rate(AUTO, X_norm)
+        print(f"Learning rate automatique : {learning_rate:.6g}")
+    intercept, coef = gradient_descent_matrix(X_norm, y, learning_rate, iterations,
+                                              stopping=stopping, recorder=recorder)
+    return intercept, coef, x_min, x_max
+
+# Moindres carrés à plusieurs variables, ramenés dans l'espace normalisé
+def train_ols_matrix(X, y):
+    intercept, coef = fit_ols_matrix(X, y)
+    x_min = X.min(axis=0)
+    x_max = X.max(axis=0)
+    scale = np.where(x_max > x_min, x_max - x_min, 1.0)
+    return intercept + float(coef.dot(x_min)), coef * scale, x_min, x_max
+
+# Moindres carrés en forme close (alternative à la descente de gradient)
+def train_ols(x, y):
+    stats = moments(x, y)
+    theta0, theta1 = stats.fit()
+    return theta0, theta1, stats.x_min, stats.x_max
+
+# Colonnes (variable, cible) des modes en flux, résolues depuis l'en-tête :
+# noms et indices. Par défaut, la cible est la dernière colonne (comme
+# --target) et la variable la première autre colonne. Une seule variable
+# (moindres carrés simples).
+def stream_columns(filename, features=None, target=None):
+    names = read_header(filename)
+    if features and len(features) != 1:
+        raise ValueError("--stream et --incremental n'acceptent qu'une variable (--features COLONNE)")
+    target = target or names[-1]
+    feature = features[0] if features else next(name for name in names if name != target)
+    missing = [name for name in (feature, target) if name not in names]
+    if missing:
+        raise ValueError(f"colonnes absentes de {filename} : {', '.join(missing)}")
+    return feature, target, (names.index(feature), names.index(target))
+
+# Entraînement en flux : le CSV est lu par blocs de taille bornée et seules
+# les statistiques suffisantes sont gardées en mémoire (solution exacte).
+# `columns` : indices (variable, cible), voir stream_columns
+def train_stream(filename, chunk_rows=CHUNK_ROWS, columns=(0, 1)):
+    stats = Moments()
+    for x, y in read_chunks(filename, chunk_rows, columns=columns):
+        stats.update(x, y)
+    theta0, theta1 = stats.fit()
+    return theta0, theta1, stats.x_min, stats.x_max
+
+# Entraînement incrémental : les statistiques suffisantes sont gardées à côté
+# du modèle (thetas.state.json, voir incremental.py) et seules les lignes
+# ajoutées au CSV depuis le dernier entraînement sont lues (solution exacte).
+# `columns` : indices (variable, cible), voir stream_columns
+def train_incremental(filename, model_file='thetas.json', columns=(0, 1)):
+    stats, rows, restart = incremental.update(filename, model_file, columns)
+    print(f"{rows} ligne(s) {'lue(s)' if restart else 'ajoutée(s)'}, {stats.n} au total")
+    theta0, theta1 = stats.fit()
+    return theta0, theta1, stats.x_min, stats.x_max
+
+# Sauvegarder le modèle (voir model.py) : miroir thetas.json, artefact
+# binaire thetas.bin et nouvelle version dans le registre models/.
+# θ0, θ1 sont déjà en échelle réelle ; min_x, max_x sont gardés comme métadonnées.
+def save_thetas(theta0, theta1, min_x, max_x, filename='thetas.json', feature="km", target="price"):
+    return write_model(model_params(theta0, [theta1], [min_x], [max_x], [feature], target), filename)
+
+# Sauvegarder un modèle à plusieurs variables : les coefficients appris en
+# espace normalisé sont ramenés en espace brut avant l'écriture
+def save_matrix(features, target, intercept, coef, x_min, x_max, filename='thetas.json'):
+    x_min = np.asarray(x_min).tolist()
+    x_max = np.asarray(x_max).tolist()
+    intercept, coef = fold(intercept, np.asarray(coef).tolist(), x_min, x_max)
+    return write_model(model_params(intercept, coef, x_min, x_max, features, target), filename)
 
 # Lancement du programme
 if __name__ == "__main__":
-    x, y = load_data('data.csv')
-    theta0, theta1, min_x, max_x = train(x, y)
-    save_thetas(theta0, theta1, min_x, max_x)
-    print(f"Modèle entraîné : θ0 = {theta0:.4f}, θ1 = {theta1:.6f}")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", choices=["gd", "ols"], default="gd",
+                        help="descente de gradient (gd) ou moindres carrés (ols)")
+    parser.add_argument("--data", default="data.csv", help="fichier CSV d'entraînement (défaut %(default)s)")
+    parser.add_argument("--features", nargs="+", metavar="COLONNE",
+                        help="variables explicatives (défaut : toutes les colonnes sauf la cible)")
+    parser.add_argument("--target", help="colonne à prédire (défaut : la dernière)")
+    parser.add_argument("--stream", action="store_true",
+                        help="lecture par blocs, mémoire constante (moindres carrés exacts)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="ne lire que les lignes ajoutées depuis le dernier entraînement (moindres carrés exacts)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                        help="nombre de lignes par bloc en mode --stream")
+    parser.add_argument("--learning-rate", type=learning_rate_type, default=AUTO,
+                        help="pas d'apprentissage, ou 'auto' pour 1/λmax(XᵀX/m) (défaut %(default)s)")
+    parser.add_argument("--iterations", type=int, default=5000,
+                        help="nombre maximal d'itérations (défaut %(default)s)")
+    parser.add_argument("--cost-history", metavar="K", type=int,
+                        help="mesurer le coût toutes les K itérations et tracer la courbe")
+    stopping_criteria.add_arguments(parser)
+    args = parser.parse_args()
+    if (args.stream or args.incremental) and args.features and len(args.features) > 1:
+        parser.error("--stream et --incremental n'acceptent qu'une variable (--features COLONNE)")
+
+    recorder = None
+    X = None
+    if args.stream or args.incremental:
+        feature, target, columns = stream_columns(args.data, args.features, args.target)
+        features = [feature]
+    else:
+        X, y, features, target = load_matrix(args.data, args.features, args.target)
+
+    if X is not None and X.shape[1] > 1:
+        # Plusieurs variables : vecteur de coefficients et bornes par variable
+        if args.method == "ols":
+            intercept, coef, x_min, x_max = train_ols_matrix(X, y)
+        else:
+            stopping = stopping_criteria.from_args(args)
+            recorder = CostRecorder(args.cost_history) if args.cost_history else None
+            intercept, coef, x_min, x_max = train_matrix(X, y, args.learning_rate, args.iterations,
+                                                         stopping=stopping, recorder=recorder)
+            if stopping is not None:
+                print(f"Descente de gradient : {stopping}")
+        save_matrix(features, target, intercept, coef, x_min, x_max)
+        print(f"Modèle entraîné sur {len(features)} variables : intercept = {intercept:.4f}")
+        for name, value in zip(features, coef):
+            print(f"  {name:<20} {value:>14.6f} (espace normalisé)")
+    else:
+        if args.incremental:
+            theta0, theta1, min_x, max_x = train_incremental(args.data, columns=columns)
+        elif args.stream:
+            theta0, theta1, min_x, max_x = train_stream(args.data, args.chunk_rows, columns)
+        elif args.method == "ols":
+            theta0, theta1, min_x, max_x = train_ols(X[:, 0], y)
+        else:
+            stopping = stopping_criteria.from_args(args)
+            recorder = CostRecorder(args.cost_history) if args.cost_history else None
+            theta0, theta1, min_x, max_x = train(X[:, 0], y, args.learning_rate, args.iterations,
+                                                 stopping=stopping, recorder=recorder)
+            if stopping is not None:
+                print(f"Descente de gradient : {stopping}")
+        save_thetas(theta0, theta1, min_x, max_x, feature=features[0], target=target)
+        print(f"Modèle entraîné ({features[0]} -> {target}) : θ0 = {theta0:.4f}, θ1 = {theta1:.6f}")
+
+    if recorder is not None:
+        from plot import plot_cost_history
+        plot_cost_history(recorder)
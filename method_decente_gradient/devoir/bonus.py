@@ -1,11 +1,16 @@
 # ================================ IMPORT =====================================
+import os
 import sys
 import json
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from logger import setup_logger, GREEN_B
 
+# Cache binaire des CSV partagé avec le pipeline main/ :
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main"))
+from cache import load_columns
+from metrics import evaluate
+from render import save_plot
+
 # =============================== CONSTANTES ===================================
 LOGGER = setup_logger()
 FILE_DATA = "data.csv"
@@ -16,9 +21,10 @@ GRAH = "regression_lineaire.png"
 def recup_data(file: str=""):
 
     try:
-        data = pd.read_csv(file)
-        for col in data.columns:
-            data[col] = pd.to_numeric(data[col], errors='raise')
+        # Colonnes km et price projetées depuis le cache binaire, sans copie
+        # (lignes invalides écartées sur ces deux colonnes seulement) :
+        columns = load_columns(file, usecols=("km", "price"))
+        data = pd.DataFrame(dict(zip(("km", "price"), columns)), copy=False)
 
         LOGGER.info(f"Données du fichier '{file}' récupérer avec succès :\n{data.head()}")
     except Exception as e:
@@ -31,41 +37,20 @@ def recup_data(file: str=""):
 #------------------------------------------------------------------------------
 def save_regression_graph(data: pd.DataFrame, theta_0: float, theta_1: float):
 
-    # Trace un graphique simple (nuage de points) :
-    plt.scatter(
-        data["km"].values,
-        data["price"].values,
-        color='blue',
-        label='prix')
-    
-    # Droite de regresion :
-    x = np.array(data["km"].values, dtype=float)
-
-    x_vals = list(x)
-    y_vals = [theta_0 + theta_1 * km for km in x]
-
-    # Ajoute le point à l'origine :
-    x_vals.insert(0, 0)
-    y_vals.insert(0, theta_0)
-
-    plt.plot(x_vals,
-             y_vals,
-             color='red',
-             label='Régression')
-    
-    # Titrages et labels :
-    plt.title("Évolution du prix en fonction des kilomètres parcourus")
-    plt.xlabel("Kilomètres parcourus")
-    plt.ylabel("Prix du véhicule (€)")
-    plt.legend()
-    
-    # Reglage de la fenetre :
-    plt.grid(True)
-    plt.xlim(0, data["km"].max() + 20_000)
-    plt.ylim(0, data["price"].max() + 2_000)
-
-    # Sauvegarde du graphique :
-    plt.savefig(GRAH)    
+    # Nuage de points (densité au-delà de render.POINT_BUDGET points) et
+    # droite de régression tracée de l'origine au kilométrage max, sans
+    # fenêtre (backend Agg) :
+    save_plot(GRAH,
+              data["km"].values,
+              data["price"].values,
+              theta_0,
+              theta_1,
+              title="Évolution du prix en fonction des kilomètres parcourus",
+              xlabel="Kilomètres parcourus",
+              ylabel="Prix du véhicule (€)",
+              x_min=0,
+              xlim=(0, data["km"].max() + 20_000),
+              ylim=(0, data["price"].max() + 2_000))
     LOGGER.info(f"Fichier {GRAH} enregistre avec succees")
 
     return
@@ -86,109 +71,16 @@ def recup_theta(file : str="") -> tuple[float, float]:
     
     return theta0, theta1
 
-#------------------------------------------------------------------------------
-def mean_squared_error(y, y_pred) -> float:
-    """
-    Calcule l'erreur quadratique moyenne (Mean Squared Error, MSE) entre les valeurs réelles et les valeurs prédites.
-
-    Parameters
-    ----------
-    y : array-like
-        Les valeurs réelles.
-    y_pred : array-like
-        Les valeurs prédites par le modèle.
-
-    Returns
-    -------
-    float
-        La valeur du MSE, c'est-à-dire la moyenne des carrés des écarts entre y et y_pred.
-
-    Examples
-    --------
-    >>> import numpy as np
-    >>> y = np.array([3, -0.5, 2, 7])
-    >>> y_pred = np.array([2.5, 0.0, 2, 8])
-    >>> mean_squared_error(y, y_pred)
-    0.375
-    """
-
-    mse = 0
-    mse = ((y - y_pred) ** 2).mean()
-
-    return float(mse)
-
-#------------------------------------------------------------------------------
-def mean_absolute_error(y, y_pred) -> float:
-    """
-    Calcule l'erreur absolue moyenne (Mean Absolute Error, MAE) entre les valeurs réelles et les valeurs prédites.
-
-    Parameters
-    ----------
-    y : array-like
-        Les valeurs réelles.
-    y_pred : array-like
-        Les valeurs prédites par le modèle.
-
-    Returns
-    -------
-    float
-        La valeur du MAE, c'est-à-dire la moyenne des valeurs absolues des écarts entre y et y_pred.
-
-    Examples
-    --------
-    >>> import numpy as np
-    >>> y = np.array([3, -0.5, 2, 7])
-    >>> y_pred = np.array([2.5, 0.0, 2, 8])
-    >>> mean_absolute_error(y, y_pred)
-    0.5
-    """
-
-    mae = np.abs(y - y_pred).mean()
-    return float(mae)
-
-#------------------------------------------------------------------------------
-def r2_score(y, y_pred) -> float:
-    """
-    Calcule le coefficient de détermination R² pour mesurer la qualité de la régression.
-
-    R² indique la proportion de la variance des valeurs réelles expliquée par le modèle.
-    Une valeur proche de 1 indique un bon ajustement.
-
-    Parameters
-    ----------
-    y : array-like
-        Les valeurs réelles.
-    y_pred : array-like
-        Les valeurs prédites par le modèle.
-
-    Returns
-    -------
-    float
-        Le coefficient R² de la régression.
-
-    Examples
-    --------
-    >>> import numpy as np
-    >>> y = np.array([3, -0.5, 2, 7])
-    >>> y_pred = np.array([2.5, 0.0, 2, 8])
-    >>> r2_score(y, y_pred)
-    0.9486081370449679
-    """
-
-    ss_res = ((y - y_pred) ** 2).sum()
-    ss_tot = ((y - y.mean()) ** 2).sum()
-    r2 = 1 - (ss_res / ss_tot)
-    return float(r2)
-
 #------------------------------------------------------------------------------
 def calcul_precision(data: pd.DataFrame, theta0: float, theta1: float) -> None:
     """
     Calcule et affiche les métriques de précision pour une régression linéaire.
 
-    Les métriques calculées sont :
-    - Mean Squared Error (MSE)
+    Les métriques sont calculées en une seule passe par main/metrics.py :
+    - Mean Squared Error (MSE) et sa racine (RMSE)
     - Mean Absolute Error (MAE)
     - Coefficient de détermination (R²)
+    - Erreur maximale et résidu moyen
 
     Parameters
     ----------
@@ -220,25 +112,29 @@ def calcul_precision(data: pd.DataFrame, theta0: float, theta1: float) -> None:
     ... })
     >>> calcul_precision(data, theta0=2000, theta1=-0.05)
     MSE (Mean Squared Error) = 201750000.00
+    RMSE (Root Mean Squared Error) = 14203.87
     MAE (Mean Absolute Error) = 14166.67
     R² (coefficient de détermination) = -32.6250
+    Erreur max = 15500.00
+    Résidu moyen = 14166.67
     """
 
 
-    x = np.array(data["km"].values, dtype=float)
-    y = np.array(data["price"].values, dtype=float)
+    x = data["km"].values
+    y = data["price"].values
 
     # Prédictions :
     y_pred = theta0 + theta1 * x
 
-    # Calcul des métriques :
-    mse = mean_squared_error(y, y_pred)
-    mae = mean_absolute_error(y, y_pred)
-    r2 = r2_score(y, y_pred)
+    # Calcul des métriques, en une passe sur le résidu :
+    metrics = evaluate(y, y_pred)
 
-    print(f"MSE (Mean Squared Error) = {mse:.2f}")
-    print(f"MAE (Mean Absolute Error) = {mae:.2f}")
-    print(f"R² (coefficient de détermination) = {r2:.4f}")
+    print(f"MSE (Mean Squared Error) = {metrics.mse:.2f}")
+    print(f"RMSE (Root Mean Squared Error) = {metrics.rmse:.2f}")
+    print(f"MAE (Mean Absolute Error) = {metrics.mae:.2f}")
+    print(f"R² (coefficient de détermination) = {metrics.r2:.4f}")
+    print(f"Erreur max = {metrics.max_error:.2f}")
+    print(f"Résidu moyen = {metrics.residual_mean:.2f}")
     return
 
 #------------------------------------------------------------------------------
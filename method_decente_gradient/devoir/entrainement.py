@@ -1,27 +1,39 @@
 # ================================ IMPORT =====================================
+import os
 import sys
-import json
 import pandas as pd                                 # type: ignore #ignore
-import matplotlib.pyplot as plt                     # type: ignore #ignore
 import numpy as np
 
 from logger import setup_logger, GREEN_B
 
+# Cache binaire des CSV et registre de modèles partagés avec le pipeline main/ :
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main"))
+from cache import load_columns, read_header
+from model import model_params, write_model
+from stopping import StoppingCriteria
+from optimizers import make_optimizer
+from engine import AUTO, resolve_learning_rate
+from precision import accurate_dot, accurate_sum
+import incremental
+
 # =============================== CONSTANTES ===================================
 LOGGER = setup_logger()
 THETA_0 = 0
 THETA_1 = 0
-MSE_HISTORY = []
 ITERATIONS = 10000
-LEARNING_RATE = 0.01
+LEARNING_RATE = AUTO              # ou un nombre ; AUTO = 1/λmax(XᵀX/m) (voir main/engine.py)
+OPTIMIZER = "gd"                  # momentum, nesterov, adam, barzilai_borwein (voir main/optimizers.py)
+DTYPE = np.float64                # np.float32 : données en float32, sommes compensées (voir main/precision.py)
+INCREMENTAL = False               # True : moindres carrés exacts, seules les lignes ajoutées au CSV sont lues (voir main/incremental.py)
 
 # =============================== FONCTIONS ====================================
 def recup_data(file: str=""):
 
     try:
-        data = pd.read_csv(file)
-        for col in data.columns:
-            data[col] = pd.to_numeric(data[col], errors='raise')
+        # Colonnes km et price projetées depuis le cache binaire, sans copie
+        # (lignes invalides écartées sur ces deux colonnes seulement) :
+        columns = load_columns(file, usecols=("km", "price"))
+        data = pd.DataFrame(dict(zip(("km", "price"), columns)), copy=False)
 
         LOGGER.info(f"Données du fichier '{file}' récupérer avec succès :\n{data.head()}")
     except Exception as e:
@@ -32,47 +44,76 @@ def recup_data(file: str=""):
 
 
 # -------------------------------------------------------------------------------
-def normalize(x):
-    x_min = min(x)
-    x_max = max(x)
-    x_norm = [(xi - x_min) / (x_max - x_min) for xi in x]
+def normalize(x, dtype=float):
+    x_min = float(x.min())
+    x_max = float(x.max())
+
+    # Un seul tableau alloué, dans la précision demandée :
+    x_norm = np.empty(len(x), dtype=dtype)
+    np.subtract(x, x_min, out=x_norm)
+    x_norm /= x_max - x_min
 
-    return np.array(x_norm, dtype=float), x_min, x_max
+    return x_norm, x_min, x_max
 
 
 #------------------------------------------------------------------------------
-def descente_gradiant(data: pd.DataFrame, theta0=0.0, theta1=0.0):
+def descente_gradiant(data: pd.DataFrame, theta0=0.0, theta1=0.0, stopping=None, recorder=None,
+                      optimizer=OPTIMIZER, dtype=DTYPE, iterations=ITERATIONS):
 
     try:
-        # Données d'origine :
-        x = np.array(data["km"].values, dtype=float)
-        y = np.array(data["price"].values, dtype=float)
-        n = len(x)
-
+        # Données d'origine (sans copie) :
+        x = np.asarray(data["km"].values, dtype=float)
+        y = np.asarray(data["price"].values, dtype=float)
 
-        # Normalisation pour stabilité
-        x_norm, x_min, x_max = normalize(x)
-        y_norm, y_min, y_max = normalize(y)
+        # Normalisation pour stabilité, dans la précision `dtype` :
+        x_norm, x_min, x_max = normalize(x, dtype)
+        y_norm, y_min, y_max = normalize(y, dtype)
         n = len(x)
-        MSE_HISTORY = []
 
-        # Descente de gradient sur données normalisées :
-        for _ in range(ITERATIONS):
-            # Prédiction :
-            y_pred = theta0 + theta1 * x_norm
-            error = y_pred - y_norm
-
-            # Gradients :
-            gradient_b0 = (1/n) * error.sum()
-            gradient_b1 = (1/n) * (error * x_norm).sum()
+        # Tampons réutilisés à chaque itération (erreur et produits) :
+        error = np.empty(n, dtype=dtype)
+        products = np.empty(n, dtype=dtype)
+
+        # Descente de gradient sur données normalisées, règle de mise à jour
+        # choisie par OPTIMIZER :
+        learning_rate = resolve_learning_rate(LEARNING_RATE, x_norm)
+        LOGGER.info(f"Learning rate : {learning_rate:.6g} ({'auto' if LEARNING_RATE == AUTO else 'fixe'})")
+        optimizer = make_optimizer(optimizer, learning_rate)
+        theta = np.array([theta0, theta1], dtype=float)
+        if stopping is not None:
+            stopping.start()
+        for i in range(iterations):
+            # Erreur de prédiction (au point anticipé pour nesterov), en place.
+            # theta reste en float64, converti à la précision des données :
+            b0, b1 = optimizer.lookahead(theta).astype(dtype)
+            np.multiply(x_norm, b1, out=error)
+            error += b0
+            error -= y_norm
+
+            # Gradients (sommes compensées en float32) :
+            gradient = np.array([accurate_sum(error), accurate_dot(error, x_norm, products)]) / n
+
+            # MSE, mesurée seulement si besoin (arrêt anticipé ou historique
+            # main/telemetry.py) à partir de l'erreur déjà calculée :
+            if stopping is not None or (recorder is not None and recorder.due(i)):
+                mse = accurate_dot(error, error, products) / n
+                if recorder is not None and recorder.due(i):
+                    recorder.record(i, mse)
 
             # Mise à jour des paramètres :
-            theta0 -= LEARNING_RATE * gradient_b0
-            theta1 -= LEARNING_RATE * gradient_b1
+            step = optimizer.step(theta, gradient)
+            theta = theta + step
+
+            # Arrêt anticipé (voir main/stopping.py) :
+            if stopping is not None:
+                if stopping.check(i, mse, np.linalg.norm(gradient), np.linalg.norm(step), np.linalg.norm(theta)):
+                    break
 
-            # MSE :
-            mse = (error ** 2).mean()
-            MSE_HISTORY.append(mse)
+        if stopping is not None:
+            if stopping.reason is None:
+                stopping.finish(iterations)
+            LOGGER.info(f"Descente de gradient ({optimizer}) : {stopping}")
+        theta0, theta1 = float(theta[0]), float(theta[1])
 
         # Dénormalisation des paramètres :
         theta1_denorm = theta1 * (y_max - y_min) / (x_max - x_min)
@@ -85,15 +126,14 @@ def descente_gradiant(data: pd.DataFrame, theta0=0.0, theta1=0.0):
         sys.exit(1)
 
 #------------------------------------------------------------------------------
-def save_values(theta0: float=0.0, theta1: float=0.0) -> None:
+def save_values(theta0: float=0.0, theta1: float=0.0, x_min=None, x_max=None) -> None:
 
-    params = {
-        "theta0": theta0,
-        "theta1": theta1,
-    }
+    # Modèle en espace brut (voir main/model.py), bornes du kilométrage en métadonnées :
+    params = model_params(theta0, [theta1], [x_min] if x_min is not None else None,
+                          [x_max] if x_max is not None else None)
 
-    with open("thetas.json", "w") as f:
-        json.dump(params, f)
+    # Écriture atomique de thetas.json + thetas.bin, nouvelle version dans models/ :
+    write_model(params, "thetas.json")
 
 
 #------------------------------------------------------------------------------
@@ -102,14 +142,25 @@ def main() -> int:
 
     """
 
+    # Mode incrémental : statistiques suffisantes reprises de thetas.state.json,
+    # seules les nouvelles lignes de data.csv sont lues (colonnes km et price) :
+    if INCREMENTAL:
+        names = read_header("data.csv")
+        columns = (names.index("km"), names.index("price"))
+        stats, rows, _ = incremental.update("data.csv", "thetas.json", columns)
+        LOGGER.info(f"Entraînement incrémental : {rows} nouvelle(s) ligne(s), {stats.n} au total")
+        theta_0, theta_1 = stats.fit()
+        save_values(theta_0, theta_1, stats.x_min, stats.x_max)
+        return 0
+
     # [1]. Récupération des données :
     data = recup_data("data.csv")
 
-    # [2]. Descente de gradiant:
-    theta_0, theta_1 = descente_gradiant(data, THETA_0, THETA_1)
+    # [2]. Descente de gradiant (avec arrêt anticipé) :
+    theta_0, theta_1 = descente_gradiant(data, THETA_0, THETA_1, StoppingCriteria())
 
     # [3]. Sauvegarde des variables theta0 et theta1:
-    save_values(theta_0, theta_1)
+    save_values(theta_0, theta_1, float(data["km"].min()), float(data["km"].max()))
 
     return 0
 
@@ -1,8 +1,6 @@
 # ================================ IMPORT =====================================
 import sys
 import json
-import pandas as pd                                 # type: ignore #ignore
-import matplotlib.pyplot as plt                     # type: ignore #ignore
 from logger import setup_logger, GREEN_B, YELLOW_B
 
 LOGGER = setup_logger()
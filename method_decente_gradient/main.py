@@ -1,15 +1,24 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Sommes compensées du mode float32 (voir main/precision.py) :
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+from precision import accurate_dot, accurate_sum
+
+# np.float32 : données et erreur en float32 (moitié moins de mémoire)
+DTYPE = np.float64
+
 # -----------------------
 # Données d'entrée
 # -----------------------
 
 data = pd.read_csv("data.csv")
 
-X = data["km"].values
-y = data["price"].values
+X = data["km"].values.astype(DTYPE)
+y = data["price"].values.astype(DTYPE)
 
 # -----------------------
 # Initialisation
@@ -29,13 +38,13 @@ for epoch in range(epochs):
     y_pred = beta_0 + beta_1 * X
     error = y_pred - y
 
-    gradient_b0 = (1/n) * error.sum()
-    gradient_b1 = (1/n) * (error * X).sum()
+    gradient_b0 = (1/n) * accurate_sum(error)
+    gradient_b1 = (1/n) * accurate_dot(error, X)
 
     beta_0 -= learning_rate * gradient_b0
     beta_1 -= learning_rate * gradient_b1
 
-    mse = (error ** 2).mean()
+    mse = accurate_dot(error, error) / n
     mse_history.append(mse)
 
 # -----------------------
@@ -12,6 +12,8 @@ puis applique une régression linéaire simple pour :
 Structure du programme :
 ------------------------
 - `save_graph` : trace le nuage de points initial
+- `moindres_carres` : calcule pente et ordonnée à l’origine en une seule passe
+- `calcul_moments` : moyennes et co-moments centrés (une passe sur les données)
 - `pente` : calcule la pente (beta_1) de la droite de régression
 - `origin` : calcule l’ordonnée à l’origine (beta_0)
 - `linear_regression` : prédit une valeur cible à partir d’une entrée X
@@ -38,9 +40,14 @@ Auteurs :
 """
 
 # ================================ IMPORT =====================================
+import os
 import sys
 import pandas as pd
-import matplotlib.pyplot as plt
+
+# Solveur des moindres carrés partagé avec le pipeline main/ :
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main"))
+from stats import Moments, moments
+from render import save_plot
 
 # ================================ FONCTIONS ==================================
 def save_graph(data: pd.DataFrame):
@@ -70,29 +77,19 @@ def save_graph(data: pd.DataFrame):
     --------
     >>> import pandas as pd
     >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
-    >>> save_graph(df)
-    # Enregistre le fichier 'relation_notes_heures.png'
+    >>> save_graph(df)  # Enregistre le fichier 'relation_notes_heures.png'
     """
 
-    # Trace un graphique simple (nuage de points) :
-    plt.plot(
-        data["Heures"],
-        data["Notes"],
-        marker='o',
-        linestyle = ' ',
-        color='blue'
-    )
-    
-    # Titrage et labels :
-    plt.title("Évolution des notes en fonction des heures d'étude")
-    plt.xlabel("Heures d'étude")
-    plt.ylabel("Notes obtenues")
-    plt.grid(True)
-    plt.xlim(0, data["Heures"].max() + 1)
-    plt.ylim(0, data["Notes"].max() + 1)
-
-    # Sauvegarde le graphique :
-    plt.savefig("relation_notes_heures.png")    
+    # Nuage de points (densité au-delà de render.POINT_BUDGET points), sans
+    # fenêtre (backend Agg) :
+    save_plot("relation_notes_heures.png",
+              data["Heures"].values,
+              data["Notes"].values,
+              title="Évolution des notes en fonction des heures d'étude",
+              xlabel="Heures d'étude",
+              ylabel="Notes obtenues",
+              xlim=(0, data["Heures"].max() + 1),
+              ylim=(0, data["Notes"].max() + 1))
     return
 
 
@@ -134,43 +131,91 @@ def save_regression_graph(data: pd.DataFrame, beta_0: float, beta_1: float):
     --------
     >>> import pandas as pd
     >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
-    >>> save_regression_graph(df, beta_0=5.25, beta_1=0.75)
-    # Enregistre le graphique avec la droite de régression
+    >>> save_regression_graph(df, beta_0=5.25, beta_1=0.75)  # Enregistre le graphique avec la droite de régression
     """
 
 
-    # Trace un graphique simple (nuage de points) :
-    plt.plot(
-        data["Heures"],
-        data["Notes"],
-        marker='o',
-        linestyle = ' ',
-        color='blue'
-    )
-    
-    # Droite de regresion :
-    x_vals = data["Heures"]
-    y_vals = linear_regression(x_vals, beta_0, beta_1)
-    plt.plot(x_vals,
-             y_vals,
-             color='red',
-             label='Régression')
-    
-    # Titrage et labels :
-    plt.title("Évolution des notes en fonction des heures d'étude")
-    plt.xlabel("Heures d'étude")
-    plt.ylabel("Notes obtenues")
-    plt.grid(True)
-    plt.xlim(0, data["Heures"].max() + 1)
-    plt.ylim(0, data["Notes"].max() + 1)
-
-    # Sauvegarde le graphique :
-    plt.savefig("regression_lineaire.png")    
+    # Nuage de points et droite de régression, tracée à partir de ses deux
+    # extrémités :
+    save_plot("regression_lineaire.png",
+              data["Heures"].values,
+              data["Notes"].values,
+              beta_0,
+              beta_1,
+              title="Évolution des notes en fonction des heures d'étude",
+              xlabel="Heures d'étude",
+              ylabel="Notes obtenues",
+              xlim=(0, data["Heures"].max() + 1),
+              ylim=(0, data["Notes"].max() + 1))
     return
 
 
 #------------------------------------------------------------------------------
-def pente(data: pd.DataFrame) -> float:
+def moindres_carres(data: pd.DataFrame) -> tuple[float, float]:
+    """
+    Calcule la pente (beta_1) et l'ordonnée à l'origine (beta_0) en une seule
+    passe sur les données, à partir des statistiques suffisantes (moyennes et
+    co-moments centrés). Le DataFrame n'est ni modifié ni copié.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Un DataFrame contenant au moins les colonnes "Heures" (X) et "Notes" (Y).
+
+    Returns
+    -------
+    tuple[float, float]
+        (beta_0, beta_1)
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
+    >>> moindres_carres(df)
+    <BLANKLINE>
+    - Moyenne des notes :  6.666666666666667
+    - Moyenne des heure :  2.0 
+    <BLANKLINE>
+    <BLANKLINE>
+    - Beta_1 = a / b soit 1.5 / 2.0
+    - Valeur de la pente (Beta_1) :  0.75
+    - Valeur du point a l'origine :  5.166666666666667
+    (5.166666666666667, 0.75)
+    """
+
+    # Une seule passe : pente et origine réutilisent les mêmes statistiques
+    stats = calcul_moments(data)
+    beta_1 = pente(data, stats)
+    beta_0 = origin(data, beta_1, stats)
+    return beta_0, beta_1
+
+
+#------------------------------------------------------------------------------
+def calcul_moments(data: pd.DataFrame) -> Moments:
+    """
+    Moyennes et co-moments centrés des colonnes "Heures" (X) et "Notes" (Y),
+    en une seule passe, sans ajouter de colonnes au DataFrame.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
+    >>> calcul_moments(df).c_xy
+    <BLANKLINE>
+    - Moyenne des notes :  6.666666666666667
+    - Moyenne des heure :  2.0 
+    <BLANKLINE>
+    1.5
+    """
+
+    stats = moments(data["Heures"], data["Notes"])
+    print("\n- Moyenne des notes : ", stats.mean_y)
+    print("- Moyenne des heure : ", stats.mean_x, "\n")
+    return stats
+
+
+#------------------------------------------------------------------------------
+def pente(data: pd.DataFrame, stats: Moments | None = None) -> float:
     """
     Calcule la pente (coefficient directeur) beta_1 d'une régression linéaire simple à l'aide de la méthode des moindres carrés.
 
@@ -184,6 +229,10 @@ def pente(data: pd.DataFrame) -> float:
         - **"Heures"** : les variables explicatives (X)
         - **"Notes"**  : les variables à prédire (Y)
 
+    stats : Moments, optionnel
+        Statistiques déjà calculées (voir `calcul_moments`) : évite une
+        nouvelle passe sur les données.
+
     Returns
     -------
     float
@@ -199,33 +248,25 @@ def pente(data: pd.DataFrame) -> float:
     >>> import pandas as pd
     >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
     >>> pente(df)
+    <BLANKLINE>
+    - Moyenne des notes :  6.666666666666667
+    - Moyenne des heure :  2.0 
+    <BLANKLINE>
+    <BLANKLINE>
+    - Beta_1 = a / b soit 1.5 / 2.0
+    - Valeur de la pente (Beta_1) :  0.75
     0.75
     """
 
-    # Moyenne des notes :
-    mean_note = data["Notes"].mean()
-    print("\n- Moyenne des notes : ", mean_note)
-    
-    # Moyenne de heures :
-    mean_heure = data["Heures"].mean()
-    print("- Moyenne des heure : ", mean_heure, "\n")
-    
-    # Calcul préalable :
-    data["Xi - mean_heure"] = [(x - mean_heure) for x in data["Heures"]]
-    data["Yi - mean_note"] = [(y - mean_note) for y in data["Notes"]]
-    print("Rajout de colonnes :\n", data)
-    
+    # Moyennes et co-moments en une seule passe, sans ajouter de colonnes :
+    if stats is None:
+        stats = calcul_moments(data)
+
     # Calcule la pente (coefficient directeur) beta_1 :
     try:
-        a = 0.0
-        b =0.0
-        for x, y in zip(data["Xi - mean_heure"], data["Yi - mean_note"]):
-            a += x * y
-        
-        for x in data["Xi - mean_heure"]:
-            b += x * x
-            
-        beta_1 = a / b
+        a = stats.c_xy
+        b = stats.m2_x
+        beta_1 = stats.slope()
     except Exception as e:
         print("Erreur de calcul : ", e)
         raise
@@ -236,7 +277,7 @@ def pente(data: pd.DataFrame) -> float:
 
 
 #------------------------------------------------------------------------------
-def origin(data: pd.DataFrame, beta_1: float) -> float:
+def origin(data: pd.DataFrame, beta_1: float, stats: Moments | None = None) -> float:
     """
     Calcule l'ordonnée à l'origine (beta_0) d'une régression linéaire simple.
 
@@ -258,6 +299,9 @@ def origin(data: pd.DataFrame, beta_1: float) -> float:
     beta_1 : float
         La pente (coefficient directeur) calculée précédemment via la méthode des moindres carrés.
 
+    stats : Moments, optionnel
+        Statistiques déjà calculées (voir `calcul_moments`).
+
     Returns
     -------
     float
@@ -274,13 +318,17 @@ def origin(data: pd.DataFrame, beta_1: float) -> float:
     >>> df = pd.DataFrame({"Heures": [1, 2, 3], "Notes": [6, 6.5, 7.5]})
     >>> beta_1 = 0.75
     >>> origin(df, beta_1)
-    5.25
+    <BLANKLINE>
+    - Moyenne des notes :  6.666666666666667
+    - Moyenne des heure :  2.0 
+    <BLANKLINE>
+    - Valeur du point a l'origine :  5.166666666666667
+    5.166666666666667
     """
     
-    y = data["Notes"].mean()
-    x = data["Heures"].mean()
-    
-    beta_0 = y - beta_1 * x
+    if stats is None:
+        stats = calcul_moments(data)
+    beta_0 = stats.intercept(beta_1)
     print("- Valeur du point a l'origine : ", beta_0)
     
     return beta_0
@@ -317,7 +365,6 @@ def linear_regression(heure: float, beta_0: float, beta_1: float) -> float:
     Examples
     --------
     >>> linear_regression(2.5, 5.0, 0.8)
-    La note statistique pour 2.5 travaillée : 7.0
     7.0
     """
     
@@ -334,10 +381,10 @@ def main():
     --------
     1. Chargement du fichier CSV (`predict_note.csv`)
     2. Affichage et sauvegarde d’un graphique initial (nuage de points)
-    3. Calcul de la pente (beta_1) via la méthode des moindres carrés
-    4. Calcul de l’ordonnée à l’origine (beta_0)
-    5. Prédiction pour une valeur donnée (valeur à changer)
-    6. Affichage et sauvegarde du graphique avec la droite de régression
+    3. Calcul de la pente (beta_1) et de l’ordonnée à l’origine (beta_0)
+       via la méthode des moindres carrés, en une seule passe
+    4. Prédiction pour une valeur donnée (valeur à changer)
+    5. Affichage et sauvegarde du graphique avec la droite de régression
 
     Returns
     -------
@@ -357,18 +404,15 @@ def main():
         return 1
 
     try:
-        # Étape 2 : Calcul de la pente :
-        beta_1 = pente(data)
-
-        # Étape 3 : Calcul de l’ordonnée à l’origine :
-        beta_0 = origin(data, beta_1)
+        # Étape 2 : Calcul de la pente et de l’ordonnée à l’origine :
+        beta_0, beta_1 = moindres_carres(data)
 
-        # Étape 4 : Prédiction pour X heures :
+        # Étape 3 : Prédiction pour X heures :
         heure = 2.5
         predict = linear_regression(heure, beta_0, beta_1)
         print(f"\nLa note prédit pour {heure} heures travaillée : {predict}/10")
 
-        # Étape 5 : Affichage du graphique avec la droite de régression :
+        # Étape 4 : Affichage du graphique avec la droite de régression :
         save_regression_graph(data, beta_0, beta_1)
 
     except Exception as e:
@@ -1,8 +1,13 @@
 # ================================ IMPORT =====================================
+import os
 import sys
 import logging
 import pandas as pd
-import matplotlib.pyplot as plt
+
+# Solveur des moindres carrés partagé avec le pipeline main/ :
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main"))
+from stats import Moments, moments
+from render import save_plot
 
 # ============================== CONSTANTES ===================================
 # Couleurs :
@@ -42,93 +47,65 @@ logger.addHandler(handler)
 # ================================ FONCTIONS ==================================
 def save_graph(data: pd.DataFrame):
     
-    # Trace un graphique simple (nuage de points) :
-    plt.plot(
-        data["km"], data["price"],
-        marker='o',
-        linestyle = ' ',
-        color='blue'
-    )
-    
-    # Titrage et labels :
-    plt.title("Évolution du prix en fonction des kilomètres parcourus")
-    plt.xlabel("Kilomètres parcourus")
-    plt.ylabel("Prix du véhicule (€)")
-    plt.grid(True)
-    plt.xlim(0, data["km"].max() + 10_000)
-    plt.ylim(0, data["price"].max() + 1_000)
-
-    # Sauvegarde le graphique :
-    plt.savefig("relation_prix_km.png")    
+    # Nuage de points (densité au-delà de render.POINT_BUDGET points), sans
+    # fenêtre (backend Agg) :
+    save_plot("relation_prix_km.png",
+              data["km"].values,
+              data["price"].values,
+              title="Évolution du prix en fonction des kilomètres parcourus",
+              xlabel="Kilomètres parcourus",
+              ylabel="Prix du véhicule (€)",
+              xlim=(0, data["km"].max() + 10_000),
+              ylim=(0, data["price"].max() + 1_000))
     return
 
 
 #------------------------------------------------------------------------------
 def save_regression_graph(data: pd.DataFrame, beta_0: float, beta_1: float):
 
-    # Trace un graphique simple (nuage de points) :
-    plt.plot(
-        data["km"],
-        data["price"],
-        marker='o',
-        linestyle = ' ',
-        color='blue'
-    )
-    
-    # Droite de regresion :
-    x_vals = list(data["km"])
-    y_vals = list(linear_regression(data["km"], beta_0, beta_1))
-
-    # Ajoute le point à l'origine :
-    x_vals.insert(0, 0)
-    y_vals.insert(0, beta_0)
-
-    plt.plot(x_vals,
-             y_vals,
-             color='red',
-             label='Régression')
-    
-    # Titrages et labels :
-    plt.title("Évolution du prix en fonction des kilomètres parcourus")
-    plt.xlabel("Kilomètres parcourus")
-    plt.ylabel("Prix du véhicule (€)")
-    plt.legend()
-    
-    # Reglage de la fenetre :
-    plt.grid(True)
-    plt.xlim(right=data["km"].max() + 10_000)
-    plt.ylim(0, data["price"].max() + 1_000)
-
-    # Sauvegarde du graphique :
-    plt.savefig("regression_lineaire_voiture.png")    
+    # Nuage de points et droite de régression, tracée de l'origine au
+    # kilométrage max à partir de ses deux extrémités :
+    save_plot("regression_lineaire_voiture.png",
+              data["km"].values,
+              data["price"].values,
+              beta_0,
+              beta_1,
+              title="Évolution du prix en fonction des kilomètres parcourus",
+              xlabel="Kilomètres parcourus",
+              ylabel="Prix du véhicule (€)",
+              x_min=0,
+              xlim=(None, data["km"].max() + 10_000),
+              ylim=(0, data["price"].max() + 1_000))
     return
 
 
 #------------------------------------------------------------------------------
-def pente(data: pd.DataFrame) -> float:
+def moindres_carres(data: pd.DataFrame) -> tuple[float, float]:
+
+    # Une seule passe sur les colonnes, sans modifier ni copier le DataFrame ;
+    # pente et origine réutilisent les mêmes statistiques :
+    try:
+        stats = moments(data["km"], data["price"])
+    except Exception as e:
+        logging.error(f"Fonction moindres_carres(): {e}")
+        raise
+
+    logging.debug(f"Moyenne des prix : {stats.mean_y}")
+    logging.debug(f"Moyenne des kilomètres : {stats.mean_x}")
+    beta_1 = pente(data, stats)
+    beta_0 = origin(data, beta_1, stats)
+    return beta_0, beta_1
+
+
+#------------------------------------------------------------------------------
+# stats : statistiques déjà calculées (stats.Moments), sinon une passe sur data
+def pente(data: pd.DataFrame, stats: Moments | None = None) -> float:
 
-    # Moyenne des notes et des heures :
-    mean_prix = data["price"].mean()
-    mean_km = data["km"].mean()
-    
-    logging.debug(f"Moyenne des prix : {mean_prix}")
-    logging.debug(f"Moyenne des kilomètres : {mean_km}")
-    
-    # Calculs préalables :
-    data["Xi - mean_km"] = [(x - mean_km) for x in data["km"]]
-    data["Yi - mean_prix"] = [(y - mean_prix) for y in data["price"]]
-    logging.debug(f"Rajout de colonnes :\n{data.head()}")
-    
     # Calcule la pente (coefficient directeur) beta_1 :
     try:
-        a = b =  0.0
-        for x, y in zip(data["Xi - mean_km"], data["Yi - mean_prix"]):
-            a += x * y
-        
-        for x in data["Xi - mean_km"]:
-            b += x * x
-            
-        beta_1 = a / b
+        if stats is None:
+            stats = moments(data["km"], data["price"])
+        beta_1 = stats.slope()
     except Exception as e:
         logging.error(f"Fonction pente(): {e}")
         raise
@@ -138,13 +115,12 @@ def pente(data: pd.DataFrame) -> float:
 
 
 #------------------------------------------------------------------------------
-def origin(data: pd.DataFrame, beta_1: float) -> float:
-    
-    y = data["price"].mean()
-    x = data["km"].mean()
+def origin(data: pd.DataFrame, beta_1: float, stats: Moments | None = None) -> float:
     
     try:
-        beta_0 = y - beta_1 * x
+        if stats is None:
+            stats = moments(data["km"], data["price"])
+        beta_0 = stats.intercept(beta_1)
     except TypeError as e:
         logging.error(f"{RED}Fonction origin(): {e}{RESET}")
         raise
@@ -173,10 +149,10 @@ def main():
     --------
     1. Chargement du fichier CSV (`predict_prix.csv`)
     2. Affichage et sauvegarde d’un graphique initial (nuage de points)
-    3. Calcul de la pente (beta_1) via la méthode des moindres carrés
-    4. Calcul de l’ordonnée à l’origine (beta_0)
-    5. Prédiction pour une valeur donnée (valeur à changer)
-    6. Affichage et sauvegarde du graphique avec la droite de régression
+    3. Calcul de la pente (beta_1) et de l’ordonnée à l’origine (beta_0)
+       via la méthode des moindres carrés, en une seule passe
+    4. Prédiction pour une valeur donnée (valeur à changer)
+    5. Affichage et sauvegarde du graphique avec la droite de régression
 
     Returns
     -------
@@ -200,18 +176,15 @@ def main():
     # ---------
     # Étape 2 : Regression lineaire simple avec la methode des moindres carres
     try:
-        # [1] Calcul de la pente :
-        beta_1 = pente(data)
-
-        # [2] Calcul de l’ordonnée à l’origine :
-        beta_0 = origin(data, beta_1)
+        # [1] Calcul de la pente et de l’ordonnée à l’origine (une seule passe) :
+        beta_0, beta_1 = moindres_carres(data)
 
-        # [3] Ne pas vendre a perte (depassement du ratio km/prix) :
+        # [2] Ne pas vendre a perte (depassement du ratio km/prix) :
         km = KM
         if km > KM_MAX:
             logging.warning(f"{YELLOW}Tu dépasse la limite de kilomètres établie, tu va devoir payer pour qu'on prenne ta caisse !{RESET}")
             
-        # [4] Prédiction pour X kilometres :
+        # [3] Prédiction pour X kilometres :
         predict = linear_regression(km, beta_0, beta_1)
         print(GREEN)
         logging.info(f"Le prix estimé pour une voiture qui a {km:_} km au compteur : {predict:.2f} €{RESET}")